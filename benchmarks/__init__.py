@@ -0,0 +1,30 @@
+# -*- coding: utf-8 -*-
+#
+#   jsonable-objects: JSON-able objects
+#   Copyright (C) 2015-2017 mete0r <mete0r@sarangbang.or.kr>
+#
+#   This program is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU Affero General Public License as published by
+#   the Free Software Foundation, either version 3 of the License, or
+#   (at your option) any later version.
+#
+#   This program is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#   GNU Affero General Public License for more details.
+#
+#   You should have received a copy of the GNU Affero General Public License
+#   along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+'''
+Benchmarks of jsonable-objects.
+
+Run with the stdlib ``timeit`` harness::
+
+    python -m benchmarks run -o results.json
+    python -m benchmarks compare base.json results.json
+
+or with pyperf, if installed::
+
+    python -m benchmarks.pyperf_runner -o results.json
+'''
@@ -0,0 +1,131 @@
+# -*- coding: utf-8 -*-
+#
+#   jsonable-objects: JSON-able objects
+#   Copyright (C) 2015-2017 mete0r <mete0r@sarangbang.or.kr>
+#
+#   This program is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU Affero General Public License as published by
+#   the Free Software Foundation, either version 3 of the License, or
+#   (at your option) any later version.
+#
+#   This program is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#   GNU Affero General Public License for more details.
+#
+#   You should have received a copy of the GNU Affero General Public License
+#   along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+'''
+Stdlib ``timeit`` harness, saving and comparing JSON results.
+'''
+from __future__ import absolute_import
+from __future__ import print_function
+from __future__ import unicode_literals
+from argparse import ArgumentParser
+import io
+import json
+import platform
+import re
+import sys
+import timeit
+
+from .cases import CASES
+
+
+def measure(run, repeat, min_time):
+    '''
+    Seconds per call of ``run``: the best of ``repeat`` timings, each made of
+    enough calls to take ``min_time`` seconds.
+    '''
+    timer = timeit.Timer(run)
+    number = 1
+    while True:
+        elapsed = timer.timeit(number)
+        if elapsed >= min_time:
+            break
+        number *= 2 if elapsed <= 0 else max(2, int(min_time / elapsed) + 1)
+    timings = [elapsed] + timer.repeat(repeat - 1, number)
+    return min(timings) / number, number
+
+
+def run_cases(pattern=None, repeat=5, min_time=0.2, out=sys.stdout):
+    results = {}
+    for name, prepare in CASES.items():
+        if pattern is not None and not re.search(pattern, name):
+            continue
+        seconds, number = measure(prepare(), repeat, min_time)
+        results[name] = {
+            'seconds': seconds,
+            'number': number,
+            'repeat': repeat,
+        }
+        print('{:30} {:>12}'.format(name, format_seconds(seconds)),
+              file=out)
+    return {
+        'python': platform.python_implementation(),
+        'python_version': platform.python_version(),
+        'platform': platform.platform(),
+        'results': results,
+    }
+
+
+def compare(base, head, out=sys.stdout):
+    ''' Print the ratios of the timings of two saved runs. '''
+    base_results = base['results']
+    head_results = head['results']
+    for name in CASES:
+        if name not in base_results or name not in head_results:
+            continue
+        a = base_results[name]['seconds']
+        b = head_results[name]['seconds']
+        print('{:30} {:>12} {:>12} {:>7.2f}x'.format(
+            name, format_seconds(a), format_seconds(b), a / b,
+        ), file=out)
+
+
+def format_seconds(seconds):
+    for unit, scale in (('s', 1), ('ms', 1e-3), ('us', 1e-6)):
+        if seconds >= scale:
+            return '{:.3f} {}'.format(seconds / scale, unit)
+    return '{:.1f} ns'.format(seconds / 1e-9)
+
+
+def main(argv=None):
+    parser = ArgumentParser(prog='python -m benchmarks')
+    commands = parser.add_subparsers(dest='command')
+
+    run_parser = commands.add_parser('run', help='run the benchmarks')
+    run_parser.add_argument('-o', '--output',
+                            help='save the results in a JSON file')
+    run_parser.add_argument('-k', '--pattern',
+                            help='run the cases matching a regex')
+    run_parser.add_argument('--repeat', type=int, default=5)
+    run_parser.add_argument('--min-time', type=float, default=0.2,
+                            help='seconds per timing (default: 0.2)')
+
+    compare_parser = commands.add_parser('compare',
+                                         help='compare two saved runs')
+    compare_parser.add_argument('base')
+    compare_parser.add_argument('head')
+
+    args = parser.parse_args(argv)
+    if args.command == 'run':
+        results = run_cases(args.pattern, args.repeat, args.min_time)
+        if args.output:
+            with io.open(args.output, 'w', encoding='utf-8') as fp:
+                fp.write(json.dumps(results, indent=2, sort_keys=True))
+    elif args.command == 'compare':
+        with io.open(args.base, encoding='utf-8') as fp:
+            base = json.load(fp)
+        with io.open(args.head, encoding='utf-8') as fp:
+            head = json.load(fp)
+        compare(base, head)
+    else:
+        parser.print_help()
+        return 2
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,335 @@
+# -*- coding: utf-8 -*-
+#
+#   jsonable-objects: JSON-able objects
+#   Copyright (C) 2015-2017 mete0r <mete0r@sarangbang.or.kr>
+#
+#   This program is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU Affero General Public License as published by
+#   the Free Software Foundation, either version 3 of the License, or
+#   (at your option) any later version.
+#
+#   This program is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#   GNU Affero General Public License for more details.
+#
+#   You should have received a copy of the GNU Affero General Public License
+#   along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+'''
+Benchmark cases.
+
+Each case is a function which prepares its data and returns the callable to
+be timed. ``CASES`` lists them in order, by name.
+'''
+from __future__ import absolute_import
+from __future__ import print_function
+from __future__ import unicode_literals
+from collections import OrderedDict
+from datetime import datetime
+import atexit
+import io
+import json
+import os
+import tempfile
+
+from jsonable_objects import raw
+from jsonable_objects.mapped import load_mapped
+from jsonable_objects.proxy import Field
+from jsonable_objects.proxy import proxy
+
+
+CASES = OrderedDict()
+
+
+def case(name):
+    def decorator(prepare):
+        CASES[name] = prepare
+        return prepare
+    return decorator
+
+
+class DateTimeFormat(object):
+
+    def format(self, pyobj):
+        return pyobj.strftime('%Y-%m-%dT%H:%M:%S')
+
+    def parse(self, jsonableval):
+        return datetime.strptime(jsonableval, '%Y-%m-%dT%H:%M:%S')
+
+
+def make_wide(width):
+    ''' Proxy class with ``width`` int fields, and a record of it. '''
+    attrs = dict(
+        ('f{}'.format(i), Field(type=int)) for i in range(width)
+    )
+    Wide = proxy(dict)(type(str('Wide'), (object,), attrs))
+    record = dict(('f{}'.format(i), i) for i in range(width))
+    return Wide, record
+
+
+def make_deep(depth):
+    ''' Chain of ``depth`` nested proxy classes, and a document of it. '''
+
+    @proxy(dict)
+    class Leaf(object):
+        value = Field(type=int)
+
+    nested = Leaf
+    jsonable = {'value': 0}
+    for i in range(depth):
+        attrs = {
+            'name': Field(type=str),
+            'child': Field(proxy=nested),
+        }
+        nested = proxy(dict)(type(str('Node'), (object,), attrs))
+        jsonable = {'name': 'n{}'.format(i), 'child': jsonable}
+    return nested, jsonable
+
+
+def make_record_classes():
+
+    @proxy(dict)
+    class Point(object):
+        x = Field(type=float)
+        y = Field(type=float)
+
+    @proxy(dict)
+    class Record(object):
+        id = Field(type=int)
+        name = Field(type=str)
+        created = Field(type=str, format=DateTimeFormat())
+        point = Field(proxy=Point)
+
+    @proxy(list, itemProxy=Record)
+    class Records(object):
+        pass
+
+    @proxy(list, as_container=True)
+    class Values(object):
+        pass
+
+    return Point, Record, Records, Values
+
+
+def make_record(i):
+    return {
+        'id': i,
+        'name': 'record-{}'.format(i),
+        'created': '2018-11-11T12:34:56',
+        'point': {'x': float(i), 'y': -float(i)},
+    }
+
+
+@case('proxy_class_creation')
+def bench_proxy_class_creation():
+
+    def run():
+        @proxy(dict)
+        class Record(object):
+            id = Field(type=int)
+            name = Field(type=str)
+            score = Field(type=float, optional=True)
+            tags = Field(type=list, optional=True)
+            extra = Field(type=dict, optional=True)
+    return run
+
+
+def __init_wide(width):
+    def prepare():
+        Wide, record = make_wide(width)
+        return lambda: Wide(record)
+    return prepare
+
+
+def __init_deep(depth):
+    def prepare():
+        Deep, jsonable = make_deep(depth)
+        return lambda: Deep(jsonable)
+    return prepare
+
+
+for __width in (1, 10, 100):
+    case('init_width_{}'.format(__width))(__init_wide(__width))
+for __depth in (1, 4, 16):
+    case('init_depth_{}'.format(__depth))(__init_deep(__depth))
+
+
+@case('field_get')
+def bench_field_get():
+    Point, Record, Records, Values = make_record_classes()
+    record = Record(make_record(1))
+    return lambda: record.name
+
+
+@case('field_set')
+def bench_field_set():
+    Point, Record, Records, Values = make_record_classes()
+    record = Record(make_record(1))
+
+    def run():
+        record.name = 'renamed'
+    return run
+
+
+@case('field_get_format')
+def bench_field_get_format():
+    Point, Record, Records, Values = make_record_classes()
+    record = Record(make_record(1))
+    return lambda: record.created
+
+
+@case('field_set_format')
+def bench_field_set_format():
+    Point, Record, Records, Values = make_record_classes()
+    record = Record(make_record(1))
+    created = datetime(2018, 11, 11, 12, 34, 56)
+
+    def run():
+        record.created = created
+    return run
+
+
+@case('field_get_proxy')
+def bench_field_get_proxy():
+    Point, Record, Records, Values = make_record_classes()
+    record = Record(make_record(1))
+    return lambda: record.point
+
+
+@case('field_set_proxy')
+def bench_field_set_proxy():
+    Point, Record, Records, Values = make_record_classes()
+    record = Record(make_record(1))
+    point = Point({'x': 1.0, 'y': 2.0})
+
+    def run():
+        record.point = point
+    return run
+
+
+@case('container_iter_1000')
+def bench_container_iter():
+    Point, Record, Records, Values = make_record_classes()
+    records = Records([make_record(i) for i in range(1000)])
+
+    def run():
+        for record in records:
+            pass
+    return run
+
+
+@case('container_iter_plain_1000')
+def bench_container_iter_plain():
+    Point, Record, Records, Values = make_record_classes()
+    values = Values(list(range(1000)))
+
+    def run():
+        for value in values:
+            pass
+    return run
+
+
+@case('container_slice_100')
+def bench_container_slice():
+    Point, Record, Records, Values = make_record_classes()
+    records = Records([make_record(i) for i in range(1000)])
+    return lambda: records[100:200]
+
+
+@case('eq')
+def bench_eq():
+    Point, Record, Records, Values = make_record_classes()
+    a = Record(make_record(1))
+    b = Record(make_record(1))
+    return lambda: a == b
+
+
+@case('eq_container_100')
+def bench_eq_container():
+    Point, Record, Records, Values = make_record_classes()
+    a = Records([make_record(i) for i in range(100)])
+    b = Records([make_record(i) for i in range(100)])
+    return lambda: a == b
+
+
+@case('repr')
+def bench_repr():
+    Point, Record, Records, Values = make_record_classes()
+    record = Record(make_record(1))
+    return lambda: repr(record)
+
+
+def make_envelope():
+    ''' Proxy class of a few fields, and a large JSON text of it. '''
+
+    @proxy(dict)
+    class Envelope(object):
+        id = Field(type=int)
+        status = Field(type=str)
+
+    text = json.dumps({
+        'id': 1,
+        'records': [make_record(i) for i in range(2000)],
+        'status': 'ok',
+    })
+    return Envelope, text
+
+
+@case('json_read_last_field')
+def bench_json_read_last_field():
+    Envelope, text = make_envelope()
+    return lambda: json.loads(text)['status']
+
+
+@case('raw_read_last_field')
+def bench_raw_read_last_field():
+    Envelope, text = make_envelope()
+    return lambda: raw.loads(text)['status']
+
+
+@case('raw_read_first_field')
+def bench_raw_read_first_field():
+    Envelope, text = make_envelope()
+    return lambda: raw.loads(text)['id']
+
+
+@case('json_forward')
+def bench_json_forward():
+    Envelope, text = make_envelope()
+    return lambda: json.dumps(Envelope(json.loads(text)).__jsonable__)
+
+
+@case('raw_forward')
+def bench_raw_forward():
+    Envelope, text = make_envelope()
+    return lambda: raw.dumps(Envelope(raw.loads(text)))
+
+
+def make_records_file():
+    ''' A JSON file of 20000 records, removed at exit. '''
+    fd, path = tempfile.mkstemp(suffix='.json')
+    with io.open(fd, 'w') as fp:
+        fp.write(json.dumps([make_record(i) for i in range(20000)]))
+    atexit.register(os.remove, path)
+    return path
+
+
+@case('json_load_file')
+def bench_json_load_file():
+    path = make_records_file()
+
+    def run():
+        with io.open(path, 'rb') as fp:
+            return json.loads(fp.read().decode('utf-8'))
+    return run
+
+
+@case('mapped_index_file')
+def bench_mapped_index_file():
+    path = make_records_file()
+
+    def run():
+        with load_mapped(path) as document:
+            return len(document)
+    return run
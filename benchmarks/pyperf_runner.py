@@ -0,0 +1,41 @@
+# -*- coding: utf-8 -*-
+#
+#   jsonable-objects: JSON-able objects
+#   Copyright (C) 2015-2017 mete0r <mete0r@sarangbang.or.kr>
+#
+#   This program is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU Affero General Public License as published by
+#   the Free Software Foundation, either version 3 of the License, or
+#   (at your option) any later version.
+#
+#   This program is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#   GNU Affero General Public License for more details.
+#
+#   You should have received a copy of the GNU Affero General Public License
+#   along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+'''
+pyperf runner of the benchmark cases::
+
+    python -m benchmarks.pyperf_runner -o results.json
+    python -m pyperf compare_to base.json results.json
+'''
+from __future__ import absolute_import
+from __future__ import print_function
+from __future__ import unicode_literals
+
+import pyperf
+
+from .cases import CASES
+
+
+def main():
+    runner = pyperf.Runner()
+    for name, prepare in CASES.items():
+        runner.bench_func(name, prepare())
+
+
+if __name__ == '__main__':
+    main()
@@ -118,6 +118,8 @@ setup_info = {
     'tests_require': tests_require,
     'extras_require': {
         'test': tests_require,
+        'numpy': ['numpy'],
+        'zope': ['zope.interface'],
     },
     'classifiers': [
         'Development Status :: 1 - Planning',
@@ -0,0 +1,101 @@
+# -*- coding: utf-8 -*-
+#
+#   jsonable-objects: JSON-able objects
+#   Copyright (C) 2015-2017 mete0r <mete0r@sarangbang.or.kr>
+#
+#   This program is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU Affero General Public License as published by
+#   the Free Software Foundation, either version 3 of the License, or
+#   (at your option) any later version.
+#
+#   This program is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#   GNU Affero General Public License for more details.
+#
+#   You should have received a copy of the GNU Affero General Public License
+#   along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+from __future__ import absolute_import
+from __future__ import print_function
+from __future__ import unicode_literals
+import asyncio
+import json
+
+from .ndjson import decode_line
+
+
+# read() 로 한 번에 읽어들이는 크기
+__chunk_size = 1 << 16
+
+
+async def aiter_ndjson(proxy_class, reader, executor=None, offload_size=None,
+                       loads=json.loads):
+    '''
+    Iterate proxies over a NDJSON stream asynchronously.
+
+    :param reader:
+        ``asyncio.StreamReader`` or an async file-like object, which supports
+        a ``read(n)`` coroutine, ``async for`` or a ``readline()`` coroutine.
+        Lines are split from ``read(n)`` if supported, so that they are not
+        limited by the buffer limit of the ``StreamReader``.
+    :param executor:
+        ``concurrent.futures.Executor`` to decode and validate the offloaded
+        lines. ``None`` for the default executor of the event loop.
+    :param offload_size:
+        lines of this length or longer are decoded and validated in the
+        executor, not to block the event loop. ``None`` to never offload.
+    :param loads:
+        JSON decoding callable.
+    '''
+    loop = asyncio.get_running_loop()
+    async for line in __iter_lines(reader):
+        line = line.strip()
+        if not line:
+            continue
+        if offload_size is not None and len(line) >= offload_size:
+            yield await loop.run_in_executor(
+                executor, decode_line, proxy_class, line, loads,
+            )
+        else:
+            yield decode_line(proxy_class, line, loads)
+
+
+async def __iter_lines(reader):
+    if hasattr(reader, 'read'):
+        async for line in __iter_chunked_lines(reader):
+            yield line
+        return
+
+    if hasattr(reader, '__aiter__'):
+        async for line in reader:
+            yield line
+        return
+
+    while True:
+        line = await reader.readline()
+        if not line:
+            return
+        yield line
+
+
+async def __iter_chunked_lines(reader):
+    # StreamReader.readline() 은 limit (64 KiB) 보다 긴 줄을 읽지 못한다.
+    parts = []
+    while True:
+        chunk = await reader.read(__chunk_size)
+        if not chunk:
+            break
+        newline = b'\n' if isinstance(chunk, bytes) else '\n'
+        lines = chunk.split(newline)
+        if len(lines) == 1:
+            parts.append(chunk)
+            continue
+        parts.append(lines[0])
+        yield chunk[:0].join(parts)
+        for line in lines[1:-1]:
+            yield line
+        parts = [lines[-1]]
+
+    if parts:
+        yield parts[0][:0].join(parts)
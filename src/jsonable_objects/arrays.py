@@ -0,0 +1,168 @@
+# -*- coding: utf-8 -*-
+#
+#   jsonable-objects: JSON-able objects
+#   Copyright (C) 2015-2017 mete0r <mete0r@sarangbang.or.kr>
+#
+#   This program is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU Affero General Public License as published by
+#   the Free Software Foundation, either version 3 of the License, or
+#   (at your option) any later version.
+#
+#   This program is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#   GNU Affero General Public License for more details.
+#
+#   You should have received a copy of the GNU Affero General Public License
+#   along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+'''
+NumPy export and import of numeric records.
+
+NumPy is optional: install ``jsonable-objects[numpy]``.
+'''
+from __future__ import absolute_import
+from __future__ import print_function
+from __future__ import unicode_literals
+from collections import OrderedDict
+
+
+__dtypes = {
+    int: 'i8',
+    float: 'f8',
+    bool: '?',
+}
+
+
+def to_numpy(container, fields=None, structured=True):
+    '''
+    Export the records of a ``proxy(list, itemProxy=X)`` container.
+
+    The dtypes of the columns are chosen from the declared ``Field.type``:
+    ``int`` as ``int64``, ``float`` as ``float64``, ``bool`` as ``bool``, and
+    the others as ``object``. The missing values of the optional ``float``
+    fields become NaN; those of the other numeric fields raise ``TypeError``.
+
+    :param fields:
+        names of the fields to export; all of them by default.
+    :param structured:
+        if true, return a structured array, otherwise an ``OrderedDict`` of
+        an array per field.
+    '''
+    import numpy
+
+    metadata = type(container).__jsonable_proxy__
+    itemProxy = metadata.itemProxy
+    if itemProxy is None or not issubclass(metadata.wrapped_type, list):
+        raise TypeError()
+
+    selected = __select(itemProxy, fields)
+    getters = [__make_getter(itemProxy, field) for field in selected]
+    dtype = [(str(field.name), __dtype_of(field)) for field in selected]
+
+    # 한 번에 모든 열을 읽는다.
+    rows = [
+        tuple(get(record) for get in getters)
+        for record in container.__jsonable__
+    ]
+    if structured:
+        return numpy.array(rows, dtype=dtype)
+
+    columns = list(zip(*rows)) if rows else [()] * len(selected)
+    return OrderedDict(
+        (name, numpy.array(column, dtype=field_dtype))
+        for (name, field_dtype), column in zip(dtype, columns)
+    )
+
+
+def from_numpy(proxy_class, arrays):
+    '''
+    Records of a proxy class from a structured array, or from a mapping of
+    an array per field name.
+
+    The arrays are converted with ``tolist()``, giving Python numbers; NaN
+    in the optional ``float`` fields becomes a missing value. Each record is
+    validated.
+
+    :returns:
+        ``list`` of ``proxy_class`` instances.
+    '''
+    metadata = proxy_class.__jsonable_proxy__
+    if metadata.as_container:
+        raise TypeError()
+
+    names = getattr(getattr(arrays, 'dtype', None), 'names', None)
+    if names is None:
+        names = list(arrays)
+    selected = __select(proxy_class, names)
+    columns = [
+        __from_column(field, arrays[field.name].tolist())
+        for field in selected
+    ]
+
+    if issubclass(metadata.wrapped_type, dict):
+        keys = [field.key for field in selected]
+        records = [
+            dict(
+                (key, value)
+                for key, value in zip(keys, row)
+                if value is not None
+            )
+            for row in zip(*columns)
+        ]
+    else:
+        indices = [field.local_index for field in selected]
+        width = len(metadata.field_list)
+        records = []
+        for row in zip(*columns):
+            record = [None] * width
+            for index, value in zip(indices, row):
+                record[index] = value
+            records.append(record)
+    return [proxy_class(record) for record in records]
+
+
+def __select(proxy_class, names):
+    field_list = proxy_class.__jsonable_proxy__.field_list
+    if names is None:
+        return list(field_list)
+    by_name = dict((field.name, field) for field in field_list)
+    try:
+        return [by_name[name] for name in names]
+    except KeyError as e:
+        raise KeyError(e.args[0])
+
+
+def __dtype_of(field):
+    if field.proxy_class is not None:
+        return 'O'
+    return __dtypes.get(field.type, 'O')
+
+
+def __make_getter(proxy_class, field):
+    nan_for_none = field.optional and __dtype_of(field) == 'f8'
+    if issubclass(proxy_class.__jsonable_proxy__.wrapped_type, dict):
+        key = field.key
+        if nan_for_none:
+            def get(record):
+                value = record.get(key)
+                return float('nan') if value is None else value
+        else:
+            def get(record):
+                return record.get(key)
+    else:
+        index = field.local_index
+        if nan_for_none:
+            def get(record):
+                value = record[index]
+                return float('nan') if value is None else value
+        else:
+            def get(record):
+                return record[index]
+    return get
+
+
+def __from_column(field, values):
+    if field.optional and __dtype_of(field) == 'f8':
+        return [None if value != value else value for value in values]
+    return values
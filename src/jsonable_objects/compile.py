@@ -0,0 +1,409 @@
+# -*- coding: utf-8 -*-
+#
+#   jsonable-objects: JSON-able objects
+#   Copyright (C) 2015-2017 mete0r <mete0r@sarangbang.or.kr>
+#
+#   This program is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU Affero General Public License as published by
+#   the Free Software Foundation, either version 3 of the License, or
+#   (at your option) any later version.
+#
+#   This program is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#   GNU Affero General Public License for more details.
+#
+#   You should have received a copy of the GNU Affero General Public License
+#   along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+'''
+Ahead-of-time compilation of proxy classes.
+
+``python -m jsonable_objects.compile mypkg.schemas`` writes
+``mypkg/_compiled_schemas.py``, with the field operations and descriptors of
+the proxy classes of ``mypkg.schemas``, and the ``__eq__`` / ``__ne__`` /
+``__repr__`` of the records, as plain functions (``mypkg/_compiled.py`` for
+the proxy classes defined in ``mypkg/__init__.py``; see
+:func:`~jsonable_objects.proxy.compiled_module_name`).
+When the proxy classes are made, those whose
+:func:`~jsonable_objects.proxy.schema_signature` is unchanged use them instead
+of compiling closures; the others, e.g. after editing the schemas without
+compiling again, silently fall back to the closures.
+
+Only the proxy classes defined at the module level are compiled, and neither
+the tracked nor the frozen ones. Set ``JSONABLE_OBJECTS_COMPILED=0`` to ignore
+the compiled modules.
+'''
+from __future__ import absolute_import
+from __future__ import print_function
+from __future__ import unicode_literals
+from argparse import ArgumentParser
+from collections import namedtuple
+from importlib import import_module
+from pprint import pformat
+import io
+import os.path
+import sys
+import types
+
+from . import __version__
+from .proxy import compiled_module_name
+from .proxy import schema_signature
+
+
+HEADER = '''\
+# -*- coding: utf-8 -*-
+#
+# Compiled from {module} by ``python -m jsonable_objects.compile``.
+# Do not edit: compile again after changing the proxy classes.
+#
+from __future__ import absolute_import
+from __future__ import unicode_literals
+
+from jsonable_objects.proxy import DownwardOps
+from jsonable_objects.proxy import FieldDescriptors
+from jsonable_objects.proxy import UpwardOps
+from jsonable_objects.proxy import settable_type
+
+
+VERSION = {version!r}
+'''
+
+
+def compilable_classes(module):
+    '''
+    ``(name, proxy class)`` pairs of the proxy classes to compile in
+    ``module``.
+    '''
+    classes = []
+    for name, cls in sorted(vars(module).items()):
+        if not isinstance(cls, type):
+            continue
+        metadata = cls.__dict__.get('__jsonable_proxy__')
+        if metadata is None:
+            continue
+        if cls.__module__ != module.__name__ or cls.__name__ != name:
+            continue
+        if metadata.tracked or metadata.frozen:
+            continue
+        classes.append((name, cls))
+    return classes
+
+
+def generate(module):
+    '''
+    Source of the compiled module of ``module``, a module or its name.
+    '''
+    if not isinstance(module, types.ModuleType):
+        module = import_module(module)
+
+    classes = compilable_classes(module)
+
+    # 같은 모양의 필드들은 같은 함수들을 쓴다: 키는 클로저 변수
+    shapes = []
+    for name, cls in classes:
+        metadata = cls.__jsonable_proxy__
+        for field in metadata.field_specs:
+            shape = field_shape(metadata.wrapped_type, field)
+            if shape not in shapes:
+                shapes.append(shape)
+
+    lines = [HEADER.format(module=module.__name__, version=__version__)
+             .rstrip('\n')]
+    for shape in shapes:
+        lines.append('')
+        lines.append('')
+        lines.extend(__field_source(shape))
+    for name, cls in classes:
+        metadata = cls.__jsonable_proxy__
+        lines.append('')
+        lines.append('')
+        lines.extend(__fields_source(name, metadata))
+        lines.append('')
+        lines.append('')
+        lines.extend(__methods_source(name, metadata))
+
+    lines.append('')
+    lines.append('')
+    lines.append('SCHEMAS = {')
+    for name, cls in classes:
+        signature = schema_signature(cls.__jsonable_proxy__)
+        signature = pformat(signature).split('\n')
+        lines.append('    {!r}: ('.format(name))
+        lines.extend('        ' + line for line in signature[:-1])
+        lines.append('        ' + signature[-1] + ',')
+        lines.append('        fields_{},'.format(name))
+        lines.append('        methods_{},'.format(name))
+        lines.append('    ),')
+    lines.append('}')
+    return '\n'.join(lines) + '\n'
+
+
+FieldShape = namedtuple('FieldShape', [
+    'wrapped_type',
+    'optional',
+    'type',
+    'predicate',
+    'proxy',
+    'format',
+])
+
+
+def field_shape(wrapped_type, field):
+    '''
+    :class:`FieldShape` of ``field``: what its compiled functions depend on.
+    '''
+    if field.type is None:
+        type_ = 'any'
+    elif issubclass(field.type, (dict, list)):
+        type_ = 'checked'
+    else:
+        type_ = 'coerced'
+    return FieldShape(
+        wrapped_type='dict' if issubclass(wrapped_type, dict) else 'list',
+        optional='optional' if field.optional else 'required',
+        type=type_,
+        predicate=field.predicate is not None,
+        proxy=field.proxy_class is not None,
+        format=field.format is not None,
+    )
+
+
+def __shape_name(shape):
+    name = 'field_{}_{}_{}'.format(shape.wrapped_type, shape.optional,
+                                   shape.type)
+    for option in ('predicate', 'proxy', 'format'):
+        if getattr(shape, option):
+            name += '_' + option
+    return name
+
+
+def __fields_source(name, metadata):
+    lines = ['def fields_{}(metadata):'.format(name)]
+    if not metadata.field_specs:
+        lines.append('    return ()')
+        return lines
+    lines.append('    specs = metadata.field_specs')
+    lines.append('    return (')
+    for index, field in enumerate(metadata.field_specs):
+        shape = field_shape(metadata.wrapped_type, field)
+        lines.append('        {}(specs[{}]),'.format(
+            __shape_name(shape), index,
+        ))
+    lines.append('    )')
+    return lines
+
+
+def __field_source(shape):
+    optional = shape.optional == 'optional'
+
+    lines = ['def {}(spec):'.format(__shape_name(shape))]
+    if shape.wrapped_type == 'dict':
+        lines.append('    key = spec.key')
+    else:
+        lines.append('    key = spec.local_index')
+    if shape.type != 'any':
+        lines.append('    type_ = spec.type')
+        lines.append('    settable = settable_type(spec.type)')
+    if shape.predicate:
+        lines.append('    predicate = spec.predicate')
+    if shape.proxy:
+        lines.append('    proxy_class = spec.proxy_class')
+    if shape.format:
+        lines.append('    format_ = spec.format')
+
+    #
+    # 읽기
+    #
+    if optional and shape.wrapped_type == 'dict':
+        get = ['item = container.get(key)']
+    else:
+        get = ['item = container[key]']
+    get.append('if item is None:')
+    if optional:
+        get.append('    return None')
+    else:
+        get.append('    raise TypeError()')
+    if shape.type == 'checked':
+        get.append('if not isinstance(item, type_):')
+        get.append('    raise TypeError()')
+    elif shape.type == 'coerced':
+        get.append('item = type_(item)')
+    if shape.predicate:
+        get.append('if not predicate(item):')
+        get.append('    raise ValueError(item)')
+
+    if shape.proxy:
+        parse = ['return proxy_class(item)']
+    elif shape.format:
+        parse = ['return format_.parse(item)']
+    else:
+        parse = ['return item']
+
+    #
+    # 쓰기
+    #
+    checks = []
+    if shape.type != 'any':
+        checks.append('if not isinstance(item, settable):')
+        checks.append('    raise TypeError()')
+    if shape.predicate:
+        checks.append('if not predicate(item):')
+        checks.append('    raise ValueError(item)')
+    if optional:
+        set_ = []
+        if checks:
+            set_.append('if item is not None:')
+            set_.extend(__indent(checks))
+    else:
+        set_ = ['if item is None:', '    raise TypeError()'] + checks
+    set_.append('container[key] = item')
+
+    # proxy_class / format 둘 다 있으면 proxy_class 가 아닌 값은 format 으로
+    if shape.proxy and not shape.format:
+        format_ = [
+            'if item is not None:',
+            '    if not isinstance(item, proxy_class):',
+            '        raise TypeError()',
+            '    item = item.__jsonable__',
+        ]
+    elif not shape.proxy and shape.format:
+        format_ = [
+            'if item is not None:',
+            '    item = format_.format(item)',
+        ]
+    elif shape.proxy and shape.format:
+        format_ = [
+            'if item is not None:',
+            '    if isinstance(item, proxy_class):',
+            '        item = item.__jsonable__',
+            '    else:',
+            '        try:',
+            '            item = format_.format(item)',
+            '        except Exception:',
+            '            raise TypeError()',
+        ]
+    else:
+        format_ = []
+
+    #
+    # 지우기
+    #
+    if shape.wrapped_type == 'dict':
+        delete = [
+            'try:',
+            '    del container[key]',
+            'except KeyError:',
+            '    pass',
+        ]
+    else:
+        delete = ['container[key] = None']
+
+    self_ = ['container = self.__jsonable__']
+    body = []
+    body.extend(__function('dget', 'container', get + ['return item']))
+    body.extend(__function('dset', 'container, item', set_))
+    if optional:
+        body.extend(__function('ddelete', 'container', delete))
+    else:
+        body.extend(['', 'ddelete = None'])
+    if shape.proxy or shape.format:
+        body.extend(__function('uget', 'container', get + parse))
+        body.extend(__function('uset', 'container, item', format_ + set_))
+    else:
+        body.extend(['', 'uget = dget', 'uset = dset'])
+    body.extend(__function('getter', 'self', self_ + get + parse))
+    body.extend(__function('setter', 'self, item', self_ + format_ + set_))
+    if optional:
+        body.extend(__function('deleter', 'self', self_ + delete))
+    else:
+        body.extend(['', 'deleter = None'])
+    body.extend([
+        '',
+        'return spec._replace(',
+        '    dops=DownwardOps(dget, dset, ddelete),',
+        '    uops=UpwardOps(uget, uset, ddelete),',
+        '    descriptors=FieldDescriptors(getter, setter, deleter),',
+        ')',
+    ])
+    lines.extend(__indent(body))
+    return lines
+
+
+def __methods_source(name, metadata):
+    lines = ['def methods_{}(methods):'.format(name)]
+    if metadata.as_container:
+        lines.append('    return methods')
+        return lines
+
+    names = [field.name for field in metadata.field_specs]
+    if names:
+        eq = ['return ('] + __indent(' and\n'.join(
+            'self.{0} == peer.{0}'.format(field_name) for field_name in names
+        ).split('\n')) + [')']
+        ne = ['return ('] + __indent(' or\n'.join(
+            'self.{0} != peer.{0}'.format(field_name) for field_name in names
+        ).split('\n')) + [')']
+    else:
+        eq = ['return True']
+        ne = ['return False']
+    params = ', '.join('{}={{}}'.format(field_name) for field_name in names)
+    repr_ = [
+        'return {!r}.format('.format('{}[' + params + ']'),
+        '    type(self).__name__,',
+    ] + [
+        '    repr(self.{}),'.format(field_name) for field_name in names
+    ] + [
+        ')',
+    ]
+    lines.extend(__indent(__function('__eq__', 'self, peer', eq)))
+    lines.extend(__indent(__function('__ne__', 'self, peer', ne)))
+    lines.extend(__indent(__function('__repr__', 'self', repr_)))
+    lines.append('')
+    lines.append('    return methods._replace(')
+    lines.append('        eq=__eq__,')
+    lines.append('        ne=__ne__,')
+    lines.append('        repr=__repr__,')
+    lines.append('    )')
+    return lines
+
+
+def __function(name, params, body):
+    return ['', 'def {}({}):'.format(name, params)] + __indent(body)
+
+
+def __indent(lines):
+    return [('    ' + line) if line else line for line in lines]
+
+
+def default_output(module):
+    ''' Path of the compiled module of ``module``, next to it. '''
+    if not isinstance(module, types.ModuleType):
+        module = import_module(module)
+    name = compiled_module_name(module).rpartition('.')[2]
+    return os.path.join(os.path.dirname(module.__file__), name + '.py')
+
+
+def main(argv=None):
+    parser = ArgumentParser(prog='python -m jsonable_objects.compile')
+    parser.add_argument('module',
+                        help='module defining the proxy classes')
+    parser.add_argument('-o', '--output',
+                        help='path of the compiled module, or - for stdout '
+                        '(default: _compiled_<module>.py next to it, or '
+                        '_compiled.py in the package)')
+    args = parser.parse_args(argv)
+
+    module = import_module(args.module)
+    source = generate(module)
+    if args.output == '-':
+        sys.stdout.write(source)
+        return 0
+    output = args.output or default_output(module)
+    with io.open(output, 'w', encoding='utf-8') as fp:
+        fp.write(source)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
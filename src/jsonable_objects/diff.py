@@ -0,0 +1,133 @@
+# -*- coding: utf-8 -*-
+#
+#   jsonable-objects: JSON-able objects
+#   Copyright (C) 2015-2017 mete0r <mete0r@sarangbang.or.kr>
+#
+#   This program is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU Affero General Public License as published by
+#   the Free Software Foundation, either version 3 of the License, or
+#   (at your option) any later version.
+#
+#   This program is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#   GNU Affero General Public License for more details.
+#
+#   You should have received a copy of the GNU Affero General Public License
+#   along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+from __future__ import absolute_import
+from __future__ import print_function
+from __future__ import unicode_literals
+
+from .tracking import MISSING
+from .tracking import json_pointer
+
+
+def diff(proxy_class, a, b):
+    '''
+    Compare two documents of a proxy class along its schema.
+
+    Fields are compared by the declared ``field_list``; the nested proxies
+    (``Field(proxy=...)`` and ``itemProxy``) are compared recursively, and
+    the other values as a whole. Identical subtrees are skipped by identity
+    first. Keys not declared in a field set are not compared.
+
+    :param a:
+        an instance of ``proxy_class`` or its ``__jsonable__``.
+    :param b:
+        an instance of ``proxy_class`` or its ``__jsonable__``.
+    :returns:
+        list of the JSON Pointers of the changed paths.
+    '''
+    a = getattr(a, '__jsonable__', a)
+    b = getattr(b, '__jsonable__', b)
+    paths = []
+    if a is not b:
+        __compiled(proxy_class)(a, b, (), paths)
+    return [json_pointer(path) for path in paths]
+
+
+def __compiled(proxy_class):
+    metadata = proxy_class.__jsonable_proxy__
+    try:
+        return metadata.compiled['diff']
+    except KeyError:
+        pass
+
+    steps = []
+    for field in metadata.field_list:
+        if issubclass(metadata.wrapped_type, dict):
+            key = field.key
+        else:
+            key = field.local_index
+        steps.append((key, field.proxy_class))
+
+    if metadata.as_container:
+        nested = metadata.itemProxy
+        if issubclass(metadata.wrapped_type, dict):
+            def differ(a, b, path, paths):
+                __diff_dict_items(a, b, path, paths, nested)
+        else:
+            def differ(a, b, path, paths):
+                __diff_list_items(a, b, path, paths, nested)
+    else:
+        if issubclass(metadata.wrapped_type, dict):
+            def differ(a, b, path, paths):
+                for key, nested in steps:
+                    va = a.get(key, MISSING)
+                    vb = b.get(key, MISSING)
+                    if va is not vb:
+                        __diff_value(va, vb, path + (key,), paths, nested)
+        else:
+            def differ(a, b, path, paths):
+                la = len(a)
+                lb = len(b)
+                for index, nested in steps:
+                    va = a[index] if index < la else MISSING
+                    vb = b[index] if index < lb else MISSING
+                    if va is not vb:
+                        __diff_value(va, vb, path + (index,), paths, nested)
+
+    metadata.compiled['diff'] = differ
+    return differ
+
+
+def __diff_value(va, vb, path, paths, nested):
+    '''
+    :param nested:
+        proxy class of the values, or None.
+    '''
+    if nested is not None:
+        wrapped_type = nested.__jsonable_proxy__.wrapped_type
+        if isinstance(va, wrapped_type) and isinstance(vb, wrapped_type):
+            __compiled(nested)(va, vb, path, paths)
+            return
+    if va is MISSING or vb is MISSING or va != vb:
+        paths.append(path)
+
+
+def __diff_dict_items(a, b, path, paths, nested):
+    for key in a:
+        vb = b.get(key, MISSING)
+        if vb is MISSING:
+            paths.append(path + (key,))
+            continue
+        va = a[key]
+        if va is not vb:
+            __diff_value(va, vb, path + (key,), paths, nested)
+    for key in b:
+        if key not in a:
+            paths.append(path + (key,))
+
+
+def __diff_list_items(a, b, path, paths, nested):
+    la = len(a)
+    lb = len(b)
+    for index in range(min(la, lb)):
+        va = a[index]
+        vb = b[index]
+        if va is not vb:
+            __diff_value(va, vb, path + (index,), paths, nested)
+    for index in range(min(la, lb), max(la, lb)):
+        paths.append(path + (index,))
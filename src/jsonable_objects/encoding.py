@@ -0,0 +1,137 @@
+# -*- coding: utf-8 -*-
+#
+#   jsonable-objects: JSON-able objects
+#   Copyright (C) 2015-2017 mete0r <mete0r@sarangbang.or.kr>
+#
+#   This program is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU Affero General Public License as published by
+#   the Free Software Foundation, either version 3 of the License, or
+#   (at your option) any later version.
+#
+#   This program is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#   GNU Affero General Public License for more details.
+#
+#   You should have received a copy of the GNU Affero General Public License
+#   along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+'''
+JSON encoding of proxy trees with cached texts of the unchanged subtrees.
+'''
+from __future__ import absolute_import
+from __future__ import print_function
+from __future__ import unicode_literals
+import json
+
+from .tracking import document_of
+
+
+__encoder = json.JSONEncoder(separators=(',', ':'))
+
+
+def dumps(obj, cache=False):
+    '''
+    Encode a proxy into a compact JSON text.
+
+    :param cache:
+        if true, the encoded text of each proxied subtree is kept in the
+        tracker of the document, and reused while no change is made under
+        it. ``obj`` should be an instance of a tracked proxy class. Only the
+        subtrees whose proxy classes, and all the proxy classes nested in
+        them, are tracked are cached: the changes through the untracked ones
+        could not invalidate the cache. The same subtree should not be
+        shared by two paths of the document.
+    '''
+    proxy_class = type(obj)
+    if cache:
+        if not proxy_class.__jsonable_proxy__.tracked:
+            raise TypeError()
+        tracker, path = document_of(obj)
+        texts = tracker.cache('encoding')
+    else:
+        path = ()
+        texts = None
+    return __encode(proxy_class, obj.__jsonable__, path, texts)
+
+
+def __encode(proxy_class, jsonable, path, texts):
+    cacheable, nested_of = nesting(proxy_class)
+    if texts is not None and cacheable:
+        entry = texts.get(path)
+        if entry is not None and entry[0] is jsonable:
+            return entry[1]
+
+    encode = __encoder.encode
+    if isinstance(jsonable, dict):
+        parts = []
+        for key, value in jsonable.items():
+            nested = nested_of(key)
+            if nested is not None and isinstance(
+                value, nested.__jsonable_proxy__.wrapped_type,
+            ):
+                value = __encode(nested, value, path + (key,), texts)
+            else:
+                value = encode(value)
+            parts.append(encode(key) + ':' + value)
+        text = '{' + ','.join(parts) + '}'
+    else:
+        parts = []
+        for index, value in enumerate(jsonable):
+            nested = nested_of(index)
+            if nested is not None and isinstance(
+                value, nested.__jsonable_proxy__.wrapped_type,
+            ):
+                value = __encode(nested, value, path + (index,), texts)
+            else:
+                value = encode(value)
+            parts.append(value)
+        text = '[' + ','.join(parts) + ']'
+
+    if texts is not None and cacheable:
+        texts[path] = (jsonable, text)
+    return text
+
+
+def nesting(proxy_class):
+    '''
+    Nested proxy classes of a proxy class.
+
+    :returns:
+        ``(cacheable, nested_of)``: whether the values derived from its
+        subtrees can be cached in the trackers, and the function giving the
+        nested proxy class, or ``None``, of a key or an index.
+    '''
+    metadata = proxy_class.__jsonable_proxy__
+    try:
+        return metadata.compiled['encoding']
+    except KeyError:
+        pass
+
+    if metadata.as_container:
+        itemProxy = metadata.itemProxy
+        nested_classes = [itemProxy] if itemProxy is not None else []
+
+        def nested_of(key):
+            return itemProxy
+    else:
+        if issubclass(metadata.wrapped_type, dict):
+            nested_by_key = dict(
+                (field.key, field.proxy_class)
+                for field in metadata.field_list
+                if field.proxy_class is not None
+            )
+        else:
+            nested_by_key = dict(
+                (field.local_index, field.proxy_class)
+                for field in metadata.field_list
+                if field.proxy_class is not None
+            )
+        nested_classes = list(nested_by_key.values())
+        nested_of = nested_by_key.get
+
+    cacheable = metadata.tracked and all(
+        nesting(nested)[0] for nested in nested_classes
+    )
+    compiled = metadata.compiled['encoding'] = (cacheable, nested_of)
+    return compiled
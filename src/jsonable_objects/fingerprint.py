@@ -0,0 +1,117 @@
+# -*- coding: utf-8 -*-
+#
+#   jsonable-objects: JSON-able objects
+#   Copyright (C) 2015-2017 mete0r <mete0r@sarangbang.or.kr>
+#
+#   This program is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU Affero General Public License as published by
+#   the Free Software Foundation, either version 3 of the License, or
+#   (at your option) any later version.
+#
+#   This program is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#   GNU Affero General Public License for more details.
+#
+#   You should have received a copy of the GNU Affero General Public License
+#   along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+'''
+Structural fingerprints of proxy trees, memoized per subtree.
+'''
+from __future__ import absolute_import
+from __future__ import print_function
+from __future__ import unicode_literals
+import binascii
+import hashlib
+import json
+
+from .encoding import nesting
+from .table import RowRef
+from .tracking import document_of
+
+
+if 'blake2b' in hashlib.algorithms_available:
+    DEFAULT_ALGORITHM = 'blake2b'
+else:
+    # Python 3.6 이전에는 BLAKE2 가 없다.
+    DEFAULT_ALGORITHM = 'sha256'
+
+
+__canonical = json.JSONEncoder(
+    separators=(',', ':'),
+    sort_keys=True,
+    ensure_ascii=False,
+)
+
+
+def fingerprint(obj, algorithm=None):
+    '''
+    Stable digest of the proxied document, in hexadecimal.
+
+    Each proxied subtree is digested on its own, over the canonical JSON
+    encoding (sorted keys, no whitespaces, UTF-8) of its members, in which the
+    nested proxied subtrees are replaced by their own digests. The digests
+    thus depend on the schema as well as on the content.
+
+    The digests of the subtrees of tracked documents are kept in their
+    trackers, and reused while no change is made under them, as
+    ``encoding.dumps(..., cache=True)`` does with the texts. The same
+    subtree should not be shared by two paths of such a document.
+
+    :param algorithm:
+        a ``hashlib`` algorithm name. BLAKE2b by default, or SHA-256 where
+        it is not available.
+    '''
+    if isinstance(obj.__jsonable__, RowRef):
+        # 행 뷰는 dict 나 list 가 아니다: RecordTable.record() 를 쓴다.
+        raise TypeError('row views of a RecordTable cannot be fingerprinted')
+    if algorithm is None:
+        algorithm = DEFAULT_ALGORITHM
+    proxy_class = type(obj)
+    if proxy_class.__jsonable_proxy__.tracked:
+        tracker, path = document_of(obj)
+        digests = tracker.cache('fingerprint:' + algorithm)
+    else:
+        path = ()
+        digests = None
+    digest = __digest(proxy_class, obj.__jsonable__, path, digests, algorithm)
+    return binascii.hexlify(digest).decode('ascii')
+
+
+def __digest(proxy_class, jsonable, path, digests, algorithm):
+    cacheable, nested_of = nesting(proxy_class)
+    if digests is not None and cacheable:
+        entry = digests.get(path)
+        if entry is not None and entry[0] is jsonable:
+            return entry[1]
+
+    encode = __canonical.encode
+    if isinstance(jsonable, dict):
+        parts = []
+        for key in sorted(jsonable):
+            value = __member(nested_of(key), jsonable[key], path + (key,),
+                             digests, algorithm)
+            parts.append(encode(key).encode('utf-8') + b':' + value)
+        text = b'{' + b','.join(parts) + b'}'
+    else:
+        parts = [
+            __member(nested_of(index), value, path + (index,),
+                     digests, algorithm)
+            for index, value in enumerate(jsonable)
+        ]
+        text = b'[' + b','.join(parts) + b']'
+
+    digest = hashlib.new(algorithm, text).digest()
+    if digests is not None and cacheable:
+        digests[path] = (jsonable, digest)
+    return digest
+
+
+def __member(nested, value, path, digests, algorithm):
+    if nested is not None and isinstance(
+        value, nested.__jsonable_proxy__.wrapped_type,
+    ):
+        # NUL 은 JSON 텍스트에 나타나지 않으므로 구분된다.
+        return b'\x00' + __digest(nested, value, path, digests, algorithm)
+    return __canonical.encode(value).encode('utf-8')
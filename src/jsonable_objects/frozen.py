@@ -0,0 +1,157 @@
+# -*- coding: utf-8 -*-
+#
+#   jsonable-objects: JSON-able objects
+#   Copyright (C) 2015-2017 mete0r <mete0r@sarangbang.or.kr>
+#
+#   This program is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU Affero General Public License as published by
+#   the Free Software Foundation, either version 3 of the License, or
+#   (at your option) any later version.
+#
+#   This program is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#   GNU Affero General Public License for more details.
+#
+#   You should have received a copy of the GNU Affero General Public License
+#   along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+'''
+Frozen, hashable proxies.
+
+Every attempt to mutate a frozen proxy, through its fields or its items,
+raises ``TypeError``. The nested proxy classes should be frozen as well.
+'''
+from __future__ import absolute_import
+from __future__ import print_function
+from __future__ import unicode_literals
+
+
+def check_nested(itemProxy, field_specs):
+    ''' Raise ``TypeError`` if a nested proxy class is not frozen. '''
+    nested = [field.proxy_class for field in field_specs]
+    nested.append(itemProxy)
+    for proxy_class in nested:
+        if (proxy_class is not None and
+                not proxy_class.__jsonable_proxy__.frozen):
+            raise TypeError(proxy_class)
+
+
+def refuse_mutation(self, *args):
+    ''' Setter / deleter of the fields and items of the frozen proxies. '''
+    raise TypeError(type(self).__name__)
+
+
+def make_frozen_methods(methods):
+    '''
+    Methods of the frozen proxy classes.
+
+    The container mutators raise ``TypeError``, and the equality compares
+    the cached hashes first.
+    '''
+    eq = methods.eq
+    ne = methods.ne
+
+    def __eq__(self, peer):
+        if type(peer) is type(self) and hash(self) != hash(peer):
+            return False
+        return eq(self, peer)
+
+    def __ne__(self, peer):
+        if type(peer) is type(self) and hash(self) != hash(peer):
+            return True
+        return ne(self, peer)
+
+    methods = methods._replace(eq=__eq__, ne=__ne__)
+    if methods.getitem is None:
+        return methods
+
+    return methods._replace(setitem=refuse_mutation, delitem=refuse_mutation)
+
+
+def hash_proxy(self):
+    '''
+    ``__hash__`` of the frozen proxies.
+
+    It is computed once from the raw structure, through the fields and the
+    items as the equality sees them, i.e. parsed by their formats, and then
+    cached.
+    '''
+    try:
+        return self.__jsonable_hash__
+    except AttributeError:
+        pass
+    value = hash(__compiled(type(self))(self.__jsonable__))
+    self.__jsonable_hash__ = value
+    return value
+
+
+def freeze_value(value):
+    ''' Hashable equivalent of a raw JSON value. '''
+    if isinstance(value, dict):
+        return frozenset(
+            (key, freeze_value(item)) for key, item in value.items()
+        )
+    if isinstance(value, list):
+        return tuple(freeze_value(item) for item in value)
+    return value
+
+
+def __compiled(proxy_class):
+    metadata = proxy_class.__jsonable_proxy__
+    try:
+        return metadata.compiled['hash']
+    except KeyError:
+        pass
+
+    if metadata.as_container:
+        freeze_item = __make_freezer(metadata.itemProxy, metadata.itemFormat)
+        if issubclass(metadata.wrapped_type, dict):
+            keyFormat = metadata.keyFormat
+            if keyFormat is None:
+                def freeze(jsonable):
+                    return frozenset(
+                        (key, freeze_item(value))
+                        for key, value in jsonable.items()
+                    )
+            else:
+                def freeze(jsonable):
+                    # 같은 키로 읽히는 키들은 __eq__ 처럼 하나로 합친다.
+                    return frozenset(dict(
+                        (keyFormat.parse(key), freeze_item(value))
+                        for key, value in jsonable.items()
+                    ).items())
+        else:
+            def freeze(jsonable):
+                return tuple(freeze_item(value) for value in jsonable)
+    else:
+        freezers = [
+            (field.dops.get, __make_freezer(field.proxy_class, field.format))
+            for field in metadata.field_list
+        ]
+
+        def freeze(jsonable):
+            return tuple(
+                freeze_field(get(jsonable))
+                for get, freeze_field in freezers
+            )
+
+    metadata.compiled['hash'] = freeze
+    return freeze
+
+
+def __make_freezer(proxy_class, format):
+    # proxy_class 가 format 보다 우선한다: __make_upward_ops 참고
+    if proxy_class is not None:
+        def freeze(value):
+            if value is None:
+                return None
+            return __compiled(proxy_class)(value)
+    elif format is not None:
+        def freeze(value):
+            if value is None:
+                return None
+            return freeze_value(format.parse(value))
+    else:
+        freeze = freeze_value
+    return freeze
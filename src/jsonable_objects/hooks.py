@@ -0,0 +1,231 @@
+# -*- coding: utf-8 -*-
+#
+#   jsonable-objects: JSON-able objects
+#   Copyright (C) 2015-2017 mete0r <mete0r@sarangbang.or.kr>
+#
+#   This program is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU Affero General Public License as published by
+#   the Free Software Foundation, either version 3 of the License, or
+#   (at your option) any later version.
+#
+#   This program is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#   GNU Affero General Public License for more details.
+#
+#   You should have received a copy of the GNU Affero General Public License
+#   along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+'''
+Timing hooks of the top-level validations.
+
+While no hook is registered, ``ProxyClassMetadata.validate`` is the plain
+one; registering the first hook swaps in the timed one::
+
+    from jsonable_objects import hooks
+
+    slowest = hooks.capture_slowest(10)
+    hooks.on_validate(lambda event: stats.timing(event.seconds),
+                      sample_rate=0.01)
+
+Only the top-level validations are reported: not the validations of the
+nested proxies which they make, nor those made by the hooks.
+'''
+from __future__ import absolute_import
+from __future__ import print_function
+from __future__ import unicode_literals
+import heapq
+import itertools
+import random
+import threading
+import timeit
+import weakref
+
+from .proxy import ProxyClassMetadata
+from .proxy import proxy_classes
+
+
+__plain_validate = ProxyClassMetadata.validate
+__hooks = []
+__state = threading.local()
+__classes = weakref.WeakValueDictionary()
+
+
+class ValidationEvent(object):
+    '''
+    A top-level validation.
+
+    :ivar proxy_class:
+        the proxy class validated against.
+    :ivar seconds:
+        the duration.
+    :ivar jsonable:
+        the validated document.
+    :ivar error:
+        the raised exception, or ``None``.
+    '''
+
+    __slots__ = (
+        'proxy_class',
+        'seconds',
+        'jsonable',
+        'error',
+        '__size',
+    )
+
+    def __init__(self, proxy_class, seconds, jsonable, error):
+        self.proxy_class = proxy_class
+        self.seconds = seconds
+        self.jsonable = jsonable
+        self.error = error
+        self.__size = None
+
+    @property
+    def size(self):
+        ''' Number of the JSON values in the document, counted on demand. '''
+        if self.__size is None:
+            self.__size = count_values(self.jsonable)
+        return self.__size
+
+    def __repr__(self):
+        return '<ValidationEvent {} {:.6f}s>'.format(
+            getattr(self.proxy_class, '__name__', None), self.seconds,
+        )
+
+
+class SlowestDocuments(object):
+    '''
+    Bounded buffer of the slowest validations; see :func:`capture_slowest`.
+    '''
+
+    __slots__ = (
+        'size',
+        'heap',
+        'counter',
+        'lock',
+    )
+
+    def __init__(self, size):
+        self.size = size
+        self.heap = []
+        self.counter = itertools.count()
+        self.lock = threading.Lock()
+
+    def __call__(self, event):
+        entry = (event.seconds, next(self.counter), event)
+        with self.lock:
+            if len(self.heap) < self.size:
+                heapq.heappush(self.heap, entry)
+            elif entry[0] > self.heap[0][0]:
+                heapq.heapreplace(self.heap, entry)
+
+    def events(self):
+        ''' The captured events, the slowest first. '''
+        with self.lock:
+            entries = sorted(self.heap, reverse=True)
+        return [event for seconds, n, event in entries]
+
+    def clear(self):
+        with self.lock:
+            del self.heap[:]
+
+    def close(self):
+        remove_validate_hook(self)
+
+
+def on_validate(callback, sample_rate=1.0):
+    '''
+    Call ``callback`` with a :class:`ValidationEvent` after the top-level
+    validations, including the failed ones.
+
+    :param sample_rate:
+        the fraction of the validations to report, chosen at random.
+    :returns:
+        ``callback``.
+    '''
+    if not __hooks:
+        ProxyClassMetadata.validate = __timed_validate
+    __hooks.append((callback, sample_rate))
+    return callback
+
+
+def remove_validate_hook(callback):
+    __hooks[:] = [
+        (hook, sample_rate)
+        for hook, sample_rate in __hooks
+        if hook != callback
+    ]
+    if not __hooks:
+        ProxyClassMetadata.validate = __plain_validate
+
+
+def capture_slowest(n, sample_rate=1.0):
+    '''
+    Keep the ``n`` slowest top-level validations.
+
+    :returns:
+        a registered :class:`SlowestDocuments`; ``close()`` it to stop.
+    '''
+    return on_validate(SlowestDocuments(n), sample_rate)
+
+
+def validate_hooks():
+    ''' The registered validation hooks. '''
+    return [hook for hook, sample_rate in __hooks]
+
+
+def count_values(jsonable):
+    ''' Number of the JSON values in a document, containers included. '''
+    count = 0
+    stack = [jsonable]
+    while stack:
+        value = stack.pop()
+        count += 1
+        if isinstance(value, dict):
+            stack.extend(value.values())
+        elif isinstance(value, list):
+            stack.extend(value)
+    return count
+
+
+def __timed_validate(self, __jsonable__):
+    state = __state
+    if getattr(state, 'depth', 0):
+        return __plain_validate(self, __jsonable__)
+
+    state.depth = 1
+    try:
+        sampled = [
+            hook for hook, sample_rate in __hooks
+            if sample_rate >= 1.0 or random.random() < sample_rate
+        ]
+        if not sampled:
+            return __plain_validate(self, __jsonable__)
+
+        error = None
+        start = timeit.default_timer()
+        try:
+            return __plain_validate(self, __jsonable__)
+        except Exception as e:
+            error = e
+            raise
+        finally:
+            seconds = timeit.default_timer() - start
+            event = ValidationEvent(
+                __class_of(self), seconds, __jsonable__, error,
+            )
+            for hook in sampled:
+                hook(event)
+    finally:
+        state.depth = 0
+
+
+def __class_of(metadata):
+    try:
+        return __classes[metadata]
+    except KeyError:
+        pass
+    for proxy_class in list(proxy_classes):
+        if proxy_class.__dict__.get('__jsonable_proxy__') is metadata:
+            __classes[metadata] = proxy_class
+            return proxy_class
@@ -0,0 +1,314 @@
+# -*- coding: utf-8 -*-
+#
+#   jsonable-objects: JSON-able objects
+#   Copyright (C) 2015-2017 mete0r <mete0r@sarangbang.or.kr>
+#
+#   This program is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU Affero General Public License as published by
+#   the Free Software Foundation, either version 3 of the License, or
+#   (at your option) any later version.
+#
+#   This program is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#   GNU Affero General Public License for more details.
+#
+#   You should have received a copy of the GNU Affero General Public License
+#   along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+'''
+Instrumentation counters of the proxy classes.
+
+When enabled, with :func:`enable` or the ``JSONABLE_OBJECTS_INSTRUMENT``
+environment variable, the proxy classes get instrumented methods and field
+descriptors which count, per proxy class:
+
+- ``validate``: validations,
+- ``init``: constructions,
+- ``read:<field>`` / ``write:<field>``: field reads and writes (deletions
+  included),
+- ``item_read`` / ``item_write``: container item reads and writes,
+- ``parse`` / ``format``: calls of the formats of the fields and of the
+  containers,
+- ``child``: nested proxies constructed by field or item reads.
+
+:func:`disable` puts the original methods and descriptors back, so that the
+uninstrumented proxies pay nothing.
+'''
+from __future__ import absolute_import
+from __future__ import print_function
+from __future__ import unicode_literals
+from collections import Counter
+import weakref
+
+from .proxy import class_hooks
+from .proxy import proxy_classes
+from .proxy import with_descriptors
+
+
+__counters = weakref.WeakKeyDictionary()
+__originals = weakref.WeakKeyDictionary()
+__metadata_counters = {}
+
+
+def is_enabled():
+    return instrument in class_hooks
+
+
+def enable():
+    ''' Instrument the existing proxy classes, and the ones to be made. '''
+    if is_enabled():
+        return
+    class_hooks.append(instrument)
+    for proxy_class in list(proxy_classes):
+        instrument(proxy_class)
+
+
+def disable():
+    ''' Put the original methods and descriptors back. The counts remain. '''
+    if not is_enabled():
+        return
+    class_hooks.remove(instrument)
+    for proxy_class in list(__originals.keys()):
+        uninstrument(proxy_class)
+
+
+def reset():
+    ''' Clear the counts. '''
+    for counter in __counters.values():
+        counter.clear()
+
+
+def counters():
+    ''' ``{proxy_class: {event: count}}`` of the counted events. '''
+    return dict(
+        (proxy_class, dict(counter))
+        for proxy_class, counter in __counters.items()
+        if counter
+    )
+
+
+def hottest(n=10):
+    ''' The ``n`` largest counts as ``(count, proxy_class, event)``. '''
+    counts = [
+        (count, proxy_class, event)
+        for proxy_class, counter in __counters.items()
+        for event, count in counter.items()
+    ]
+    counts.sort(key=lambda item: item[0], reverse=True)
+    return counts[:n]
+
+
+def counter_of(proxy_class):
+    try:
+        return __counters[proxy_class]
+    except KeyError:
+        counter = __counters[proxy_class] = Counter()
+        return counter
+
+
+class CountingFormat(object):
+    ''' Format counting its ``parse`` / ``format`` calls. '''
+
+    __slots__ = (
+        'wrapped',
+        'counter',
+    )
+
+    def __init__(self, wrapped, counter):
+        self.wrapped = wrapped
+        self.counter = counter
+
+    def parse(self, jsonableval):
+        self.counter['parse'] += 1
+        return self.wrapped.parse(jsonableval)
+
+    def format(self, pyobj):
+        self.counter['format'] += 1
+        return self.wrapped.format(pyobj)
+
+
+def instrument(proxy_class):
+    if proxy_class in __originals:
+        return
+    metadata = proxy_class.__jsonable_proxy__
+    if proxy_class.__dict__.get('__jsonable_proxy__') is not metadata:
+        # 데코레이터를 거치지 않은 하위 클래스
+        return
+    counter = counter_of(proxy_class)
+    __metadata_counters[metadata] = counter
+
+    names = ['__init__']
+    if metadata.as_container:
+        names += ['__iter__', '__getitem__', '__setitem__', '__delitem__']
+    names += [field.name for field in metadata.field_list]
+    __originals[proxy_class] = (
+        dict((name, proxy_class.__dict__.get(name)) for name in names),
+        metadata.__class__,
+        metadata.field_list,
+        metadata.keyFormat,
+        metadata.itemFormat,
+    )
+
+    init = proxy_class.__init__
+
+    def __init__(self, *args, **kwargs):
+        counter['init'] += 1
+        init(self, *args, **kwargs)
+    proxy_class.__init__ = __init__
+
+    metadata.__class__ = __instrumented_metadata_class(metadata.__class__)
+    field_list = []
+    for field in metadata.field_list:
+        if field.format is not None:
+            field = with_descriptors(metadata, field._replace(
+                format=CountingFormat(field.format, counter),
+            ))
+        field_list.append(field)
+        setattr(proxy_class, field.name,
+                __instrumented_property(field, counter))
+    metadata.field_list = tuple(field_list)
+
+    if metadata.as_container:
+        # validate() 는 이것들을 metadata 에서 읽는다.
+        if metadata.keyFormat is not None:
+            metadata.keyFormat = CountingFormat(metadata.keyFormat, counter)
+        if metadata.itemFormat is not None:
+            metadata.itemFormat = CountingFormat(metadata.itemFormat,
+                                                 counter)
+        __instrument_container(proxy_class, metadata, counter)
+
+
+def uninstrument(proxy_class):
+    try:
+        attrs, metadata_class, field_list, keyFormat, itemFormat = (
+            __originals.pop(proxy_class)
+        )
+    except KeyError:
+        return
+    for name, value in attrs.items():
+        if value is None:
+            delattr(proxy_class, name)
+        else:
+            setattr(proxy_class, name, value)
+    metadata = proxy_class.__jsonable_proxy__
+    __metadata_counters.pop(metadata, None)
+    metadata.__class__ = metadata_class
+    metadata.field_list = field_list
+    metadata.keyFormat = keyFormat
+    metadata.itemFormat = itemFormat
+
+
+__instrumented_metadata_classes = {}
+
+
+def __instrumented_metadata_class(metadata_class):
+    try:
+        return __instrumented_metadata_classes[metadata_class]
+    except KeyError:
+        pass
+
+    # 클래스 안에서는 __ 로 시작하는 이름이 변형되므로
+    counters = __metadata_counters
+
+    class InstrumentedMetadata(metadata_class):
+        __slots__ = ()
+
+        def validate(self, __jsonable__):
+            counter = counters.get(self)
+            if counter is not None:
+                counter['validate'] += 1
+            return metadata_class.validate(self, __jsonable__)
+
+    __instrumented_metadata_classes[metadata_class] = InstrumentedMetadata
+    return InstrumentedMetadata
+
+
+def __instrumented_property(field, counter):
+    get, set_, delete = field.descriptors
+    read = 'read:' + field.name
+    write = 'write:' + field.name
+
+    if field.proxy_class is not None:
+        def getter(self):
+            counter[read] += 1
+            value = get(self)
+            if value is not None:
+                counter['child'] += 1
+            return value
+    else:
+        def getter(self):
+            counter[read] += 1
+            return get(self)
+
+    if set_ is not None:
+        def setter(self, value):
+            counter[write] += 1
+            set_(self, value)
+    else:
+        setter = None
+
+    if delete is not None:
+        def deleter(self):
+            counter[write] += 1
+            delete(self)
+    else:
+        deleter = None
+
+    return property(getter, setter, deleter)
+
+
+def __instrument_container(proxy_class, metadata, counter):
+    # 컨테이너 메소드들은 포맷을 클로저로 갖고 있으므로, 그 호출 수는
+    # 읽고 쓴 항목 수로 센다.
+    child = metadata.itemProxy is not None
+    parse = metadata.itemFormat is not None
+    format_ = metadata.itemFormat is not None
+    key_format = metadata.keyFormat is not None
+    iter_ = proxy_class.__iter__
+    getitem = proxy_class.__getitem__
+    setitem = proxy_class.__setitem__
+    delitem = proxy_class.__delitem__
+    is_list = issubclass(metadata.wrapped_type, list)
+
+    def count_reads(n):
+        counter['item_read'] += n
+        if child:
+            counter['child'] += n
+        if parse:
+            counter['parse'] += n
+
+    def __iter__(self):
+        for item in iter_(self):
+            if is_list:
+                count_reads(1)
+            elif key_format:
+                counter['parse'] += 1
+            yield item
+
+    def __getitem__(self, key):
+        if key_format:
+            counter['format'] += 1
+        value = getitem(self, key)
+        count_reads(len(value) if isinstance(key, slice) else 1)
+        return value
+
+    def __setitem__(self, key, value):
+        if key_format:
+            counter['format'] += 1
+        n = len(value) if isinstance(key, slice) else 1
+        counter['item_write'] += n
+        if format_:
+            counter['format'] += n
+        setitem(self, key, value)
+
+    def __delitem__(self, key):
+        if key_format:
+            counter['format'] += 1
+        counter['item_write'] += 1
+        delitem(self, key)
+
+    proxy_class.__iter__ = __iter__
+    proxy_class.__getitem__ = __getitem__
+    proxy_class.__setitem__ = __setitem__
+    proxy_class.__delitem__ = __delitem__
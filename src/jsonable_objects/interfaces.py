@@ -16,12 +16,25 @@
 #   You should have received a copy of the GNU Affero General Public License
 #   along with this program.  If not, see <http://www.gnu.org/licenses/>.
 #
+'''
+zope.interface integration.
+
+``zope.interface`` is optional: install ``jsonable-objects[zope]``. The proxy
+classes are declared to implement :class:`IJsonable` when this module is
+imported, and the ones defined afterwards as they are made; without it, use
+the duck-typing ``proxy.is_jsonable()`` / ``proxy.is_format()``.
+'''
 from __future__ import absolute_import
 from __future__ import print_function
 from __future__ import unicode_literals
 
 from zope.interface import Attribute
 from zope.interface import Interface
+from zope.interface import classImplements
+
+from .proxy import JsonableProxy
+from .proxy import class_hooks
+from .proxy import proxy_classes
 
 
 class IJsonable(Interface):
@@ -36,3 +49,13 @@ class IFormat(Interface):
 
     def parse(jval):
         pass
+
+
+def declare_jsonable(cls):
+    classImplements(cls, IJsonable)
+
+
+declare_jsonable(JsonableProxy)
+for __proxy_class in list(proxy_classes):
+    declare_jsonable(__proxy_class)
+class_hooks.append(declare_jsonable)
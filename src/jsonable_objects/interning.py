@@ -0,0 +1,161 @@
+# -*- coding: utf-8 -*-
+#
+#   jsonable-objects: JSON-able objects
+#   Copyright (C) 2015-2017 mete0r <mete0r@sarangbang.or.kr>
+#
+#   This program is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU Affero General Public License as published by
+#   the Free Software Foundation, either version 3 of the License, or
+#   (at your option) any later version.
+#
+#   This program is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#   GNU Affero General Public License for more details.
+#
+#   You should have received a copy of the GNU Affero General Public License
+#   along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+'''
+Interning of the keys and the declared string values at load time.
+
+The same key strings are repeated across many documents; the decoders share
+them only within one text. The proxy classes tell which strings are worth
+interning: the keys of the proxied dicts and of the plain dicts under them,
+and the values of the fields declared with ``Field(intern=True)``. The keys
+of the proxied containers are data, and left alone.
+'''
+from __future__ import absolute_import
+from __future__ import print_function
+from __future__ import unicode_literals
+import json
+import sys
+
+
+try:
+    intern_string = sys.intern
+except AttributeError:
+    # Python 2 의 intern() 은 unicode 를 받지 않는다. unicode 는 약한 참조도
+    # 안 되므로, 한없이 커지지 않도록 가득 차면 비우고 다시 채운다. 이미
+    # 공유된 문자열들은 그대로 공유된다.
+    __interned = {}
+    __interned_size = 1 << 16
+
+    def intern_string(string):
+        interned = __interned.get(string)
+        if interned is not None:
+            return interned
+        if len(__interned) >= __interned_size:
+            __interned.clear()
+        __interned[string] = string
+        return string
+
+
+def wrap(proxy_class, jsonable):
+    ''' Intern the strings of ``jsonable`` in place, and proxy it. '''
+    __compiled(proxy_class)(jsonable)
+    return proxy_class(jsonable)
+
+
+def loads(proxy_class, text, loads=json.loads):
+    ''' Decode a JSON text, interning its strings, into a proxy. '''
+    return wrap(proxy_class, loads(text))
+
+
+def load(proxy_class, fp, loads=json.loads):
+    ''' Decode a JSON file, interning its strings, into a proxy. '''
+    return wrap(proxy_class, loads(fp.read()))
+
+
+def intern_keys(jsonable):
+    ''' Intern the keys of the dicts in a plain JSON value, in place. '''
+    if isinstance(jsonable, dict):
+        items = [
+            (intern_string(key), intern_keys(value))
+            for key, value in jsonable.items()
+        ]
+        jsonable.clear()
+        jsonable.update(items)
+    elif isinstance(jsonable, list):
+        for value in jsonable:
+            intern_keys(value)
+    return jsonable
+
+
+def __compiled(proxy_class):
+    metadata = proxy_class.__jsonable_proxy__
+    try:
+        return metadata.compiled['interning']
+    except KeyError:
+        pass
+
+    if metadata.as_container:
+        intern_item = __make_value_interner(metadata.itemProxy, False)
+        if issubclass(metadata.wrapped_type, dict):
+            def intern(jsonable):
+                if not isinstance(jsonable, dict):
+                    return jsonable
+                for key, value in jsonable.items():
+                    intern_item(value)
+                return jsonable
+        else:
+            def intern(jsonable):
+                if not isinstance(jsonable, list):
+                    return jsonable
+                for value in jsonable:
+                    intern_item(value)
+                return jsonable
+    elif issubclass(metadata.wrapped_type, dict):
+        interners = dict(
+            (intern_string(field.key),
+             __make_value_interner(field.proxy_class, field.intern))
+            for field in metadata.field_list
+        )
+        keys = dict((key, key) for key in interners)
+
+        def intern(jsonable):
+            if not isinstance(jsonable, dict):
+                return jsonable
+            items = []
+            for key, value in jsonable.items():
+                interned = keys.get(key)
+                if interned is None:
+                    items.append((intern_string(key), intern_keys(value)))
+                else:
+                    items.append((interned, interners[key](value)))
+            jsonable.clear()
+            jsonable.update(items)
+            return jsonable
+    else:
+        interners = [
+            __make_value_interner(field.proxy_class, field.intern)
+            for field in metadata.field_list
+        ]
+
+        def intern(jsonable):
+            if not isinstance(jsonable, list):
+                return jsonable
+            for index, value in enumerate(jsonable):
+                if index < len(interners):
+                    jsonable[index] = interners[index](value)
+                else:
+                    intern_keys(value)
+            return jsonable
+
+    metadata.compiled['interning'] = intern
+    return intern
+
+
+def __make_value_interner(proxy_class, intern_value):
+    if proxy_class is not None:
+        def intern(value):
+            # 클래스들이 모두 정의된 뒤에 컴파일한다.
+            return __compiled(proxy_class)(value)
+        return intern
+    if intern_value:
+        def intern(value):
+            if isinstance(value, type('')):
+                return intern_string(value)
+            return value
+        return intern
+    return intern_keys
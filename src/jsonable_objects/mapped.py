@@ -0,0 +1,301 @@
+# -*- coding: utf-8 -*-
+#
+#   jsonable-objects: JSON-able objects
+#   Copyright (C) 2015-2017 mete0r <mete0r@sarangbang.or.kr>
+#
+#   This program is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU Affero General Public License as published by
+#   the Free Software Foundation, either version 3 of the License, or
+#   (at your option) any later version.
+#
+#   This program is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#   GNU Affero General Public License for more details.
+#
+#   You should have received a copy of the GNU Affero General Public License
+#   along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+'''
+Memory-mapped, lazily decoded JSON / NDJSON documents.
+'''
+from __future__ import absolute_import
+from __future__ import print_function
+from __future__ import unicode_literals
+from array import array
+from collections import OrderedDict
+import io
+import json
+import mmap
+import os.path
+import re
+
+from .scan import iter_array
+from .scan import iter_object
+from .scan import skip_ws
+from .scan import value_kind
+
+
+__ndjson_line = re.compile(br'\S[^\n]*')
+
+
+try:
+    array('q')
+except ValueError:
+    # Python 2 의 array 에는 'q' 가 없다. 64 비트 유닉스의 'l' 은 8 바이트이다.
+    __offset_typecode = 'l'
+else:
+    __offset_typecode = 'q'
+
+
+class LRUCache(object):
+
+    __slots__ = (
+        'size',
+        'items',
+    )
+
+    def __init__(self, size):
+        self.size = size
+        self.items = OrderedDict()
+
+    def __len__(self):
+        return len(self.items)
+
+    def get(self, key, default=None):
+        items = self.items
+        try:
+            value = items.pop(key)
+        except KeyError:
+            return default
+        items[key] = value
+        return value
+
+    def put(self, key, value):
+        if self.size <= 0:
+            return
+        items = self.items
+        items.pop(key, None)
+        items[key] = value
+        if len(items) > self.size:
+            items.popitem(last=False)
+
+
+class MappedDocument(object):
+
+    __slots__ = (
+        'buf',
+        'starts',
+        'ends',
+        'cache',
+        'loads',
+    )
+
+    def __init__(self, buf, starts, ends, cache_size, loads):
+        self.buf = buf
+        self.starts = starts
+        self.ends = ends
+        self.cache = LRUCache(cache_size)
+        self.loads = loads
+
+    def __len__(self):
+        return len(self.starts)
+
+    def __setitem__(self, key, value):
+        raise TypeError()
+
+    def __delitem__(self, key):
+        raise TypeError()
+
+    def close(self):
+        if self.buf is not None:
+            self.buf.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def decode(self, index):
+        ''' Decode the ``index``-th value, bypassing the cache. '''
+        data = self.buf[self.starts[index]:self.ends[index]]
+        return self.loads(data.decode('utf-8'))
+
+    def decode_cached(self, index):
+        cache = self.cache
+        value = cache.get(index, cache)
+        if value is cache:
+            value = self.decode(index)
+            cache.put(index, value)
+        return value
+
+
+class MappedArray(MappedDocument):
+    '''
+    Read-only sequence of the items of a mapped JSON array or NDJSON file.
+    '''
+
+    __slots__ = ()
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [
+                self.decode_cached(i)
+                for i in range(*index.indices(len(self)))
+            ]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError(index)
+        return self.decode_cached(index)
+
+    def __iter__(self):
+        # 순차 접근으로 자주 쓰이는 항목들이 캐시에서 밀려나지 않도록 한다.
+        for index in range(len(self)):
+            yield self.decode(index)
+
+    def __contains__(self, item):
+        return any(value == item for value in self)
+
+
+class MappedObject(MappedDocument):
+    '''
+    Read-only mapping of the members of a mapped JSON object.
+    '''
+
+    __slots__ = (
+        'index',
+    )
+
+    def __init__(self, buf, keys, starts, ends, cache_size, loads):
+        super(MappedObject, self).__init__(
+            buf, starts, ends, cache_size, loads,
+        )
+        self.index = dict((key, i) for i, key in enumerate(keys))
+
+    def __getitem__(self, key):
+        return self.decode_cached(self.index[key])
+
+    def get(self, key, default=None):
+        try:
+            index = self.index[key]
+        except KeyError:
+            return default
+        return self.decode_cached(index)
+
+    def __iter__(self):
+        return iter(self.index)
+
+    def __contains__(self, key):
+        return key in self.index
+
+    def keys(self):
+        return self.index.keys()
+
+    def values(self):
+        for key in self.index:
+            yield self.decode(self.index[key])
+
+    def items(self):
+        for key in self.index:
+            yield key, self.decode(self.index[key])
+
+
+def load_mapped(path, proxy_class=None, ndjson=None, cache_size=1024,
+                loads=json.loads):
+    '''
+    Open a JSON / NDJSON file through ``mmap`` with an offset index.
+
+    Only the offsets of the top-level items (or members) are indexed when
+    opened. Each item is decoded when accessed, and kept in a bounded LRU
+    cache. The decoded items should be treated as read-only.
+
+    Building the index scans the whole file once, matching each top-level
+    item with a single regular expression without decoding it. It takes
+    about as long as ``json.load`` on the same file (less for large flat
+    items, up to 1.5 times for small nested ones; see the ``json_load_file``
+    and ``mapped_index_file`` benchmarks), but the index itself takes only 16
+    bytes per item, plus the keys of an object. Items nested deeper than
+    :data:`~jsonable_objects.scan.SKIP_DEPTH` are skipped more slowly.
+
+    :param proxy_class:
+        a container proxy class, e.g. ``@proxy(list, itemProxy=Foo)``. If
+        given, it wraps the mapped document without validating it up front;
+        the items are validated by ``itemProxy`` / ``itemFormat`` when they
+        are accessed.
+    :param ndjson:
+        whether the file is a NDJSON. ``None`` to guess from the extension
+        (``.ndjson`` or ``.jsonl``).
+    :param cache_size:
+        maximum number of decoded items to keep.
+    :returns:
+        a :class:`MappedArray` or a :class:`MappedObject`, or an instance of
+        ``proxy_class`` wrapping it.
+    '''
+    if ndjson is None:
+        ext = os.path.splitext(path)[1].lower()
+        ndjson = ext in ('.ndjson', '.jsonl')
+
+    with io.open(path, 'rb') as fp:
+        if os.fstat(fp.fileno()).st_size == 0:
+            buf = None
+        else:
+            buf = mmap.mmap(fp.fileno(), 0, access=mmap.ACCESS_READ)
+
+    if ndjson:
+        document = __index_ndjson(buf, cache_size, loads)
+    else:
+        document = __index_json(buf, cache_size, loads)
+
+    if proxy_class is None:
+        return document
+
+    metadata = proxy_class.__jsonable_proxy__
+    if isinstance(document, MappedArray):
+        expected_type = list
+    else:
+        expected_type = dict
+    if (not metadata.as_container or
+            not issubclass(metadata.wrapped_type, expected_type)):
+        document.close()
+        raise TypeError()
+
+    proxy = proxy_class.__new__(proxy_class)
+    proxy.__jsonable__ = document
+    return proxy
+
+
+def __index_ndjson(buf, cache_size, loads):
+    starts = array(__offset_typecode)
+    ends = array(__offset_typecode)
+    if buf is not None:
+        for m in __ndjson_line.finditer(buf):
+            starts.append(m.start())
+            ends.append(m.end())
+    return MappedArray(buf, starts, ends, cache_size, loads)
+
+
+def __index_json(buf, cache_size, loads):
+    if buf is None:
+        raise ValueError('empty document')
+
+    pos = skip_ws(buf, 0)
+    kind = value_kind(buf, pos)
+
+    starts = array(__offset_typecode)
+    ends = array(__offset_typecode)
+    if kind is list:
+        for start, end in iter_array(buf, pos):
+            starts.append(start)
+            ends.append(end)
+        return MappedArray(buf, starts, ends, cache_size, loads)
+    elif kind is dict:
+        keys = []
+        for key_start, key_end, start, end in iter_object(buf, pos):
+            keys.append(json.loads(buf[key_start:key_end].decode('utf-8')))
+            starts.append(start)
+            ends.append(end)
+        return MappedObject(buf, keys, starts, ends, cache_size, loads)
+    else:
+        raise TypeError()
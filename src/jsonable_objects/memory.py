@@ -0,0 +1,198 @@
+# -*- coding: utf-8 -*-
+#
+#   jsonable-objects: JSON-able objects
+#   Copyright (C) 2015-2017 mete0r <mete0r@sarangbang.or.kr>
+#
+#   This program is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU Affero General Public License as published by
+#   the Free Software Foundation, either version 3 of the License, or
+#   (at your option) any later version.
+#
+#   This program is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#   GNU Affero General Public License for more details.
+#
+#   You should have received a copy of the GNU Affero General Public License
+#   along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+'''
+Memory footprint accounting of proxy trees.
+'''
+from __future__ import absolute_import
+from __future__ import print_function
+from __future__ import unicode_literals
+from collections import namedtuple
+import sys
+
+from .table import RowRef
+
+
+class MemoryReport(namedtuple('MemoryReport', [
+    'total',
+    'by_class',
+    'by_field',
+    'key_bytes',
+    'duplicate_key_bytes',
+    'number_bytes',
+])):
+    '''
+    Bytes of a proxied document. Objects shared in it are counted once.
+
+    :ivar total:
+        bytes of all the objects of the document.
+    :ivar by_class:
+        ``{proxy_class: bytes}`` of the proxied containers and their members,
+        excluding the nested proxied subtrees.
+    :ivar by_field:
+        ``{(proxy_class, field_name): bytes}`` of the fields, including their
+        keys and whole values. The undeclared members are under ``None``.
+    :ivar key_bytes:
+        bytes of the key strings.
+    :ivar duplicate_key_bytes:
+        bytes of the key strings equal to another key object, which interning
+        would save.
+    :ivar number_bytes:
+        bytes of the ``int`` and ``float`` objects.
+    '''
+
+    __slots__ = ()
+
+
+class __Accounting(object):
+
+    __slots__ = (
+        'seen',
+        'keys',
+        'by_class',
+        'by_field',
+        'key_bytes',
+        'duplicate_key_bytes',
+        'number_bytes',
+    )
+
+    def __init__(self):
+        self.seen = set()
+        self.keys = set()
+        self.by_class = {}
+        self.by_field = {}
+        self.key_bytes = 0
+        self.duplicate_key_bytes = 0
+        self.number_bytes = 0
+
+
+def sizeof(obj):
+    ''' Bytes of the document of a proxy. '''
+    return memory_report(type(obj), obj).total
+
+
+def memory_report(proxy_class, obj):
+    '''
+    Walk the document of a proxy with the schema of ``proxy_class``, and
+    report its bytes by field and by proxy class.
+    '''
+    if isinstance(obj.__jsonable__, RowRef):
+        # 행 뷰는 열들을 나눠 쓰므로 행 하나의 바이트 수가 없다.
+        raise TypeError('row views of a RecordTable have no bytes of their '
+                        'own')
+    accounting = __Accounting()
+    total = __account_proxied(proxy_class, obj.__jsonable__, accounting)
+    return MemoryReport(
+        total=total,
+        by_class=accounting.by_class,
+        by_field=accounting.by_field,
+        key_bytes=accounting.key_bytes,
+        duplicate_key_bytes=accounting.duplicate_key_bytes,
+        number_bytes=accounting.number_bytes,
+    )
+
+
+def __account_proxied(proxy_class, jsonable, accounting):
+    if id(jsonable) in accounting.seen:
+        return 0
+    accounting.seen.add(id(jsonable))
+
+    metadata = proxy_class.__jsonable_proxy__
+    total = sys.getsizeof(jsonable)
+    nested_total = 0
+    if isinstance(jsonable, dict):
+        members = jsonable.items()
+    else:
+        members = enumerate(jsonable)
+
+    fields = __compiled(metadata)
+    is_dict = isinstance(jsonable, dict)
+    for key, value in members:
+        size = __account_key(key, accounting) if is_dict else 0
+        if metadata.as_container:
+            nested = metadata.itemProxy
+            field = None
+        else:
+            field = fields.get(key)
+            nested = field.proxy_class if field is not None else None
+
+        if nested is not None and isinstance(
+            value, nested.__jsonable_proxy__.wrapped_type,
+        ):
+            value_size = __account_proxied(nested, value, accounting)
+            nested_total += value_size
+        else:
+            value_size = __account_value(value, accounting)
+        size += value_size
+        total += size
+
+        if not metadata.as_container:
+            field_key = (proxy_class, field.name if field else None)
+            by_field = accounting.by_field
+            by_field[field_key] = by_field.get(field_key, 0) + size
+
+    by_class = accounting.by_class
+    by_class[proxy_class] = (
+        by_class.get(proxy_class, 0) + total - nested_total
+    )
+    return total
+
+
+def __account_key(key, accounting):
+    if id(key) in accounting.seen:
+        return 0
+    accounting.seen.add(id(key))
+    size = sys.getsizeof(key)
+    accounting.key_bytes += size
+    if key in accounting.keys:
+        accounting.duplicate_key_bytes += size
+    else:
+        accounting.keys.add(key)
+    return size
+
+
+def __account_value(value, accounting):
+    if id(value) in accounting.seen:
+        return 0
+    accounting.seen.add(id(value))
+    size = sys.getsizeof(value)
+    if isinstance(value, dict):
+        for key, item in value.items():
+            size += __account_key(key, accounting)
+            size += __account_value(item, accounting)
+    elif isinstance(value, list):
+        for item in value:
+            size += __account_value(item, accounting)
+    elif isinstance(value, (int, float)) and not isinstance(value, bool):
+        accounting.number_bytes += size
+    return size
+
+
+def __compiled(metadata):
+    try:
+        return metadata.compiled['memory']
+    except KeyError:
+        pass
+    if issubclass(metadata.wrapped_type, dict):
+        fields = dict((field.key, field) for field in metadata.field_list)
+    else:
+        fields = dict(
+            (field.local_index, field) for field in metadata.field_list
+        )
+    metadata.compiled['memory'] = fields
+    return fields
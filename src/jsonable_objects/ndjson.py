@@ -0,0 +1,184 @@
+# -*- coding: utf-8 -*-
+#
+#   jsonable-objects: JSON-able objects
+#   Copyright (C) 2015-2017 mete0r <mete0r@sarangbang.or.kr>
+#
+#   This program is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU Affero General Public License as published by
+#   the Free Software Foundation, either version 3 of the License, or
+#   (at your option) any later version.
+#
+#   This program is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#   GNU Affero General Public License for more details.
+#
+#   You should have received a copy of the GNU Affero General Public License
+#   along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+from __future__ import absolute_import
+from __future__ import print_function
+from __future__ import unicode_literals
+from collections import deque
+from collections import namedtuple
+import io
+import json
+import multiprocessing
+import os
+
+
+LineError = namedtuple('LineError', [
+    'offset',
+    'line',
+    'error',
+])
+
+
+def decode_line(proxy_class, line, loads=json.loads):
+    '''
+    Decode a NDJSON line and wrap it with a proxy class.
+
+    :param proxy_class:
+        proxy class to validate the decoded value.
+    :param line:
+        a line, without blanks around.
+    :param loads:
+        JSON decoding callable.
+    '''
+    if isinstance(line, bytes):
+        line = line.decode('utf-8')
+    return proxy_class(loads(line))
+
+
+def iter_ndjson(proxy_class, fp, loads=json.loads):
+    '''
+    Iterate proxies over a NDJSON file-like object.
+
+    Blank lines are skipped.
+    '''
+    for line in fp:
+        line = line.strip()
+        if not line:
+            continue
+        yield decode_line(proxy_class, line, loads)
+
+
+def shard_ranges(path, shard_size):
+    '''
+    Split a NDJSON file into byte ranges aligned on line boundaries.
+
+    :param shard_size:
+        approximate size of each shard in bytes.
+    :returns:
+        list of ``(start, end)`` byte offsets.
+    '''
+    if shard_size < 1:
+        raise ValueError(shard_size)
+
+    size = os.path.getsize(path)
+    boundaries = [0]
+    with io.open(path, 'rb') as fp:
+        pos = shard_size
+        while pos < size:
+            # pos 가 줄의 시작이 아니면 그 줄의 끝까지 건너뛴다.
+            fp.seek(pos - 1)
+            fp.readline()
+            pos = fp.tell()
+            if pos >= size:
+                break
+            boundaries.append(pos)
+            pos += shard_size
+    boundaries.append(size)
+    return list(zip(boundaries[:-1], boundaries[1:]))
+
+
+def ingest_ndjson(proxy_class, path, processes=None, shard_size=1 << 26,
+                  ordered=True, errors='raise', loads=json.loads):
+    '''
+    Decode and validate a large NDJSON file in worker processes.
+
+    The file is split into shards with :func:`shard_ranges`, and each shard
+    is decoded and wrapped with ``proxy_class`` in a worker process. The
+    proxy class and ``loads`` should be picklable, i.e. defined at the module
+    level. At most twice as many shards as the worker processes are
+    dispatched ahead of the consumer, so that the decoded items do not pile
+    up when they are consumed slower than decoded.
+
+    :param processes:
+        number of worker processes. ``None`` for the CPU count.
+    :param ordered:
+        if true, results are yielded in the file order. Otherwise, shards
+        are yielded as soon as they are done.
+    :param errors:
+        ``'raise'`` to raise the first error of a shard after yielding
+        its preceding items; ``'report'`` to yield :class:`LineError` in
+        place of the invalid lines.
+    '''
+    if errors not in ('raise', 'report'):
+        raise ValueError(errors)
+
+    if processes is None:
+        processes = multiprocessing.cpu_count()
+    tasks = iter([
+        (proxy_class, path, start, end, errors, loads)
+        for start, end in shard_ranges(path, shard_size)
+    ])
+
+    pool = multiprocessing.Pool(processes)
+    try:
+        pending = deque()
+        for task in tasks:
+            pending.append(pool.apply_async(__ingest_shard, (task,)))
+            if len(pending) == 2 * processes:
+                break
+        while pending:
+            items, error = __next_shard(pending, ordered).get()
+            # 샤드 하나를 꺼낼 때마다 다음 샤드를 하나 보낸다.
+            for task in tasks:
+                pending.append(pool.apply_async(__ingest_shard, (task,)))
+                break
+            for item in items:
+                yield item
+            if error is not None:
+                raise error.error
+    finally:
+        pool.terminate()
+        pool.join()
+
+
+def __next_shard(pending, ordered):
+    if ordered:
+        return pending.popleft()
+    while True:
+        for result in pending:
+            if result.ready():
+                pending.remove(result)
+                return result
+        pending[0].wait(0.01)
+
+
+def __ingest_shard(task):
+    proxy_class, path, start, end, errors, loads = task
+
+    items = []
+    with io.open(path, 'rb') as fp:
+        fp.seek(start)
+        offset = start
+        while offset < end:
+            line = fp.readline()
+            if not line:
+                break
+            line_offset = offset
+            offset += len(line)
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                item = decode_line(proxy_class, line, loads)
+            except Exception as e:
+                error = LineError(line_offset, line, e)
+                if errors == 'raise':
+                    return items, error
+                item = error
+            items.append(item)
+    return items, None
@@ -0,0 +1,415 @@
+# -*- coding: utf-8 -*-
+#
+#   jsonable-objects: JSON-able objects
+#   Copyright (C) 2015-2017 mete0r <mete0r@sarangbang.or.kr>
+#
+#   This program is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU Affero General Public License as published by
+#   the Free Software Foundation, either version 3 of the License, or
+#   (at your option) any later version.
+#
+#   This program is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#   GNU Affero General Public License for more details.
+#
+#   You should have received a copy of the GNU Affero General Public License
+#   along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+'''
+Copy-on-write overlays over shared, read-only JSON-able documents.
+
+:func:`overlay` wraps a base document so that the writes through it, and
+through the proxies wrapping it, never touch the base::
+
+    config = Config(overlay(shared_config))
+    config.limits.timeout = 10      # shared_config is not modified
+
+Reading an overlay copies nothing: nested containers are read through views
+of the base. The first write to a container copies it, and the containers on
+its path, shallowly; untouched subtrees stay shared with the base. The base
+should not be modified while its overlays are in use.
+'''
+from __future__ import absolute_import
+from __future__ import print_function
+from __future__ import unicode_literals
+
+
+def overlay(base, parent=None, key=None):
+    '''
+    Wrap a base ``dict`` / ``list`` with a copy-on-write overlay.
+
+    Other values are returned as is.
+
+    :param parent:
+        overlay of the container in which ``base`` is, at ``key``: the first
+        write to the returned overlay puts its copy there.
+    '''
+    if isinstance(base, dict):
+        return OverlayDict(base, parent, key)
+    if isinstance(base, list):
+        return OverlayList(base, parent, key)
+    return base
+
+
+class OverlayDict(dict):
+    '''
+    View of a base ``dict``, copied on the first write.
+    '''
+
+    __slots__ = (
+        'base',
+        'parent',
+        'key',
+        'materialized',
+        'views',
+    )
+
+    # 복사되기 전에는 자신의 항목이 없다. 빈 dict 로 여기고 '{}' 로
+    # 인코딩하는 json 등을 위해 표식 하나만 넣어둔다.
+    __marker = object()
+
+    def __init__(self, base, parent=None, key=None):
+        self.base = base
+        self.parent = parent
+        self.key = key
+        self.materialized = False
+        self.views = {}
+        if base:
+            dict.__setitem__(self, self.__marker, None)
+
+    def materialize(self):
+        ''' Copy the base shallowly, and put the copy in the parent. '''
+        if self.materialized:
+            return
+        if self.parent is not None:
+            self.parent.adopt(self.key, self)
+            self.parent = None
+        dict.clear(self)
+        dict.update(self, self.base)
+        self.materialized = True
+
+    def adopt(self, key, child):
+        self.materialize()
+        dict.__setitem__(self, key, child)
+
+    def resolve(self):
+        ''' Plain ``dict`` of the items, shallowly. '''
+        if self.materialized:
+            return dict(dict.items(self))
+        return self.base
+
+    def __wrap(self, key, value):
+        if not isinstance(value, (dict, list)):
+            return value
+        if self.materialized and self.base.get(key) is not value:
+            # 덮어쓴 값, 혹은 이미 복사된 하위 overlay
+            return value
+        view = self.views.get(key)
+        if view is None or view.base is not value:
+            view = self.views[key] = overlay(value, self, key)
+        return view
+
+    def __detach(self, key):
+        view = self.views.pop(key, None)
+        if view is not None:
+            view.parent = None
+
+    def __getitem__(self, key):
+        if self.materialized:
+            value = dict.__getitem__(self, key)
+        else:
+            value = self.base[key]
+        return self.__wrap(key, value)
+
+    def __contains__(self, key):
+        if self.materialized:
+            return dict.__contains__(self, key)
+        return key in self.base
+
+    def __len__(self):
+        if self.materialized:
+            return dict.__len__(self)
+        return len(self.base)
+
+    def __iter__(self):
+        if self.materialized:
+            return dict.__iter__(self)
+        return iter(self.base)
+
+    def keys(self):
+        return list(self)
+
+    def get(self, key, default=None):
+        if key in self:
+            return self[key]
+        return default
+
+    def items(self):
+        return [(key, self[key]) for key in self]
+
+    def values(self):
+        return [self[key] for key in self]
+
+    def copy(self):
+        return dict(self.items())
+
+    def __eq__(self, other):
+        return self.resolve() == other
+
+    def __ne__(self, other):
+        return not self == other
+
+    __hash__ = None
+
+    def __repr__(self):
+        return '{}({!r})'.format(type(self).__name__, self.resolve())
+
+    def __reduce_ex__(self, protocol):
+        return dict, (self.resolve(), )
+
+    def __setitem__(self, key, value):
+        self.materialize()
+        self.__detach(key)
+        dict.__setitem__(self, key, value)
+
+    def __delitem__(self, key):
+        self.materialize()
+        self.__detach(key)
+        dict.__delitem__(self, key)
+
+    def pop(self, key, *default):
+        if key in self:
+            value = self[key]
+            del self[key]
+            return value
+        if default:
+            return default[0]
+        raise KeyError(key)
+
+    def popitem(self):
+        key = next(reversed(list(self)), None)
+        if key is None:
+            raise KeyError('popitem(): dictionary is empty')
+        return key, self.pop(key)
+
+    def setdefault(self, key, default=None):
+        if key in self:
+            return self[key]
+        self[key] = default
+        return default
+
+    def update(self, *args, **kwargs):
+        for key, value in dict(*args, **kwargs).items():
+            self[key] = value
+
+    def clear(self):
+        self.materialize()
+        for key in list(self.views):
+            self.__detach(key)
+        dict.clear(self)
+
+
+class OverlayList(list):
+    '''
+    View of a base ``list``, copied on the first write.
+    '''
+
+    __slots__ = (
+        'base',
+        'parent',
+        'key',
+        'materialized',
+        'views',
+        'shared',
+    )
+
+    def __init__(self, base, parent=None, key=None):
+        self.base = base
+        self.parent = parent
+        self.key = key
+        self.materialized = False
+        self.views = {}
+        self.shared = None
+
+    def materialize(self):
+        ''' Copy the base shallowly, and put the copy in the parent. '''
+        if self.materialized:
+            return
+        if self.parent is not None:
+            self.parent.adopt(self.key, self)
+            self.parent = None
+        list.__init__(self, self.base)
+        self.shared = set(
+            id(item) for item in self.base if isinstance(item, (dict, list))
+        )
+        self.materialized = True
+
+    def adopt(self, index, child):
+        self.materialize()
+        list.__setitem__(self, index, child)
+
+    def resolve(self):
+        ''' Plain ``list`` of the items, shallowly. '''
+        if self.materialized:
+            return list(list.__iter__(self))
+        return self.base
+
+    def __wrap(self, index, item):
+        if not isinstance(item, (dict, list)):
+            return item
+        if self.materialized and id(item) not in self.shared:
+            return item
+        view = self.views.get(index)
+        if view is None or view.base is not item:
+            view = self.views[index] = overlay(item, self, index)
+        return view
+
+    def __reindex(self, index_of):
+        # 항목들이 옮겨지면 아직 복사되지 않은 view 들의 색인도 옮긴다.
+        views = {}
+        for index, view in self.views.items():
+            index = index_of(index)
+            if index is None:
+                view.parent = None
+            else:
+                view.key = index
+                views[index] = view
+        self.views = views
+
+    def __settle(self):
+        # 옮겨질 곳을 알 수 없으면 view 들을 먼저 복사해둔다.
+        views, self.views = self.views, {}
+        for view in views.values():
+            view.materialize()
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [
+                self[i] for i in range(*index.indices(len(self)))
+            ]
+        if index < 0:
+            index += len(self)
+        if self.materialized:
+            item = list.__getitem__(self, index)
+        else:
+            item = self.base[index]
+        return self.__wrap(index, item)
+
+    def __len__(self):
+        if self.materialized:
+            return list.__len__(self)
+        return len(self.base)
+
+    def __iter__(self):
+        for index in range(len(self)):
+            yield self[index]
+
+    def __reversed__(self):
+        for index in reversed(range(len(self))):
+            yield self[index]
+
+    def __contains__(self, item):
+        return item in self.resolve()
+
+    def index(self, item, *args):
+        return self.resolve().index(item, *args)
+
+    def count(self, item):
+        return self.resolve().count(item)
+
+    def copy(self):
+        return list(self)
+
+    def __eq__(self, other):
+        return self.resolve() == other
+
+    def __ne__(self, other):
+        return not self == other
+
+    __hash__ = None
+
+    def __repr__(self):
+        return '{}({!r})'.format(type(self).__name__, self.resolve())
+
+    def __reduce_ex__(self, protocol):
+        return list, (self.resolve(), )
+
+    def __setitem__(self, index, value):
+        self.materialize()
+        if isinstance(index, slice):
+            self.__settle()
+        else:
+            if index < 0:
+                index += len(self)
+            view = self.views.pop(index, None)
+            if view is not None:
+                view.parent = None
+        list.__setitem__(self, index, value)
+
+    def __delitem__(self, index):
+        self.materialize()
+        if isinstance(index, slice):
+            self.__settle()
+        else:
+            if index < 0:
+                index += len(self)
+            self.__reindex(lambda i: (
+                i if i < index else None if i == index else i - 1
+            ))
+        list.__delitem__(self, index)
+
+    def append(self, item):
+        self.materialize()
+        list.append(self, item)
+
+    def extend(self, items):
+        self.materialize()
+        list.extend(self, items)
+
+    def __iadd__(self, items):
+        self.extend(items)
+        return self
+
+    def __imul__(self, n):
+        self.materialize()
+        if n <= 0:
+            self.clear()
+        else:
+            list.__imul__(self, n)
+        return self
+
+    def insert(self, index, item):
+        self.materialize()
+        length = len(self)
+        if index < 0:
+            index = max(0, index + length)
+        index = min(index, length)
+        self.__reindex(lambda i: i if i < index else i + 1)
+        list.insert(self, index, item)
+
+    def pop(self, index=-1):
+        if index < 0:
+            index += len(self)
+        item = self[index]
+        del self[index]
+        return item
+
+    def remove(self, item):
+        del self[self.index(item)]
+
+    def reverse(self):
+        self.materialize()
+        last = len(self) - 1
+        self.__reindex(lambda i: last - i)
+        list.reverse(self)
+
+    def sort(self, *args, **kwargs):
+        self.materialize()
+        self.__settle()
+        list.sort(self, *args, **kwargs)
+
+    def clear(self):
+        self.materialize()
+        self.__reindex(lambda i: None)
+        del self[:]
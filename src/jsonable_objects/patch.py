@@ -0,0 +1,177 @@
+# -*- coding: utf-8 -*-
+#
+#   jsonable-objects: JSON-able objects
+#   Copyright (C) 2015-2017 mete0r <mete0r@sarangbang.or.kr>
+#
+#   This program is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU Affero General Public License as published by
+#   the Free Software Foundation, either version 3 of the License, or
+#   (at your option) any later version.
+#
+#   This program is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#   GNU Affero General Public License for more details.
+#
+#   You should have received a copy of the GNU Affero General Public License
+#   along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+'''
+RFC 7396 JSON Merge Patch with validation scoped to the touched fields.
+'''
+from __future__ import absolute_import
+from __future__ import print_function
+from __future__ import unicode_literals
+
+from .proxy import check_item_batch
+from .tracking import MISSING
+from .tracking import SetChange
+from .tracking import SpliceChange
+from .tracking import document_of
+
+
+def merge_patch(obj, patch):
+    '''
+    Apply a JSON Merge Patch to the ``__jsonable__`` of a proxy in place.
+
+    Only the touched fields are checked: their downward type / predicate
+    checks, and the validation of the nested proxies. A nested object in the
+    patch is merged into the existing nested proxy, checking only what it
+    touches in turn. Arrays are replaced as a whole, as RFC 7396 specifies.
+
+    If a check fails, the applied changes are undone and the error is
+    raised. The changes are recorded if ``obj`` is tracked. Frozen proxies
+    raise ``TypeError``.
+    '''
+    proxy_class = type(obj)
+    if proxy_class.__jsonable_proxy__.frozen:
+        raise TypeError()
+    jsonable = obj.__jsonable__
+    applied = []
+    try:
+        __merge(proxy_class, jsonable, patch, (), applied)
+    except Exception:
+        for path, container, key, old in reversed(applied):
+            if key is None:
+                container[:] = old
+            elif old is MISSING:
+                del container[key]
+            else:
+                container[key] = old
+        raise
+
+    if proxy_class.__jsonable_proxy__.tracked:
+        tracker, base_path = document_of(obj)
+        for path, container, key, old in applied:
+            if key is None:
+                tracker.record(SpliceChange(
+                    base_path + path, 0, old, len(container),
+                ))
+            else:
+                tracker.record(SetChange(base_path + path, old))
+    return obj
+
+
+def merged(target, patch):
+    '''
+    RFC 7396 ``MergePatch(target, patch)``, without modifying ``target``.
+    '''
+    if not isinstance(patch, dict):
+        return patch
+    if isinstance(target, dict):
+        result = dict(target)
+    else:
+        result = {}
+    for key, value in patch.items():
+        if value is None:
+            result.pop(key, None)
+        else:
+            result[key] = merged(result.get(key), value)
+    return result
+
+
+def __merge(proxy_class, jsonable, patch, path, applied):
+    metadata = proxy_class.__jsonable_proxy__
+
+    if issubclass(metadata.wrapped_type, list):
+        # 배열은 통째로 바꾼다.
+        if not isinstance(patch, list):
+            raise TypeError()
+        metadata.validate(patch)
+        applied.append((path, jsonable, None, list(jsonable)))
+        jsonable[:] = patch
+        return
+
+    if not isinstance(patch, dict):
+        raise TypeError()
+
+    fields_by_key = __compiled(metadata)
+    for key, value in patch.items():
+        old = jsonable.get(key, MISSING)
+        if metadata.as_container:
+            __merge_item(metadata, jsonable, key, old, value, path, applied)
+        else:
+            field = fields_by_key.get(key)
+            __merge_field(field, jsonable, key, old, value, path, applied)
+
+
+def __merge_field(field, jsonable, key, old, value, path, applied):
+    nested = field.proxy_class if field is not None else None
+    if (value is not None and
+            nested is not None and
+            isinstance(value, dict) and
+            isinstance(old, dict) and
+            issubclass(nested.__jsonable_proxy__.wrapped_type, dict)):
+        # 기존의 하위 proxy 에 병합하고, 이 필드 자체의 검사만 다시 한다.
+        __merge(nested, old, value, path + (key,), applied)
+        field.dops.get(jsonable)
+        return
+
+    __assign(jsonable, key, old, value, path, applied)
+    if field is not None:
+        field.uops.get(jsonable)
+
+
+def __merge_item(metadata, jsonable, key, old, value, path, applied):
+    if metadata.keyFormat is not None:
+        metadata.keyFormat.parse(key)
+
+    itemProxy = metadata.itemProxy
+    if (value is not None and
+            itemProxy is not None and
+            isinstance(value, dict) and
+            isinstance(old, dict) and
+            issubclass(itemProxy.__jsonable_proxy__.wrapped_type, dict)):
+        __merge(itemProxy, old, value, path + (key,), applied)
+        return
+
+    __assign(jsonable, key, old, value, path, applied)
+    if value is None:
+        return
+    value = jsonable[key]
+    if itemProxy is not None:
+        itemProxy.__jsonable_proxy__.validate(value)
+    if metadata.itemFormat is not None:
+        metadata.itemFormat.parse(value)
+    if metadata.itemBatchPredicate is not None:
+        check_item_batch(metadata.itemBatchPredicate, [value])
+
+
+def __assign(jsonable, key, old, value, path, applied):
+    if value is None:
+        if old is MISSING:
+            return
+        del jsonable[key]
+    else:
+        jsonable[key] = merged(old, value)
+    applied.append((path + (key,), jsonable, key, old))
+
+
+def __compiled(metadata):
+    try:
+        return metadata.compiled['merge_patch']
+    except KeyError:
+        pass
+    fields_by_key = dict((field.key, field) for field in metadata.field_list)
+    metadata.compiled['merge_patch'] = fields_by_key
+    return fields_by_key
@@ -0,0 +1,165 @@
+# -*- coding: utf-8 -*-
+#
+#   jsonable-objects: JSON-able objects
+#   Copyright (C) 2015-2017 mete0r <mete0r@sarangbang.or.kr>
+#
+#   This program is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU Affero General Public License as published by
+#   the Free Software Foundation, either version 3 of the License, or
+#   (at your option) any later version.
+#
+#   This program is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#   GNU Affero General Public License for more details.
+#
+#   You should have received a copy of the GNU Affero General Public License
+#   along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+from __future__ import absolute_import
+from __future__ import print_function
+from __future__ import unicode_literals
+from operator import itemgetter
+
+
+def to_positional(proxy_class, obj):
+    '''
+    Convert a dict-layout record into the list layout.
+
+    The fields are placed by their ``local_index``. The values of the
+    fields of dict-layout proxy classes are converted recursively into rows
+    as well, so the result is only what a ``@proxy(list)`` class with the
+    same fields would accept when there are no such fields; use
+    :func:`from_positional` to read it back. Missing optional fields become
+    ``None``.
+
+    :param obj:
+        an instance of ``proxy_class`` or its ``__jsonable__``. It is not
+        validated.
+    '''
+    if isinstance(obj, proxy_class):
+        obj = obj.__jsonable__
+    encode = __compiled(proxy_class.__jsonable_proxy__)[0]
+    return encode(obj)
+
+
+def from_positional(proxy_class, row):
+    '''
+    Convert a list-layout record into the dict layout and wrap it.
+
+    This is the reverse of :func:`to_positional`. Optional fields of
+    ``None`` are omitted from the result. A row, or a nested row, which is
+    not a list raises ``TypeError``, and one with another number of items
+    than the fields raises ``ValueError``.
+
+    :returns:
+        a validated instance of ``proxy_class``.
+    '''
+    decode = __compiled(proxy_class.__jsonable_proxy__)[1]
+    return proxy_class(decode(row))
+
+
+def __is_positionable(metadata):
+    if metadata.as_container:
+        return False
+    return issubclass(metadata.wrapped_type, dict)
+
+
+def __compiled(metadata):
+    try:
+        return metadata.compiled['positional']
+    except KeyError:
+        pass
+
+    if not __is_positionable(metadata):
+        raise TypeError()
+
+    compiled = (
+        __compile_encode(metadata.field_list),
+        __compile_decode(metadata.field_list),
+    )
+    metadata.compiled['positional'] = compiled
+    return compiled
+
+
+def __nested_positional(field):
+    if field.proxy_class is None:
+        return None
+    metadata = field.proxy_class.__jsonable_proxy__
+    if not __is_positionable(metadata):
+        return None
+    return __compiled(metadata)
+
+
+def __compile_encode(field_list):
+    nested_list = [__nested_positional(field) for field in field_list]
+
+    if all(nested is None for nested in nested_list):
+        if all(not field.optional for field in field_list):
+            # 가장 흔한 경우: itemgetter 한 번으로 끝낸다.
+            keys = [field.key for field in field_list]
+            if len(keys) == 0:
+                return lambda jsonable: []
+            if len(keys) == 1:
+                key = keys[0]
+                return lambda jsonable: [jsonable[key]]
+            getter = itemgetter(*keys)
+            return lambda jsonable: list(getter(jsonable))
+
+    getters = [
+        __make_encode_getter(field, nested)
+        for field, nested in zip(field_list, nested_list)
+    ]
+
+    def encode(jsonable):
+        return [getter(jsonable) for getter in getters]
+    return encode
+
+
+def __make_encode_getter(field, nested):
+    key = field.key
+    if nested is None:
+        if field.optional:
+            return lambda jsonable: jsonable.get(key)
+        return itemgetter(key)
+
+    nested_encode = nested[0]
+    if field.optional:
+        def getter(jsonable):
+            value = jsonable.get(key)
+            if value is None:
+                return None
+            return nested_encode(value)
+    else:
+        def getter(jsonable):
+            return nested_encode(jsonable[key])
+    return getter
+
+
+def __compile_decode(field_list):
+    steps = [
+        (field.local_index, field.key, field.optional, nested and nested[1])
+        for field, nested in (
+            (field, __nested_positional(field)) for field in field_list
+        )
+    ]
+
+    length = len(steps)
+
+    def decode(row):
+        if not isinstance(row, list):
+            raise TypeError()
+        # 짧은 행이 IndexError 로 새지 않도록 먼저 길이를 본다.
+        if len(row) != length:
+            raise ValueError(row)
+        jsonable = {}
+        for index, key, optional, nested_decode in steps:
+            value = row[index]
+            if value is None:
+                if optional:
+                    continue
+            elif nested_decode is not None:
+                value = nested_decode(value)
+            jsonable[key] = value
+        return jsonable
+    return decode
@@ -21,10 +21,9 @@ from __future__ import print_function
 from __future__ import unicode_literals
 from collections import namedtuple
 import json
-
-from zope.interface import implementer
-
-from .interfaces import IJsonable
+import os
+import sys
+import weakref
 
 
 Field = namedtuple('Field', [
@@ -37,6 +36,7 @@ Field = namedtuple('Field', [
     'predicate',
     'proxy_class',
     'format',
+    'intern',
     'dops',
     'uops',
     'descriptors',
@@ -46,9 +46,13 @@ Field = namedtuple('Field', [
 __field_class = Field
 __field_serial_number = 0       # 전역적 필드 정의 순서
 
+# 만들어진 proxy 클래스들과, 새 클래스가 만들어질 때 불리는 함수들
+proxy_classes = weakref.WeakSet()
+class_hooks = []
+
 
 def Field(key=None, optional=False, type=None, predicate=None, proxy=None,
-          format=None):
+          format=None, intern=False):
     '''
     Define a field.
 
@@ -56,6 +60,9 @@ def Field(key=None, optional=False, type=None, predicate=None, proxy=None,
         int, float, str or dict [TODO: list]
     :param predicate:
         validating callable
+    :param intern:
+        intern the string values when loaded with :mod:`.interning`, e.g. for
+        enums or status codes
     '''
     global __field_serial_number
     __field_serial_number += 1
@@ -67,6 +74,9 @@ def Field(key=None, optional=False, type=None, predicate=None, proxy=None,
           type is not proxy.__jsonable_proxy__.wrapped_type):
         raise TypeError()
 
+    if intern and type not in (None, str):
+        raise TypeError()
+
     return __field_class(
         name=None,
         serial_number=__field_serial_number,
@@ -77,6 +87,7 @@ def Field(key=None, optional=False, type=None, predicate=None, proxy=None,
         predicate=predicate,
         proxy_class=proxy,
         format=format,
+        intern=intern,
         dops=None,
         uops=None,
         descriptors=None,
@@ -122,23 +133,57 @@ class ProxyClassMetadata(object):
 
     __slots__ = (
         'wrapped_type',
-        'field_list',
+        'field_specs',
+        '__field_list',
         'as_container',
         'keyFormat',
         'itemProxy',
         'itemFormat',
+        'itemBatchPredicate',
         'methods',
+        'tracked',
+        'frozen',
+        'compiled',
+        'field_factory',
     )
 
     def __init__(self, wrapped_type, field_list, as_container, keyFormat,
-                 itemProxy, itemFormat, methods):
+                 itemProxy, itemFormat, methods, tracked=False,
+                 frozen=False, itemBatchPredicate=None):
         self.wrapped_type = wrapped_type
-        self.field_list = tuple(field_list)
+        # 필드들은 처음 쓰일 때 컴파일한다.
+        self.field_specs = tuple(field_list)
+        self.__field_list = None
         self.as_container = as_container
         self.keyFormat = keyFormat
         self.itemProxy = itemProxy
         self.itemFormat = itemFormat
+        self.itemBatchPredicate = itemBatchPredicate
         self.methods = methods
+        self.tracked = tracked
+        self.frozen = frozen
+        # 필요할 때 컴파일되는 부가 기능들 (positional 등)
+        self.compiled = {}
+        # 미리 컴파일된 모듈(.compile)이 있으면 그 필드들을 쓴다.
+        self.field_factory = None
+
+    @property
+    def field_list(self):
+        field_list = self.__field_list
+        if field_list is None:
+            if self.field_factory is not None:
+                field_list = tuple(self.field_factory(self))
+            else:
+                field_list = tuple(
+                    with_descriptors(self, field)
+                    for field in self.field_specs
+                )
+            self.__field_list = field_list
+        return field_list
+
+    @field_list.setter
+    def field_list(self, field_list):
+        self.__field_list = tuple(field_list)
 
     def validate(self, __jsonable__):
         if not isinstance(__jsonable__, self.wrapped_type):
@@ -163,6 +208,9 @@ class ProxyClassMetadata(object):
                             itemProxy.__jsonable_proxy__.validate(value)
                         if itemFormat is not None:
                             itemFormat.parse(value)
+                if self.itemBatchPredicate is not None:
+                    check_item_batch(self.itemBatchPredicate,
+                                     list(__jsonable__.values()))
             else:  # issubclass(self.wrapped_type, list):
                 if itemProxy is not None or itemFormat is not None:
                     for value in __jsonable__:
@@ -170,10 +218,77 @@ class ProxyClassMetadata(object):
                             itemProxy.__jsonable_proxy__.validate(value)
                         if itemFormat is not None:
                             itemFormat.parse(value)
+                if self.itemBatchPredicate is not None:
+                    check_item_batch(self.itemBatchPredicate, __jsonable__)
 
         return __jsonable__
 
 
+def check_item_batch(predicate, values):
+    '''
+    Check the raw items of a container at once with a vectorized predicate,
+    i.e. ``proxy(..., itemBatchPredicate=predicate)``.
+
+    :param predicate:
+        callable taking a list of raw items, and returning a boolean mask:
+        a sequence, or e.g. a NumPy array, with a truth value per item.
+    :raises ValueError:
+        with the first item for which the mask is false.
+    '''
+    mask = predicate(values)
+    all_ = getattr(mask, 'all', None)
+    if all_ is not None:
+        if all_():
+            return
+    elif all(mask):
+        return
+    for value, valid in zip(values, mask):
+        if not valid:
+            raise ValueError(value)
+    raise ValueError()
+
+
+class LazyFieldDescriptor(object):
+    '''
+    Placeholder of a field descriptor, until the fields of the proxy class
+    are compiled: it then puts the compiled descriptors of all the fields in
+    the class, and delegates to its own.
+    '''
+
+    __slots__ = ('name', )
+
+    def __init__(self, name):
+        self.name = name
+
+    def resolve(self, owner):
+        for cls in owner.__mro__:
+            if cls.__dict__.get(self.name) is self:
+                install_field_descriptors(cls)
+                return cls.__dict__[self.name]
+        raise AttributeError(self.name)
+
+    def __get__(self, instance, owner=None):
+        if owner is None:
+            owner = type(instance)
+        descriptor = self.resolve(owner)
+        if instance is None:
+            return descriptor
+        return descriptor.__get__(instance, owner)
+
+    def __set__(self, instance, value):
+        self.resolve(type(instance)).__set__(instance, value)
+
+    def __delete__(self, instance):
+        self.resolve(type(instance)).__delete__(instance)
+
+
+def install_field_descriptors(cls):
+    ''' Put the compiled field descriptors in place of the lazy ones. '''
+    for field in cls.__dict__['__jsonable_proxy__'].field_list:
+        if isinstance(cls.__dict__.get(field.name), LazyFieldDescriptor):
+            setattr(cls, field.name, property(*field.descriptors))
+
+
 def __build_field_list(wrapped_type, cls):
     field_list = []
 
@@ -183,37 +298,37 @@ def __build_field_list(wrapped_type, cls):
             continue
         if base_class.__jsonable_proxy__.wrapped_type is not wrapped_type:
             raise TypeError()
-        for field in base_class.__jsonable_proxy__.field_list:
+        for field in base_class.__jsonable_proxy__.field_specs:
             field_list.append(field)
 
     for name, attr in cls.__dict__.items():
         if isinstance(attr, __field_class):
-            field = attr._replace(name=name)
-            if field.key is None:
-                # 필드에 key 가 정해지지 않으면 속성 이름을 대신 사용한다.
-                field = field._replace(key=name)
-            field_list.append(field)
+            # 필드에 key 가 정해지지 않으면 속성 이름을 대신 사용한다.
+            field_list.append(attr._replace(
+                name=name,
+                key=name if attr.key is None else attr.key,
+            ))
 
     # 全域的 定意 順으로 整列
-    field_list = sorted(field_list, key=lambda field: field.serial_number)
-    field_list = [
-        # 局部的 필드 인덱스 부여
+    field_list.sort(key=lambda field: field.serial_number)
+    # 局部的 필드 인덱스 부여
+    return [
+        f if f.local_index == local_index else
         f._replace(local_index=local_index)
         for local_index, f in enumerate(field_list)
     ]
 
-    return [
-        __field_with_descriptors(wrapped_type, f)
-        for f in field_list
-    ]
-
 
 def proxy(wrapped_type, as_container=False,
-          keyFormat=None, itemProxy=None, itemFormat=None):
+          keyFormat=None, itemProxy=None, itemFormat=None, tracked=False,
+          frozen=False, itemBatchPredicate=None):
 
     if not issubclass(wrapped_type, (dict, list)):
         raise TypeError()
 
+    if tracked and frozen:
+        raise TypeError()
+
     if issubclass(wrapped_type, list):
         if keyFormat is not None:
             raise TypeError()
@@ -224,6 +339,8 @@ def proxy(wrapped_type, as_container=False,
         as_container = True
     elif itemFormat is not None:
         as_container = True
+    elif itemBatchPredicate is not None:
+        as_container = True
 
     #
     # __init__
@@ -500,6 +617,20 @@ def proxy(wrapped_type, as_container=False,
             contains=__contains__,
         )
 
+    if itemBatchPredicate is not None:
+        methods = methods._replace(setitem=__make_batch_checked_setitem(
+            methods.setitem, itemProxy, itemFormat, itemBatchPredicate,
+        ))
+
+    if tracked:
+        from .tracking import make_tracked_methods
+        methods = make_tracked_methods(
+            methods, wrapped_type, keyFormat, itemProxy,
+        )
+    if frozen:
+        from .frozen import make_frozen_methods
+        methods = make_frozen_methods(methods)
+
     def decorator(cls):
         field_list = __build_field_list(
             wrapped_type,
@@ -513,59 +644,338 @@ def proxy(wrapped_type, as_container=False,
             itemProxy,
             itemFormat,
             methods,
+            tracked,
+            frozen,
+            itemBatchPredicate,
         )
 
-        if len(metadata.field_list) > 0 and as_container:
+        if len(metadata.field_specs) > 0 and as_container:
             raise TypeError()
 
+        if frozen:
+            from .frozen import check_nested
+            check_nested(itemProxy, metadata.field_specs)
+
+        if not tracked and not frozen:
+            compiled = compiled_schema(cls, metadata)
+            if compiled is not None:
+                metadata.field_factory = compiled.fields
+                metadata.methods = compiled.methods(metadata.methods)
+        class_methods = metadata.methods
+
         attrs = dict(cls.__dict__)
 
-        for field in metadata.field_list:
-            attrs[field.name] = property(*field.descriptors)
+        for field in metadata.field_specs:
+            attrs[field.name] = LazyFieldDescriptor(field.name)
 
         slots = ('__jsonable__', )
-        __slots__ = attrs.get('__slots__', slots)
-        if '__jsonable__' not in __slots__:
-            __slots__ = slots + __slots__
+        if tracked:
+            slots += ('__jsonable_tracker__', '__jsonable_path__')
+        if frozen:
+            slots += ('__jsonable_hash__', )
+        __slots__ = attrs.get('__slots__', ())
+        __slots__ = slots + tuple(
+            slot for slot in __slots__ if slot not in slots
+        )
         attrs['__slots__'] = __slots__
 
         if '__init__' not in attrs:
-            attrs['__init__'] = __init__
+            attrs['__init__'] = class_methods.init
         if '__eq__' not in attrs:
-            attrs['__eq__'] = __eq__
+            attrs['__eq__'] = class_methods.eq
         if '__ne__' not in attrs:
-            attrs['__ne__'] = __ne__
+            attrs['__ne__'] = class_methods.ne
         if '__repr__' not in attrs:
-            attrs['__repr__'] = __repr__
+            attrs['__repr__'] = class_methods.repr
 
         if as_container:
             if '__len__' not in attrs:
-                attrs['__len__'] = __len__
+                attrs['__len__'] = class_methods.len
             if '__iter__' not in attrs:
-                attrs['__iter__'] = __iter__
+                attrs['__iter__'] = class_methods.iter
             if '__getitem__' not in attrs:
-                attrs['__getitem__'] = __getitem__
+                attrs['__getitem__'] = class_methods.getitem
             if '__setitem__' not in attrs:
-                attrs['__setitem__'] = __setitem__
+                attrs['__setitem__'] = class_methods.setitem
             if '__delitem__' not in attrs:
-                attrs['__delitem__'] = __delitem__
+                attrs['__delitem__'] = class_methods.delitem
             if '__contains__' not in attrs:
-                attrs['__contains__'] = __contains__
+                attrs['__contains__'] = class_methods.contains
+
+        if frozen:
+            from .frozen import hash_proxy
+            # __eq__ 를 정의한 클래스에는 __hash__ = None 이 들어있다.
+            if attrs.get('__hash__') is None:
+                attrs['__hash__'] = hash_proxy
+
+        def provide(name, method):
+            # 클래스 자신이나 mixin / 부모 클래스가 정의한 것은 덮어쓰지 않는다.
+            if name not in attrs and not __defines(cls, name):
+                attrs[name] = method
+
+        if tracked:
+            from . import tracking
+            provide('mark_clean', tracking.mark_clean)
+            provide('changed_paths', tracking.changed_paths)
+            provide('json_patch', tracking.json_patch)
+            provide('transaction', tracking.transaction)
+
+        if not as_container and issubclass(wrapped_type, dict):
+            provide('to_positional', classmethod(__to_positional))
+            provide('from_positional', classmethod(__from_positional))
+
+        if as_container and issubclass(wrapped_type, list):
+            if itemProxy is not None:
+                provide('to_numpy', __to_numpy)
+        elif not as_container:
+            provide('from_numpy', classmethod(__from_numpy))
+
+        provide('diff', classmethod(__diff))
+        provide('merge_patch', __merge_patch)
+        provide('revalidate', __revalidate)
+        provide('fingerprint', __fingerprint)
+        provide('memory_report', classmethod(__memory_report))
+
+        provide('iter_ndjson', classmethod(__iter_ndjson))
+        provide('aiter_ndjson', classmethod(__aiter_ndjson))
 
         attrs['__jsonable_proxy__'] = metadata
 
         new_class = type(cls.__name__, cls.__bases__, attrs)
-        new_class = implementer(IJsonable)(new_class)
+        # IJsonable 은 .interfaces 를 불러들일 때 선언된다.
+        proxy_classes.add(new_class)
+        for hook in class_hooks:
+            hook(new_class)
         return new_class
     return decorator
 
 
-def __field_with_descriptors(wrapped_type, field):
+CompiledSchema = namedtuple('CompiledSchema', [
+    'signature',
+    'fields',
+    'methods',
+])
+
+
+# 불러들인 모듈마다 한 번씩 컴파일된 모듈을 찾는다: 모듈 이름 ->
+# (모듈, 컴파일된 모듈). Python 2 의 모듈은 약한 참조가 안 되므로 이름으로
+# 찾고, 다시 불러들인 모듈이면 새로 찾는다.
+__compiled_modules = {}
+__compiled_disabled = os.environ.get('JSONABLE_OBJECTS_COMPILED', '1') == '0'
+
+
+def compiled_module_name(module):
+    '''
+    Name of the module compiled ahead of time from the proxy classes of
+    ``module``, e.g. ``mypkg._compiled_schemas`` for ``mypkg.schemas``, or
+    ``mypkg._compiled`` for the ``__init__`` of the package ``mypkg``. It is
+    placed in the same directory as the source of ``module``.
+    '''
+    # 패키지의 __init__ 이면 그 패키지 안에 둔다.
+    if hasattr(module, '__path__'):
+        return module.__name__ + '._compiled'
+    package, _, name = module.__name__.rpartition('.')
+    name = '_compiled_' + name
+    if package:
+        return package + '.' + name
+    return name
+
+
+def compiled_schema(cls, metadata):
+    '''
+    :class:`CompiledSchema` of the proxy class being made from ``cls``, if
+    its compiled module is present and up to date; otherwise None.
+    '''
+    if __compiled_disabled:
+        return None
+    # 모듈 수준에서 정의된 클래스만 컴파일된다.
+    if getattr(cls, '__qualname__', cls.__name__) != cls.__name__:
+        return None
+    module = sys.modules.get(cls.__module__)
+    if module is None:
+        return None
+    cached = __compiled_modules.get(module.__name__)
+    if cached is not None and cached[0] is module:
+        compiled_module = cached[1]
+    else:
+        compiled_module = __import_compiled(module)
+        __compiled_modules[module.__name__] = (module, compiled_module)
+    if compiled_module is None:
+        return None
+    compiled = compiled_module.SCHEMAS.get(cls.__name__)
+    if compiled is None:
+        return None
+    compiled = CompiledSchema(*compiled)
+    if compiled.signature != schema_signature(metadata):
+        return None
+    return compiled
+
+
+def __import_compiled(module):
+    from . import __version__
+    from importlib import import_module
+    if module.__name__ == '__main__':
+        return None
+    try:
+        module = import_module(compiled_module_name(module))
+    except ImportError:
+        return None
+    # 다른 버전에서 만들어졌으면 쓰지 않는다.
+    if getattr(module, 'VERSION', None) != __version__:
+        return None
+    return module
+
+
+def schema_signature(metadata):
+    '''
+    What the compiled module of a proxy class depends on: its options and
+    the structure of its fields. It is recorded in the compiled module, which
+    is used only while the signature is unchanged.
+    '''
+    return (
+        metadata.wrapped_type.__name__,
+        metadata.as_container,
+        metadata.keyFormat is not None,
+        __name_of(metadata.itemProxy),
+        metadata.itemFormat is not None,
+        metadata.itemBatchPredicate is not None,
+        metadata.tracked,
+        metadata.frozen,
+        tuple(
+            (
+                field.name,
+                field.key,
+                field.local_index,
+                field.optional,
+                __name_of(field.type),
+                field.predicate is not None,
+                __name_of(field.proxy_class),
+                field.format is not None,
+            )
+            for field in metadata.field_specs
+        ),
+    )
+
+
+def __name_of(cls):
+    if cls is None:
+        return None
+    return cls.__name__
+
+
+def with_descriptors(metadata, field):
+    '''
+    Field with its operations and descriptors made anew for the proxy class
+    of ``metadata``, e.g. after replacing its ``format``.
+    '''
+    return __field_with_descriptors(
+        metadata.wrapped_type, field, metadata.tracked, metadata.frozen,
+    )
+
+
+def __make_batch_checked_setitem(setitem, itemProxy, itemFormat,
+                                 itemBatchPredicate):
+    if itemProxy is not None:
+        def raw_item(item):
+            if not isinstance(item, itemProxy):
+                raise TypeError()
+            return item.__jsonable__
+    elif itemFormat is not None:
+        raw_item = itemFormat.format
+    else:
+        def raw_item(item):
+            return item
+
+    def __setitem__(self, key, value):
+        if isinstance(key, slice):
+            items = [raw_item(item) for item in value]
+        else:
+            items = [raw_item(value)]
+        check_item_batch(itemBatchPredicate, items)
+        setitem(self, key, value)
+    return __setitem__
+
+
+def __to_positional(cls, obj):
+    from .positional import to_positional
+    return to_positional(cls, obj)
+
+
+def __from_positional(cls, row):
+    from .positional import from_positional
+    return from_positional(cls, row)
+
+
+def __to_numpy(self, fields=None, structured=True):
+    from .arrays import to_numpy
+    return to_numpy(self, fields, structured)
+
+
+def __from_numpy(cls, arrays):
+    from .arrays import from_numpy
+    return from_numpy(cls, arrays)
+
+
+def __diff(cls, a, b):
+    from .diff import diff
+    return diff(cls, a, b)
+
+
+def __merge_patch(self, patch):
+    from .patch import merge_patch
+    return merge_patch(self, patch)
+
+
+def __revalidate(self, paths=None, journal=None):
+    from .revalidation import revalidate
+    return revalidate(self, paths, journal)
+
+
+def __fingerprint(self, algorithm=None):
+    from .fingerprint import fingerprint
+    return fingerprint(self, algorithm)
+
+
+def __memory_report(cls, obj):
+    from .memory import memory_report
+    return memory_report(cls, obj)
+
+
+def __defines(cls, name):
+    # hasattr() 는 부모 proxy 클래스의 지연된 필드 서술자를 풀어버린다.
+    return any(name in klass.__dict__ for klass in cls.__mro__)
+
+
+def __iter_ndjson(cls, fp, **kwargs):
+    from .ndjson import iter_ndjson
+    return iter_ndjson(cls, fp, **kwargs)
+
+
+def __aiter_ndjson(cls, reader, **kwargs):
+    # asyncio 를 쓰지 않는 곳에서는 불러들이지 않는다.
+    from .aio import aiter_ndjson
+    return aiter_ndjson(cls, reader, **kwargs)
+
+
+def __field_with_descriptors(wrapped_type, field, tracked=False,
+                             frozen=False):
     dops = __make_downward_ops(wrapped_type, field)
     field = field._replace(dops=dops)
     uops = __make_upward_ops(field)
     field = field._replace(uops=uops)
-    descriptors = __make_field_descriptors(field)
+    if tracked:
+        from .tracking import make_tracked_descriptors
+        descriptors = FieldDescriptors(
+            *make_tracked_descriptors(field, wrapped_type)
+        )
+    else:
+        descriptors = __make_field_descriptors(field)
+    if frozen:
+        # 읽기만 할 수 있다: 쓰거나 지우면 컨테이너처럼 TypeError
+        from .frozen import refuse_mutation
+        descriptors = FieldDescriptors(
+            descriptors.get, refuse_mutation, refuse_mutation,
+        )
     return field._replace(descriptors=descriptors)
 
 
@@ -705,25 +1115,29 @@ def __make_value_type_coercer(type):
     return type
 
 
-def __make_value_type_checker(type):
+def settable_type(type):
+    ''' Type(s) of the values which can be set to fields of ``type``. '''
     try:
         long
     except NameError:
         pass
     else:
         if type is int:
-            type = (int, long)
-
+            return (int, long)  # noqa: F821
     try:
         unicode
     except NameError:
         pass
     else:
         if type is str:
-            type = (str, unicode)
-
+            return (str, unicode)  # noqa: F821
     if type is float:
-        type = (float, int)
+        return (float, int)
+    return type
+
+
+def __make_value_type_checker(type):
+    type = settable_type(type)
 
     def type_checker(value):
         if not isinstance(value, type):
@@ -863,7 +1277,23 @@ def __make_upward_ops(field):
     return UpwardOps(getter, setter, deleter)
 
 
-@implementer(IJsonable)
+def is_jsonable(obj):
+    '''
+    Whether ``obj`` provides ``IJsonable``, by duck typing, without importing
+    ``zope.interface``.
+    '''
+    return hasattr(obj, '__jsonable__')
+
+
+def is_format(obj):
+    '''
+    Whether ``obj`` provides ``IFormat``, by duck typing, without importing
+    ``zope.interface``.
+    '''
+    return (callable(getattr(obj, 'format', None)) and
+            callable(getattr(obj, 'parse', None)))
+
+
 class JsonableProxy(object):
 
     __slots__ = ['__jsonable__']
@@ -883,3 +1313,8 @@ class JsonableProxy(object):
     @classmethod
     def validate(cls, jsonable):
         return cls(jsonable)
+
+
+if os.environ.get('JSONABLE_OBJECTS_INSTRUMENT', '0') != '0':
+    from .instrumentation import enable
+    enable()
@@ -0,0 +1,440 @@
+# -*- coding: utf-8 -*-
+#
+#   jsonable-objects: JSON-able objects
+#   Copyright (C) 2015-2017 mete0r <mete0r@sarangbang.or.kr>
+#
+#   This program is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU Affero General Public License as published by
+#   the Free Software Foundation, either version 3 of the License, or
+#   (at your option) any later version.
+#
+#   This program is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#   GNU Affero General Public License for more details.
+#
+#   You should have received a copy of the GNU Affero General Public License
+#   along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+'''
+Raw-JSON-backed containers which decode subtrees on demand.
+
+:func:`loads` returns a :class:`RawDict` or a :class:`RawList` which keeps
+the original JSON text. The members of a :class:`RawDict` are located by a
+structural scan, only as far as the member being read, and decoded only when
+they are read; the found offsets and the decoded values are memoized. The
+values before it are skipped without being tokenized (see :mod:`.scan`).
+These containers can be wrapped with the proxy classes as usual::
+
+    foo = Foo(raw.loads(payload))   # decodes only the fields of Foo
+    forward(raw.dumps(foo))         # the payload itself, if not modified
+
+The items of a :class:`RawList` are decoded when the list itself is
+decoded, but the objects among them are again :class:`RawDict`. Of duplicate
+keys, the first one is used.
+'''
+from __future__ import absolute_import
+from __future__ import print_function
+from __future__ import unicode_literals
+import json
+
+from .scan import first_member
+from .scan import iter_array
+from .scan import next_member
+from .scan import skip_ws
+from .scan import syntax_for
+from .scan import value_kind
+
+
+class Span(object):
+    ''' Not-yet-decoded member value. '''
+
+    __slots__ = (
+        'start',
+        'end',
+    )
+
+    def __init__(self, start, end):
+        self.start = start
+        self.end = end
+
+
+def loads(raw):
+    '''
+    Wrap a JSON text without decoding it fully.
+
+    :param raw:
+        JSON text in ``str`` or UTF-8 ``bytes``.
+    :returns:
+        :class:`RawDict`, :class:`RawList` or a decoded scalar value.
+    '''
+    start = skip_ws(raw, 0)
+    kind = value_kind(raw, start)
+    if kind is None:
+        return json.loads(decode_text(raw))
+
+    # 전체를 훑지 않도록, 끝은 뒤쪽의 공백을 건너뛰어 찾는다.
+    syntax = syntax_for(raw)
+    end = len(raw)
+    while end > start and syntax.ws.match(raw, end - 1).end() == end:
+        end -= 1
+    if kind is dict:
+        closing = syntax.end_object
+    else:
+        closing = syntax.end_array
+    if raw[end - 1:end] != closing:
+        raise ValueError(end)
+    return decode_span(raw, start, end, None)
+
+
+def decode_span(raw, start, end, parent):
+    kind = value_kind(raw, start)
+    if kind is dict:
+        return RawDict(raw, start, end, parent)
+    if kind is list:
+        return RawList(raw, start, end, parent)
+    return json.loads(decode_text(raw[start:end]))
+
+
+def decode_key(data):
+    text = decode_text(data)
+    if '\\' in text:
+        return json.loads(text)
+    return text[1:-1]
+
+
+def decode_text(data):
+    if isinstance(data, bytes):
+        return data.decode('utf-8')
+    return data
+
+
+class RawContainer(object):
+    '''
+    Common states of the raw-JSON-backed containers.
+
+    ``modified`` is set when the container or any of its descendants is
+    modified, i.e. the raw text no longer represents it.
+    '''
+
+    __slots__ = ()
+
+    def touch(self):
+        container = self
+        while container is not None and not container.modified:
+            container.modified = True
+            container = container.parent
+
+
+class RawDict(RawContainer, dict):
+
+    __slots__ = (
+        'raw',
+        'start',
+        'end',
+        'parent',
+        'modified',
+        'scan',
+    )
+
+    def __init__(self, raw, start, end, parent=None):
+        dict.__init__(self)
+        self.raw = raw
+        self.start = start
+        self.end = end
+        self.parent = parent
+        self.modified = False
+        # 아직 훑지 않은 다음 멤버의 위치
+        self.scan = first_member(raw, start)
+        if self.scan is not None:
+            # 항목이 없으면 json 등은 '{}' 로 인코딩하므로 하나는 찾아둔다.
+            self.scan_next()
+
+    def scan_next(self):
+        ''' Find the next member, and return its key. '''
+        raw = self.raw
+        key_start, key_end, item_start, item_end, self.scan = next_member(
+            raw, self.scan,
+        )
+        key = decode_key(raw[key_start:key_end])
+        if not dict.__contains__(self, key):
+            dict.__setitem__(self, key, Span(item_start, item_end))
+        return key
+
+    def scan_members(self, key=None):
+        '''
+        Find the members not found yet, as far as ``key`` if given.
+        '''
+        while self.scan is not None:
+            if self.scan_next() == key and key is not None:
+                return
+
+    def scan_all(self):
+        self.scan_members()
+
+    def __getitem__(self, key):
+        try:
+            value = dict.__getitem__(self, key)
+        except KeyError:
+            if self.scan is None:
+                raise
+            self.scan_members(key)
+            value = dict.__getitem__(self, key)
+        if type(value) is Span:
+            value = decode_span(self.raw, value.start, value.end, self)
+            dict.__setitem__(self, key, value)
+        return value
+
+    def __contains__(self, key):
+        if dict.__contains__(self, key):
+            return True
+        if self.scan is None:
+            return False
+        self.scan_members(key)
+        return dict.__contains__(self, key)
+
+    def __len__(self):
+        self.scan_all()
+        return dict.__len__(self)
+
+    def __iter__(self):
+        # dict(self) 등이 Span 을 그대로 복사하지 않도록 재정의한다.
+        self.scan_all()
+        return dict.__iter__(self)
+
+    def keys(self):
+        return list(self)
+
+    def get(self, key, default=None):
+        if key in self:
+            return self[key]
+        return default
+
+    def items(self):
+        return [(key, self[key]) for key in self]
+
+    def values(self):
+        return [self[key] for key in self]
+
+    def copy(self):
+        return dict(self.items())
+
+    def __eq__(self, other):
+        if not isinstance(other, dict):
+            return NotImplemented
+        if len(self) != len(other):
+            return False
+        for key in self:
+            if key not in other or self[key] != other[key]:
+                return False
+        return True
+
+    def __ne__(self, other):
+        eq = self.__eq__(other)
+        if eq is NotImplemented:
+            return eq
+        return not eq
+
+    __hash__ = None
+
+    def __repr__(self):
+        return '{}({!r})'.format(type(self).__name__, self.copy())
+
+    # 고치기 전에 모든 멤버를 찾아둔다: 지운 멤버가 다시 나타나지 않도록
+
+    def __setitem__(self, key, value):
+        self.scan_all()
+        dict.__setitem__(self, key, value)
+        self.touch()
+
+    def __delitem__(self, key):
+        self.scan_all()
+        dict.__delitem__(self, key)
+        self.touch()
+
+    def pop(self, key, *default):
+        if key in self:
+            value = self[key]
+            del self[key]
+            return value
+        if default:
+            return default[0]
+        raise KeyError(key)
+
+    def popitem(self):
+        self.scan_all()
+        key, value = dict.popitem(self)
+        self.touch()
+        if type(value) is Span:
+            value = decode_span(self.raw, value.start, value.end, self)
+        return key, value
+
+    def setdefault(self, key, default=None):
+        if key in self:
+            return self[key]
+        self[key] = default
+        return default
+
+    def update(self, *args, **kwargs):
+        self.scan_all()
+        dict.update(self, *args, **kwargs)
+        self.touch()
+
+    def clear(self):
+        self.scan_all()
+        dict.clear(self)
+        self.touch()
+
+
+class RawList(RawContainer, list):
+
+    __slots__ = (
+        'raw',
+        'start',
+        'end',
+        'parent',
+        'modified',
+    )
+
+    def __init__(self, raw, start, end, parent=None):
+        self.raw = raw
+        self.start = start
+        self.end = end
+        self.parent = parent
+        self.modified = False
+        syntax = syntax_for(raw)
+        if (raw.find(syntax.begin_object, start, end) < 0 and
+                raw.find(syntax.begin_array, start + 1, end) < 0):
+            # 스칼라 뿐이면 한꺼번에 디코드하는 편이 빠르다.
+            list.__init__(self, json.loads(decode_text(raw[start:end])))
+        else:
+            list.__init__(self, [
+                decode_span(raw, item_start, item_end, self)
+                for item_start, item_end in iter_array(raw, start)
+            ])
+
+    def __setitem__(self, index, value):
+        list.__setitem__(self, index, value)
+        self.touch()
+
+    def __delitem__(self, index):
+        list.__delitem__(self, index)
+        self.touch()
+
+    def __iadd__(self, other):
+        list.extend(self, other)
+        self.touch()
+        return self
+
+    def __imul__(self, n):
+        list.__imul__(self, n)
+        self.touch()
+        return self
+
+    def append(self, item):
+        list.append(self, item)
+        self.touch()
+
+    def extend(self, items):
+        list.extend(self, items)
+        self.touch()
+
+    def insert(self, index, item):
+        list.insert(self, index, item)
+        self.touch()
+
+    def pop(self, *args):
+        item = list.pop(self, *args)
+        self.touch()
+        return item
+
+    def remove(self, item):
+        list.remove(self, item)
+        self.touch()
+
+    def reverse(self):
+        list.reverse(self)
+        self.touch()
+
+    def sort(self, *args, **kwargs):
+        list.sort(self, *args, **kwargs)
+        self.touch()
+
+    def clear(self):
+        del self[:]
+
+
+def dumps(obj):
+    '''
+    Encode a JSON-able or a proxy, reusing the raw text where possible.
+
+    The raw text of unmodified :class:`RawDict` / :class:`RawList` subtrees
+    and of not-yet-decoded members is copied verbatim. If ``obj`` is itself
+    unmodified, its raw text is returned as is.
+
+    :returns:
+        ``bytes`` if ``obj`` is backed by raw ``bytes``; otherwise ``str``.
+    '''
+    obj = getattr(obj, '__jsonable__', obj)
+    if isinstance(obj, RawContainer):
+        if not obj.modified:
+            return obj.raw[obj.start:obj.end]
+        as_bytes = isinstance(obj.raw, bytes)
+    else:
+        as_bytes = False
+
+    parts = []
+    __encode(obj, parts)
+    text = ''.join(parts)
+    if as_bytes:
+        return text.encode('utf-8')
+    return text
+
+
+def materialize(obj):
+    '''
+    Convert raw-JSON-backed containers into plain ``dict`` / ``list``.
+    '''
+    obj = getattr(obj, '__jsonable__', obj)
+    if isinstance(obj, dict):
+        return dict((key, materialize(value)) for key, value in obj.items())
+    if isinstance(obj, list):
+        return [materialize(item) for item in obj]
+    return obj
+
+
+def __encode(obj, parts):
+    if isinstance(obj, RawContainer) and not obj.modified:
+        parts.append(decode_text(obj.raw[obj.start:obj.end]))
+    elif isinstance(obj, dict):
+        if isinstance(obj, RawDict):
+            obj.scan_all()
+            items = dict.items(obj)
+        else:
+            items = obj.items()
+        parts.append('{')
+        first = True
+        for key, value in items:
+            if first:
+                first = False
+            else:
+                parts.append(', ')
+            parts.append(json.dumps(key))
+            parts.append(': ')
+            if type(value) is Span:
+                parts.append(decode_text(obj.raw[value.start:value.end]))
+            else:
+                __encode(value, parts)
+        parts.append('}')
+    elif isinstance(obj, list):
+        parts.append('[')
+        first = True
+        for item in obj:
+            if first:
+                first = False
+            else:
+                parts.append(', ')
+            __encode(item, parts)
+        parts.append(']')
+    else:
+        parts.append(json.dumps(obj))
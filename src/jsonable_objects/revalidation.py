@@ -0,0 +1,162 @@
+# -*- coding: utf-8 -*-
+#
+#   jsonable-objects: JSON-able objects
+#   Copyright (C) 2015-2017 mete0r <mete0r@sarangbang.or.kr>
+#
+#   This program is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU Affero General Public License as published by
+#   the Free Software Foundation, either version 3 of the License, or
+#   (at your option) any later version.
+#
+#   This program is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#   GNU Affero General Public License for more details.
+#
+#   You should have received a copy of the GNU Affero General Public License
+#   along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+'''
+Incremental revalidation after direct mutations of the raw structures.
+'''
+from __future__ import absolute_import
+from __future__ import print_function
+from __future__ import unicode_literals
+
+from .proxy import check_item_batch
+from .tracking import parse_json_pointer
+
+
+class Journal(object):
+    '''
+    Paths mutated directly in a ``__jsonable__``, to be revalidated later.
+
+    Paths are JSON Pointers or tuples of keys, relative to the proxy which
+    will be revalidated.
+    '''
+    __slots__ = ('paths',)
+
+    def __init__(self):
+        self.paths = set()
+
+    def __len__(self):
+        return len(self.paths)
+
+    def __iter__(self):
+        return iter(self.paths)
+
+    def record(self, path):
+        self.paths.add(as_path(path))
+
+    def clear(self):
+        self.paths.clear()
+
+
+def as_path(path):
+    ''' Path of a JSON Pointer, or a tuple of keys as is. '''
+    if isinstance(path, tuple):
+        return path
+    if isinstance(path, list):
+        return tuple(path)
+    return parse_json_pointer(path)
+
+
+def revalidate(obj, paths=None, journal=None):
+    '''
+    Re-check the given fields or container entries of a proxy, after its
+    ``__jsonable__`` has been mutated directly.
+
+    A path is walked through the nested proxies, re-checking only the
+    downward checks of the fields on the way; the field or entry at its end
+    is checked as a whole. The paths in ``journal`` are checked too, and the
+    journal is cleared once they pass. Paths under another one are skipped.
+
+    Without ``paths`` and ``journal``, the whole ``obj`` is validated.
+    '''
+    proxy_class = type(obj)
+    jsonable = obj.__jsonable__
+    if paths is None and journal is None:
+        proxy_class.__jsonable_proxy__.validate(jsonable)
+        return obj
+
+    todo = set()
+    if paths is not None:
+        todo.update(as_path(path) for path in paths)
+    if journal is not None:
+        todo.update(journal)
+
+    for path in __outermost(todo):
+        __revalidate(proxy_class, jsonable, path)
+
+    if journal is not None:
+        journal.clear()
+    return obj
+
+
+def __outermost(paths):
+    seen = set()
+    for path in sorted(paths, key=len):
+        if any(path[:i] in seen for i in range(len(path))):
+            continue
+        seen.add(path)
+        yield path
+
+
+def __revalidate(proxy_class, jsonable, path):
+    metadata = proxy_class.__jsonable_proxy__
+    if not path:
+        metadata.validate(jsonable)
+        return
+    if not isinstance(jsonable, metadata.wrapped_type):
+        raise TypeError()
+
+    key = path[0]
+    rest = path[1:]
+    if issubclass(metadata.wrapped_type, list):
+        key = int(key)
+
+    field = __compiled(metadata).get(key)
+    if field is not None:
+        if rest and field.proxy_class is not None:
+            value = field.dops.get(jsonable)
+            if value is not None:
+                __revalidate(field.proxy_class, value, rest)
+        else:
+            field.uops.get(jsonable)
+    elif metadata.as_container:
+        __revalidate_item(metadata, jsonable, key, rest)
+
+
+def __revalidate_item(metadata, jsonable, key, rest):
+    if isinstance(jsonable, dict):
+        if key not in jsonable:
+            # 지워진 항목은 검사할 것이 없다.
+            return
+        if metadata.keyFormat is not None:
+            metadata.keyFormat.parse(key)
+    elif not -len(jsonable) <= key < len(jsonable):
+        return
+
+    value = jsonable[key]
+    itemProxy = metadata.itemProxy
+    if itemProxy is not None:
+        __revalidate(itemProxy, value, rest)
+    if metadata.itemFormat is not None:
+        metadata.itemFormat.parse(value)
+    if metadata.itemBatchPredicate is not None:
+        check_item_batch(metadata.itemBatchPredicate, [value])
+
+
+def __compiled(metadata):
+    try:
+        return metadata.compiled['revalidate']
+    except KeyError:
+        pass
+    if issubclass(metadata.wrapped_type, dict):
+        fields = dict((field.key, field) for field in metadata.field_list)
+    else:
+        fields = dict(
+            (field.local_index, field) for field in metadata.field_list
+        )
+    metadata.compiled['revalidate'] = fields
+    return fields
@@ -0,0 +1,311 @@
+# -*- coding: utf-8 -*-
+#
+#   jsonable-objects: JSON-able objects
+#   Copyright (C) 2015-2017 mete0r <mete0r@sarangbang.or.kr>
+#
+#   This program is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU Affero General Public License as published by
+#   the Free Software Foundation, either version 3 of the License, or
+#   (at your option) any later version.
+#
+#   This program is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#   GNU Affero General Public License for more details.
+#
+#   You should have received a copy of the GNU Affero General Public License
+#   along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+'''
+Structural scanning of JSON text.
+
+These functions find the spans of JSON values without decoding them, so
+that only the needed subtrees are decoded later. They work on ``str``, and
+on bytes-like objects including ``mmap``.
+
+A value is skipped with a single regular expression match, without
+tokenizing it in Python, unless it is nested deeper than
+:data:`SKIP_DEPTH` levels; skipping costs about as much as ``json.loads()``
+of the same text, without making any object.
+
+The scanner does not validate the text thoroughly: e.g. mismatched brackets
+are not detected. Malformed subtrees are reported when they are decoded.
+'''
+from __future__ import absolute_import
+from __future__ import print_function
+from __future__ import unicode_literals
+import re
+
+
+# 한 번의 정규식 검사로 건너뛰는 컨테이너의 깊이
+SKIP_DEPTH = 8
+
+__ws = r'[ \t\n\r]*'
+__string = r'"[^"\\]*(?:\\.[^"\\]*)*"'
+__scalar = r'[^ \t\n\r,:\[\]{}"]+'
+__other = r'[^"\[\]{}]*'
+
+
+def container_pattern(depth):
+    '''
+    Regular expression of the arrays and objects nested at most ``depth``
+    levels. The brackets are not paired: ``[`` may be closed with ``}``.
+    '''
+    pattern = r'[\[{]' + __other + r'(?:' + __string + __other + r')*[\]}]'
+    for _ in range(depth - 1):
+        pattern = (
+            r'[\[{]' + __other +
+            r'(?:(?:' + __string + r'|' + pattern + r')' + __other + r')*' +
+            r'[\]}]'
+        )
+    return pattern
+
+
+def item_pattern(depth):
+    '''
+    Regular expression of an array item, up to the next one: the groups are
+    the item, and the comma if it is followed by another one.
+    '''
+    value = '|'.join([container_pattern(depth), __string, __scalar])
+    return (
+        r'(' + value + r')' + __ws + r'(?:(,)|\])' + __ws
+    )
+
+
+def member_pattern(depth):
+    '''
+    Regular expression of an object member, up to the next one: the groups
+    are the key, the value, and the comma if it is followed by another one.
+    '''
+    value = '|'.join([container_pattern(depth), __string, __scalar])
+    return (
+        r'(' + __string + r')' + __ws + ':' + __ws +
+        r'(' + value + r')' + __ws + r'(?:(,)|\})' + __ws
+    )
+
+
+class Syntax(object):
+
+    def __init__(self, encode):
+        def compile(pattern):
+            return re.compile(encode(pattern), re.DOTALL)
+
+        self.compile = compile
+        self.__patterns = {}
+
+        self.ws = compile(r'[ \t\n\r]*')
+        self.string = compile(r'"[^"\\]*(?:\\.[^"\\]*)*"')
+        self.scalar = compile(r'[^ \t\n\r,:\[\]{}"]+')
+        self.structural = compile(r'["\[\]{}]')
+
+        self.quote = encode('"')
+        self.comma = encode(',')
+        self.colon = encode(':')
+        self.begin_array = encode('[')
+        self.end_array = encode(']')
+        self.begin_object = encode('{')
+        self.end_object = encode('}')
+
+    def __compiled(self, make_pattern):
+        # 처음 쓸 때 컴파일한다.
+        compiled = self.__patterns.get(make_pattern)
+        if compiled is None:
+            compiled = self.__patterns[make_pattern] = self.compile(
+                make_pattern(SKIP_DEPTH)
+            )
+        return compiled
+
+    @property
+    def container(self):
+        return self.__compiled(container_pattern)
+
+    @property
+    def item(self):
+        return self.__compiled(item_pattern)
+
+    @property
+    def member(self):
+        return self.__compiled(member_pattern)
+
+
+__text_syntax = Syntax(lambda s: s)
+__bytes_syntax = Syntax(lambda s: s.encode('ascii'))
+
+
+def syntax_for(buf):
+    if isinstance(buf, type('')):
+        return __text_syntax
+    return __bytes_syntax
+
+
+def skip_ws(buf, pos):
+    ''' Position of the first non-blank character at or after ``pos``. '''
+    return syntax_for(buf).ws.match(buf, pos).end()
+
+
+def value_kind(buf, pos):
+    '''
+    Kind of the value starting at ``pos``.
+
+    :returns:
+        ``dict``, ``list`` or ``None`` for the scalars.
+    '''
+    syntax = syntax_for(buf)
+    c = buf[pos:pos + 1]
+    if c == syntax.begin_object:
+        return dict
+    if c == syntax.begin_array:
+        return list
+    return None
+
+
+def value_end(buf, pos):
+    ''' End position of the JSON value starting at ``pos``. '''
+    syntax = syntax_for(buf)
+    c = buf[pos:pos + 1]
+
+    if c == syntax.quote:
+        m = syntax.string.match(buf, pos)
+        if m is None:
+            raise ValueError(pos)
+        return m.end()
+
+    if c == syntax.begin_object or c == syntax.begin_array:
+        container = syntax.container
+        m = container.match(buf, pos)
+        if m is not None:
+            return m.end()
+
+        # SKIP_DEPTH 보다 깊이 중첩되었거나 잘못된 텍스트
+        depth = 1
+        p = pos + 1
+        while True:
+            m = syntax.structural.search(buf, p)
+            if m is None:
+                raise ValueError(pos)
+            c = m.group()
+            if c == syntax.quote:
+                m = syntax.string.match(buf, m.start())
+                if m is None:
+                    raise ValueError(pos)
+                p = m.end()
+                continue
+            if c == syntax.begin_object or c == syntax.begin_array:
+                nested = container.match(buf, m.start())
+                if nested is not None:
+                    p = nested.end()
+                    continue
+                depth += 1
+            else:
+                depth -= 1
+            p = m.end()
+            if depth == 0:
+                return p
+
+    m = syntax.scalar.match(buf, pos)
+    if m is None:
+        raise ValueError(pos)
+    return m.end()
+
+
+def iter_array(buf, pos):
+    '''
+    Iterate spans of the items of the array starting at ``pos``.
+
+    :returns:
+        iterator of ``(start, end)``.
+    '''
+    syntax = syntax_for(buf)
+    if buf[pos:pos + 1] != syntax.begin_array:
+        raise ValueError(pos)
+
+    ws = syntax.ws
+    p = ws.match(buf, pos + 1).end()
+    if buf[p:p + 1] == syntax.end_array:
+        return
+
+    item = syntax.item
+    while True:
+        m = item.match(buf, p)
+        if m is not None:
+            yield m.span(1)
+            if m.start(2) < 0:
+                return
+            p = m.end()
+            continue
+
+        # SKIP_DEPTH 보다 깊이 중첩되었거나 잘못된 텍스트
+        end = value_end(buf, p)
+        yield p, end
+        p = ws.match(buf, end).end()
+        c = buf[p:p + 1]
+        if c == syntax.comma:
+            p = ws.match(buf, p + 1).end()
+        elif c == syntax.end_array:
+            return
+        else:
+            raise ValueError(p)
+
+
+def iter_object(buf, pos):
+    '''
+    Iterate spans of the members of the object starting at ``pos``.
+
+    :returns:
+        iterator of ``(key_start, key_end, value_start, value_end)``. The
+        key span includes the quotes.
+    '''
+    p = first_member(buf, pos)
+    while p is not None:
+        key_start, key_end, value_start, value_end_, p = next_member(buf, p)
+        yield key_start, key_end, value_start, value_end_
+
+
+def first_member(buf, pos):
+    '''
+    Position of the first member of the object starting at ``pos``, or None
+    if it is empty.
+    '''
+    syntax = syntax_for(buf)
+    if buf[pos:pos + 1] != syntax.begin_object:
+        raise ValueError(pos)
+    p = syntax.ws.match(buf, pos + 1).end()
+    if buf[p:p + 1] == syntax.end_object:
+        return None
+    return p
+
+
+def next_member(buf, p):
+    '''
+    Spans of the object member at ``p``, e.g. from :func:`first_member`.
+
+    :returns:
+        ``(key_start, key_end, value_start, value_end, next)`` where
+        ``next`` is the position of the next member, or None if it is the
+        last one.
+    '''
+    syntax = syntax_for(buf)
+    m = syntax.member.match(buf, p)
+    if m is not None:
+        if m.start(3) < 0:
+            return m.start(1), m.end(1), m.start(2), m.end(2), None
+        return m.start(1), m.end(1), m.start(2), m.end(2), m.end()
+
+    # SKIP_DEPTH 보다 깊이 중첩되었거나 잘못된 텍스트
+    ws = syntax.ws
+    m = syntax.string.match(buf, p)
+    if m is None:
+        raise ValueError(p)
+    key_start, key_end = m.span()
+    p = ws.match(buf, key_end).end()
+    if buf[p:p + 1] != syntax.colon:
+        raise ValueError(p)
+    start = ws.match(buf, p + 1).end()
+    end = value_end(buf, start)
+    p = ws.match(buf, end).end()
+    c = buf[p:p + 1]
+    if c == syntax.comma:
+        return key_start, key_end, start, end, ws.match(buf, p + 1).end()
+    if c == syntax.end_object:
+        return key_start, key_end, start, end, None
+    raise ValueError(p)
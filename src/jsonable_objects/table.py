@@ -0,0 +1,337 @@
+# -*- coding: utf-8 -*-
+#
+#   jsonable-objects: JSON-able objects
+#   Copyright (C) 2015-2017 mete0r <mete0r@sarangbang.or.kr>
+#
+#   This program is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU Affero General Public License as published by
+#   the Free Software Foundation, either version 3 of the License, or
+#   (at your option) any later version.
+#
+#   This program is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#   GNU Affero General Public License for more details.
+#
+#   You should have received a copy of the GNU Affero General Public License
+#   along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+'''
+Columnar tables of homogeneous records.
+'''
+from __future__ import absolute_import
+from __future__ import print_function
+from __future__ import unicode_literals
+from array import array
+
+
+try:
+    array('q')
+except ValueError:
+    # Python 2 의 array 에는 'q' 가 없다.
+    INTEGER_TYPECODE = 'l'
+else:
+    INTEGER_TYPECODE = 'q'
+
+
+class Column(object):
+    '''
+    Values of a field, one per row.
+
+    :ivar data:
+        the values; ``None`` rows hold a placeholder.
+    :ivar nulls:
+        ``bytearray`` null mask of the optional fields, or ``None``.
+    '''
+
+    __slots__ = (
+        'data',
+        'nulls',
+    )
+
+    placeholder = None
+
+    def __init__(self, data, optional):
+        self.data = data
+        self.nulls = bytearray() if optional else None
+
+    def __len__(self):
+        return len(self.data)
+
+    def __getitem__(self, index):
+        nulls = self.nulls
+        if nulls is not None and nulls[index]:
+            return None
+        return self.decode(self.data[index])
+
+    def __iter__(self):
+        nulls = self.nulls
+        decode = self.decode
+        if nulls is None:
+            for value in self.data:
+                yield decode(value)
+        else:
+            for null, value in zip(nulls, self.data):
+                yield None if null else decode(value)
+
+    def append(self, value):
+        if value is None:
+            self.nulls.append(1)
+            self.data.append(self.placeholder)
+        else:
+            self.data.append(self.encode(value))
+            if self.nulls is not None:
+                self.nulls.append(0)
+
+    def set(self, index, value):
+        if value is None:
+            self.nulls[index] = 1
+        else:
+            self.data[index] = self.encode(value)
+            if self.nulls is not None:
+                self.nulls[index] = 0
+
+    def encode(self, value):
+        return value
+
+    def decode(self, value):
+        return value
+
+
+class NumberColumn(Column):
+    ''' Numbers in an ``array.array``. '''
+
+    __slots__ = ()
+
+    placeholder = 0
+
+    def __init__(self, typecode, optional):
+        super(NumberColumn, self).__init__(array(typecode), optional)
+
+    def encode(self, value):
+        # array 가 float 를 int 로, bool 을 숫자로 받아들이지 않도록
+        if (isinstance(value, bool) or
+                not isinstance(value, type(self.placeholder + 0))):
+            raise TypeError()
+        return value
+
+
+class IntegerColumn(NumberColumn):
+
+    __slots__ = ()
+
+    def __init__(self, optional):
+        super(IntegerColumn, self).__init__(INTEGER_TYPECODE, optional)
+
+
+class FloatColumn(NumberColumn):
+
+    __slots__ = ()
+
+    placeholder = 0.0
+
+    def __init__(self, optional):
+        super(FloatColumn, self).__init__('d', optional)
+
+
+class DictionaryColumn(Column):
+    ''' Dictionary-encoded strings: a code per row and the distinct values. '''
+
+    __slots__ = (
+        'dictionary',
+        'codes',
+    )
+
+    placeholder = 0
+
+    def __init__(self, optional):
+        super(DictionaryColumn, self).__init__(array('l'), optional)
+        self.dictionary = []
+        self.codes = {}
+
+    def encode(self, value):
+        try:
+            return self.codes[value]
+        except KeyError:
+            code = self.codes[value] = len(self.dictionary)
+            self.dictionary.append(value)
+            return code
+
+    def decode(self, code):
+        return self.dictionary[code]
+
+
+def make_column(field):
+    ''' Column for the values of a field. '''
+    if field.proxy_class is None:
+        if field.type is int:
+            return IntegerColumn(field.optional)
+        if field.type is float:
+            return FloatColumn(field.optional)
+        if field.type is str and field.intern:
+            return DictionaryColumn(field.optional)
+    return Column([], field.optional)
+
+
+class RowRef(object):
+    '''
+    ``__jsonable__`` of the row views: reads and writes the columns.
+
+    It is neither a ``dict`` nor a ``list``; the functions walking the
+    documents, e.g. ``fingerprint()`` and ``memory_report()``, refuse the
+    row views. Use :meth:`RecordTable.record` to get a raw record.
+    '''
+
+    __slots__ = (
+        'table',
+        'index',
+    )
+
+    def __init__(self, table, index):
+        self.table = table
+        self.index = index
+
+    def __getitem__(self, key):
+        try:
+            column = self.table.columns_by_key[key]
+        except KeyError:
+            raise KeyError(key)
+        return column[self.index]
+
+    def get(self, key, default=None):
+        column = self.table.columns_by_key.get(key)
+        if column is None:
+            return default
+        value = column[self.index]
+        if value is None:
+            return default
+        return value
+
+    def __setitem__(self, key, value):
+        self.table.set(self.index, key, value)
+
+    def __delitem__(self, key):
+        self.table.set(self.index, key, None)
+
+
+class RecordTable(object):
+    '''
+    N records of a proxy class, stored as one column per field.
+
+    ``int`` and ``float`` fields are stored in ``array.array``, ``str``
+    fields declared with ``Field(intern=True)`` are dictionary-encoded, and
+    the other values are kept in lists. The optional fields have a null
+    mask. The members not declared as fields are not kept.
+
+    Indexing gives lightweight views of the rows: instances of the proxy
+    class whose fields read and write the columns.
+    '''
+
+    __slots__ = (
+        'proxy_class',
+        'columns',
+        'columns_by_key',
+        'length',
+    )
+
+    def __init__(self, proxy_class, records=()):
+        metadata = proxy_class.__jsonable_proxy__
+        if metadata.as_container or metadata.tracked:
+            raise TypeError()
+        self.proxy_class = proxy_class
+        self.columns = []
+        self.columns_by_key = {}
+        for field in metadata.field_list:
+            column = make_column(field)
+            self.columns.append((field, column))
+            if issubclass(metadata.wrapped_type, dict):
+                self.columns_by_key[field.key] = column
+            else:
+                self.columns_by_key[field.local_index] = column
+        self.length = 0
+        self.extend(records)
+
+    def __len__(self):
+        return self.length
+
+    def __getitem__(self, index):
+        index = self.__index(index)
+        row = self.proxy_class.__new__(self.proxy_class)
+        row.__jsonable__ = RowRef(self, index)
+        return row
+
+    def __iter__(self):
+        for index in range(self.length):
+            yield self[index]
+
+    def column(self, name):
+        ''' Column of a field, by its name. '''
+        for field, column in self.columns:
+            if field.name == name:
+                return column
+        raise KeyError(name)
+
+    def append(self, record):
+        ''' Append a record: a proxy, or a raw record to be validated. '''
+        proxy_class = self.proxy_class
+        if isinstance(record, proxy_class):
+            jsonable = record.__jsonable__
+        else:
+            jsonable = proxy_class.__jsonable_proxy__.validate(record)
+
+        values = [
+            (column, field.dops.get(jsonable))
+            for field, column in self.columns
+        ]
+        for column, value in values:
+            self.__append(column, value)
+        self.length += 1
+
+    def extend(self, records):
+        for record in records:
+            self.append(record)
+
+    def record(self, index):
+        ''' Raw record of a row. '''
+        index = self.__index(index)
+        if issubclass(self.proxy_class.__jsonable_proxy__.wrapped_type, list):
+            return [column[index] for field, column in self.columns]
+        record = {}
+        for field, column in self.columns:
+            value = column[index]
+            if value is not None:
+                record[field.key] = value
+        return record
+
+    def set(self, index, key, value):
+        column = self.columns_by_key[key]
+        try:
+            column.set(index, value)
+        except (TypeError, OverflowError):
+            self.__demote(column).set(index, value)
+
+    def __append(self, column, value):
+        try:
+            column.append(value)
+        except (TypeError, OverflowError):
+            self.__demote(column).append(value)
+
+    def __demote(self, column):
+        # array 에 담을 수 없는 값이 오면 list 로 바꾼다.
+        general = Column(list(column), column.nulls is not None)
+        if column.nulls is not None:
+            general.nulls = column.nulls
+        for i, (field, existing) in enumerate(self.columns):
+            if existing is column:
+                self.columns[i] = (field, general)
+        for key, existing in self.columns_by_key.items():
+            if existing is column:
+                self.columns_by_key[key] = general
+        return general
+
+    def __index(self, index):
+        if index < 0:
+            index += self.length
+        if not 0 <= index < self.length:
+            raise IndexError(index)
+        return index
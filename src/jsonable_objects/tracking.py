@@ -0,0 +1,544 @@
+# -*- coding: utf-8 -*-
+#
+#   jsonable-objects: JSON-able objects
+#   Copyright (C) 2015-2017 mete0r <mete0r@sarangbang.or.kr>
+#
+#   This program is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU Affero General Public License as published by
+#   the Free Software Foundation, either version 3 of the License, or
+#   (at your option) any later version.
+#
+#   This program is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#   GNU Affero General Public License for more details.
+#
+#   You should have received a copy of the GNU Affero General Public License
+#   along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+'''
+Change tracking of proxy trees.
+
+Instances of ``@proxy(..., tracked=True)`` classes record the changes made
+through their field descriptors and container methods into a
+:class:`Tracker` shared by the whole document. Child proxies obtained from
+a tracked proxy are attached to the same tracker if their classes are also
+tracked, so that their changes are recorded with the paths from the root.
+'''
+from __future__ import absolute_import
+from __future__ import print_function
+from __future__ import unicode_literals
+from collections import namedtuple
+from contextlib import contextmanager
+
+
+MISSING = object()
+
+
+SetChange = namedtuple('SetChange', [
+    'path',
+    'old',
+])
+
+
+SpliceChange = namedtuple('SpliceChange', [
+    'path',
+    'start',
+    'old_items',
+    'new_length',
+])
+
+
+class Tracker(object):
+    '''
+    Change log of a document.
+
+    :ivar root:
+        the ``__jsonable__`` of the root proxy.
+    :ivar changes:
+        list of :class:`SetChange` / :class:`SpliceChange`. A
+        :class:`SpliceChange` is recorded for the structural changes of
+        lists, e.g. deleting an item or assigning to a slice. The changes are
+        kept since the last :meth:`mark_clean`, or since the outermost open
+        transaction if any.
+    :ivar clean:
+        index of the first change since the last :meth:`mark_clean`.
+    :ivar savepoints:
+        stack of ``(index, clean)`` of the open transactions, where
+        ``index`` is that of the first change of each.
+    :ivar caches:
+        named caches of values derived from the subtrees, e.g. their
+        encoded texts, keyed by the paths. An entry is dropped when a change
+        is made at or under its path, and the entries under a list are
+        dropped when its items are moved or a subtree is replaced. ``None``
+        until :meth:`cache` is used. A subtree shared by two paths of a
+        document is not supported: a change made through one path does not
+        drop the entries of the other.
+    '''
+
+    __slots__ = (
+        'root',
+        'changes',
+        'clean',
+        'savepoints',
+        'caches',
+    )
+
+    def __init__(self, root):
+        self.root = root
+        self.changes = []
+        self.clean = 0
+        self.savepoints = []
+        self.caches = None
+
+    def record(self, change):
+        self.changes.append(change)
+        if self.caches is not None:
+            self.__invalidate(change)
+
+    def cache(self, name):
+        '''
+        Named cache of the values derived from the subtrees.
+
+        :returns:
+            ``dict`` of ``path -> (subtree, value)``. The users should check
+            that ``subtree`` is still the one at ``path``, since a subtree
+            replaced under a changed path is not dropped eagerly.
+        '''
+        if self.caches is None:
+            self.caches = {}
+        try:
+            return self.caches[name]
+        except KeyError:
+            cache = self.caches[name] = {}
+            return cache
+
+    def invalidate(self, path, subtree=False):
+        '''
+        Drop the cached values of the path and of its ancestors, and of its
+        descendants if ``subtree``.
+        '''
+        length = len(path)
+        for cache in self.caches.values():
+            for i in range(length + 1):
+                cache.pop(path[:i], None)
+            if subtree:
+                for key in [key for key in cache if key[:length] == path]:
+                    del cache[key]
+
+    def __invalidate(self, change):
+        # 항목이 옮겨진 리스트나 바뀐 서브트리 아래의 경로는 다른 노드를
+        # 가리키게 되고, 옛 노드가 같은 경로로 돌아오면 노드가 같은지로는
+        # 알아챌 수 없으므로 모두 버린다.
+        if isinstance(change, SpliceChange):
+            subtree = True
+        else:
+            subtree = isinstance(change.old, (dict, list))
+        self.invalidate(change.path, subtree)
+
+    def mark_clean(self):
+        if self.savepoints:
+            # 열린 트랜잭션이 되돌릴 수 있도록 기록은 남겨둔다.
+            self.clean = len(self.changes)
+        else:
+            del self.changes[:]
+            self.clean = 0
+
+    def begin(self):
+        ''' Begin a transaction, and return its savepoint. '''
+        savepoint = len(self.savepoints)
+        self.savepoints.append((len(self.changes), self.clean))
+        return savepoint
+
+    def commit(self, savepoint):
+        ''' End the innermost transaction, keeping its changes. '''
+        self.__end(savepoint)
+        if not self.savepoints and self.clean > 0:
+            del self.changes[:self.clean]
+            self.clean = 0
+
+    def rollback(self, savepoint):
+        '''
+        End the innermost transaction, undoing its changes.
+
+        The changes are undone in the reverse order by restoring the recorded
+        previous values; no copy of the document is involved. A
+        :meth:`mark_clean` made within the transaction is undone as well.
+        '''
+        index, clean = self.__end(savepoint)
+
+        changes = self.changes
+        while len(changes) > index:
+            change = changes.pop()
+            if self.caches is not None:
+                # 되돌린 뒤의 값이 무엇이든 그 아래의 경로는 모두 버린다.
+                self.invalidate(change.path, True)
+            if isinstance(change, SetChange):
+                container = self.lookup(change.path[:-1])
+                key = change.path[-1]
+                if change.old is MISSING:
+                    container.pop(key, None)
+                else:
+                    container[key] = change.old
+            else:
+                container = self.lookup(change.path)
+                start = change.start
+                container[start:start + change.new_length] = change.old_items
+        self.clean = clean
+
+    def __end(self, savepoint):
+        if len(self.savepoints) != savepoint + 1:
+            raise ValueError(savepoint)
+        return self.savepoints.pop()
+
+    def lookup(self, path):
+        node = self.root
+        for key in path:
+            try:
+                node = node[key]
+            except (KeyError, IndexError, TypeError):
+                return MISSING
+        return node
+
+    def dirty_paths(self):
+        '''
+        Changed paths, in the order of the first change of each.
+
+        :returns:
+            list of ``(path, existed)`` where ``existed`` tells whether the
+            path existed at the last :meth:`mark_clean`. Paths under
+            another changed path are omitted.
+        '''
+        first = {}
+        order = []
+        for change in self.changes[self.clean:]:
+            path = change.path
+            if path in first:
+                continue
+            if isinstance(change, SetChange):
+                first[path] = change.old is not MISSING
+            else:
+                first[path] = True
+            order.append(path)
+
+        return [
+            (path, first[path])
+            for path in order
+            if not any(path[:i] in first for i in range(len(path)))
+        ]
+
+    def json_patch(self):
+        ''' RFC 6902 JSON Patch since the last :meth:`mark_clean`. '''
+        patch = []
+        for path, existed in self.dirty_paths():
+            value = self.lookup(path)
+            pointer = json_pointer(path)
+            if value is MISSING:
+                if existed:
+                    patch.append({'op': 'remove', 'path': pointer})
+            elif existed:
+                patch.append({'op': 'replace', 'path': pointer,
+                              'value': value})
+            else:
+                patch.append({'op': 'add', 'path': pointer, 'value': value})
+        return patch
+
+
+def json_pointer(path):
+    ''' RFC 6901 JSON Pointer of a path. '''
+    return ''.join(
+        '/' + '{}'.format(key).replace('~', '~0').replace('/', '~1')
+        for key in path
+    )
+
+
+def parse_json_pointer(pointer):
+    ''' Path of a RFC 6901 JSON Pointer; array indices are left as strings. '''
+    if pointer == '':
+        return ()
+    if not pointer.startswith('/'):
+        raise ValueError(pointer)
+    return tuple(
+        key.replace('~1', '/').replace('~0', '~')
+        for key in pointer[1:].split('/')
+    )
+
+
+def document_of(proxy):
+    '''
+    Tracker and path of a tracked proxy.
+
+    A proxy becomes the root of a new tracker if it has none, or if it is no
+    longer found at its path, e.g. its parent field has been replaced.
+    '''
+    tracker = getattr(proxy, '__jsonable_tracker__', None)
+    if tracker is not None:
+        path = proxy.__jsonable_path__
+        if not path or tracker.lookup(path) is proxy.__jsonable__:
+            return tracker, path
+
+    tracker = Tracker(proxy.__jsonable__)
+    proxy.__jsonable_tracker__ = tracker
+    proxy.__jsonable_path__ = ()
+    return tracker, ()
+
+
+def attach(child, parent, key):
+    ''' Attach a child proxy to the tracker of its parent. '''
+    tracker = getattr(parent, '__jsonable_tracker__', None)
+    if tracker is None:
+        tracker, path = document_of(parent)
+    else:
+        path = parent.__jsonable_path__
+    child.__jsonable_tracker__ = tracker
+    child.__jsonable_path__ = path + (key,)
+
+
+def mark_clean(self):
+    ''' Forget the changes made so far. '''
+    document_of(self)[0].mark_clean()
+
+
+def changed_paths(self):
+    '''
+    JSON Pointers of the changed paths since the last ``mark_clean()``.
+
+    Setting a value equal to the current one, or deleting an absent field,
+    is not a change.
+    '''
+    tracker = document_of(self)[0]
+    return set(json_pointer(path) for path, _ in tracker.dirty_paths())
+
+
+def json_patch(self):
+    ''' RFC 6902 JSON Patch since the last ``mark_clean()``. '''
+    return document_of(self)[0].json_patch()
+
+
+@contextmanager
+def transaction(self):
+    '''
+    Undo the changes made through the proxies of the document, if the block
+    raises.
+
+    Only the changes made through the tracked proxies are undone, not those
+    made to the ``__jsonable__`` directly. Transactions can be nested.
+    '''
+    tracker = document_of(self)[0]
+    savepoint = tracker.begin()
+    try:
+        yield self
+    except BaseException:
+        tracker.rollback(savepoint)
+        raise
+    else:
+        tracker.commit(savepoint)
+
+
+def is_tracked(proxy_class):
+    return (proxy_class is not None and
+            proxy_class.__jsonable_proxy__.tracked)
+
+
+def make_tracked_descriptors(field, container_type):
+    uops = field.uops
+    if container_type is dict:
+        key = field.key
+    else:
+        key = field.local_index
+
+    if is_tracked(field.proxy_class):
+        def getter(self):
+            value = uops.get(self.__jsonable__)
+            if value is not None:
+                attach(value, self, key)
+            return value
+    else:
+        def getter(self):
+            return uops.get(self.__jsonable__)
+
+    def setter(self, value):
+        tracker, path = document_of(self)
+        jsonable = self.__jsonable__
+        old = __get_item(jsonable, key)
+        uops.set(jsonable, value)
+        __record_set(tracker, path + (key,), old, __get_item(jsonable, key))
+
+    if uops.delete is None:
+        return getter, setter, None
+
+    def deleter(self):
+        tracker, path = document_of(self)
+        jsonable = self.__jsonable__
+        old = __get_item(jsonable, key)
+        uops.delete(jsonable)
+        # 없는 필드를 지우는 것은 변경이 아니다.
+        if old is not MISSING:
+            tracker.record(SetChange(path + (key,), old))
+
+    return getter, setter, deleter
+
+
+def make_tracked_methods(methods, wrapped_type, keyFormat, itemProxy):
+    init = methods.init
+
+    def __init__(self, __jsonable__):
+        init(self, __jsonable__)
+        self.__jsonable_tracker__ = None
+        self.__jsonable_path__ = ()
+
+    methods = methods._replace(init=__init__)
+    if methods.getitem is None:
+        return methods
+
+    if issubclass(wrapped_type, dict):
+        return methods._replace(
+            getitem=__make_tracked_dict_getitem(methods.getitem, keyFormat,
+                                                itemProxy),
+            setitem=__make_tracked_dict_setitem(methods.setitem, keyFormat),
+            delitem=__make_tracked_dict_delitem(methods.delitem, keyFormat),
+        )
+    else:
+        return methods._replace(
+            iter=__make_tracked_list_iter(methods.iter, itemProxy),
+            getitem=__make_tracked_list_getitem(methods.getitem, itemProxy),
+            setitem=__make_tracked_list_setitem(methods.setitem),
+            delitem=__make_tracked_list_delitem(methods.delitem),
+        )
+
+
+def __get_item(container, key):
+    if isinstance(container, dict):
+        return container.get(key, MISSING)
+    if key < len(container):
+        return container[key]
+    return MISSING
+
+
+def __record_set(tracker, path, old, new):
+    # 같은 값을 다시 넣는 것은 변경이 아니다.
+    if old is MISSING or old != new:
+        tracker.record(SetChange(path, old))
+
+
+def __make_raw_key(keyFormat):
+    if keyFormat is None:
+        return lambda key: key
+    return keyFormat.format
+
+
+def __make_tracked_dict_getitem(getitem, keyFormat, itemProxy):
+    if not is_tracked(itemProxy):
+        return getitem
+
+    raw_key = __make_raw_key(keyFormat)
+
+    def __getitem__(self, key):
+        value = getitem(self, key)
+        attach(value, self, raw_key(key))
+        return value
+    return __getitem__
+
+
+def __make_tracked_dict_setitem(setitem, keyFormat):
+    raw_key = __make_raw_key(keyFormat)
+
+    def __setitem__(self, key, value):
+        tracker, path = document_of(self)
+        k = raw_key(key)
+        jsonable = self.__jsonable__
+        old = jsonable.get(k, MISSING)
+        setitem(self, key, value)
+        __record_set(tracker, path + (k,), old, jsonable.get(k, MISSING))
+    return __setitem__
+
+
+def __make_tracked_dict_delitem(delitem, keyFormat):
+    raw_key = __make_raw_key(keyFormat)
+
+    def __delitem__(self, key):
+        tracker, path = document_of(self)
+        k = raw_key(key)
+        old = self.__jsonable__.get(k, MISSING)
+        delitem(self, key)
+        tracker.record(SetChange(path + (k,), old))
+    return __delitem__
+
+
+def __make_tracked_list_iter(iter_, itemProxy):
+    if not is_tracked(itemProxy):
+        return iter_
+
+    def __iter__(self):
+        for index, item in enumerate(iter_(self)):
+            attach(item, self, index)
+            yield item
+    return __iter__
+
+
+def __make_tracked_list_getitem(getitem, itemProxy):
+    if not is_tracked(itemProxy):
+        return getitem
+
+    def __getitem__(self, index):
+        value = getitem(self, index)
+        if isinstance(index, slice):
+            indices = range(*index.indices(len(self.__jsonable__)))
+            for i, item in zip(indices, value):
+                attach(item, self, i)
+        else:
+            if index < 0:
+                index += len(self.__jsonable__)
+            attach(value, self, index)
+        return value
+    return __getitem__
+
+
+def __make_tracked_list_setitem(setitem):
+
+    def __setitem__(self, index, value):
+        tracker, path = document_of(self)
+        jsonable = self.__jsonable__
+        if isinstance(index, slice):
+            splice = __begin_splice(jsonable, index)
+            setitem(self, index, value)
+            tracker.record(__end_splice(jsonable, path, splice))
+        else:
+            if index < 0:
+                index += len(jsonable)
+            old = jsonable[index]
+            setitem(self, index, value)
+            __record_set(tracker, path + (index,), old, jsonable[index])
+    return __setitem__
+
+
+def __make_tracked_list_delitem(delitem):
+
+    def __delitem__(self, index):
+        tracker, path = document_of(self)
+        jsonable = self.__jsonable__
+        if isinstance(index, slice):
+            splice = __begin_splice(jsonable, index)
+        else:
+            if index < 0:
+                index += len(jsonable)
+            splice = (index, jsonable[index:index + 1], len(jsonable))
+        delitem(self, index)
+        tracker.record(__end_splice(jsonable, path, splice))
+    return __delitem__
+
+
+def __begin_splice(jsonable, index):
+    length = len(jsonable)
+    start, stop, step = index.indices(length)
+    if step == 1:
+        stop = max(start, stop)
+        return (start, jsonable[start:stop], length)
+    # 확장 슬라이스는 통째로 기록한다.
+    return (0, list(jsonable), length)
+
+
+def __end_splice(jsonable, path, splice):
+    start, old_items, old_length = splice
+    new_length = len(jsonable) - old_length + len(old_items)
+    return SpliceChange(path, start, old_items, new_length)
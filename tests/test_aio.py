@@ -0,0 +1,111 @@
+# -*- coding: utf-8 -*-
+#
+#   jsonable-objects: JSON-able objects
+#   Copyright (C) 2015-2017 mete0r <mete0r@sarangbang.or.kr>
+#
+#   This program is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU Affero General Public License as published by
+#   the Free Software Foundation, either version 3 of the License, or
+#   (at your option) any later version.
+#
+#   This program is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#   GNU Affero General Public License for more details.
+#
+#   You should have received a copy of the GNU Affero General Public License
+#   along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+from __future__ import absolute_import
+from __future__ import print_function
+from __future__ import unicode_literals
+from concurrent.futures import ThreadPoolExecutor
+from unittest import TestCase
+import asyncio
+import threading
+
+from jsonable_objects.proxy import Field
+from jsonable_objects.proxy import proxy
+
+
+@proxy(dict)
+class Foo(object):
+    id = Field(type=int)
+
+
+def collect(aiterable):
+    async def main():
+        return [item async for item in aiterable]
+    return asyncio.run(main())
+
+
+class AsyncReadlineOnly(object):
+
+    def __init__(self, lines):
+        self.lines = list(lines)
+
+    async def readline(self):
+        if self.lines:
+            return self.lines.pop(0)
+        return b''
+
+
+class AIterNDJSONTest(TestCase):
+
+    def test_stream_reader(self):
+        async def main():
+            reader = asyncio.StreamReader()
+            reader.feed_data(b'{"id": 1}\n\n{"id"')
+            reader.feed_data(b': 2}\n{"id": 3}')
+            reader.feed_eof()
+            return [foo.id async for foo in Foo.aiter_ndjson(reader)]
+
+        self.assertEqual([1, 2, 3], asyncio.run(main()))
+
+    def test_long_line(self):
+        padding = b'x' * (100 * 1024)
+
+        async def main():
+            # readline() 의 기본 limit 는 64 KiB 이다.
+            reader = asyncio.StreamReader()
+            reader.feed_data(b'{"id": 1, "padding": "' + padding + b'"}\n')
+            reader.feed_data(b'{"id": 2}\n{"id": 3, "padding": "')
+            reader.feed_data(padding + b'"}')
+            reader.feed_eof()
+            return [foo.id async for foo in Foo.aiter_ndjson(reader)]
+
+        self.assertEqual([1, 2, 3], asyncio.run(main()))
+
+    def test_readline_only(self):
+        reader = AsyncReadlineOnly([b'{"id": 1}\n', b'{"id": 2}\n'])
+        self.assertEqual(
+            [Foo({'id': 1}), Foo({'id': 2})],
+            collect(Foo.aiter_ndjson(reader)),
+        )
+
+    def test_offload(self):
+        threads = []
+
+        def predicate(value):
+            threads.append(threading.current_thread())
+            return True
+
+        @proxy(dict)
+        class Foo(object):
+            id = Field(type=int, predicate=predicate)
+
+        reader = AsyncReadlineOnly([
+            b'{"id": 1}\n',
+            b'{"id": 2, "padding": "' + b'x' * 100 + b'"}\n',
+        ])
+        with ThreadPoolExecutor(1) as executor:
+            items = collect(Foo.aiter_ndjson(
+                reader, executor=executor, offload_size=64,
+            ))
+        self.assertEqual([1, 2], [foo.id for foo in items])
+        self.assertTrue(threads[0] is threading.main_thread())
+        self.assertTrue(threads[1] is not threading.main_thread())
+
+    def test_invalid(self):
+        reader = AsyncReadlineOnly([b'{"id": "x"}\n'])
+        self.assertRaises(ValueError, collect, Foo.aiter_ndjson(reader))
@@ -0,0 +1,156 @@
+# -*- coding: utf-8 -*-
+#
+#   jsonable-objects: JSON-able objects
+#   Copyright (C) 2015-2017 mete0r <mete0r@sarangbang.or.kr>
+#
+#   This program is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU Affero General Public License as published by
+#   the Free Software Foundation, either version 3 of the License, or
+#   (at your option) any later version.
+#
+#   This program is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#   GNU Affero General Public License for more details.
+#
+#   You should have received a copy of the GNU Affero General Public License
+#   along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+from __future__ import absolute_import
+from __future__ import print_function
+from __future__ import unicode_literals
+from copy import deepcopy
+from unittest import TestCase
+from unittest import skipIf
+
+from jsonable_objects.proxy import Field
+from jsonable_objects.proxy import proxy
+
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+
+@proxy(dict)
+class Sample(object):
+    id = Field(type=int)
+    value = Field(type=float)
+    weight = Field(type=float, optional=True)
+    valid = Field(type=bool)
+    label = Field(type=str, optional=True)
+
+
+@proxy(list, itemProxy=Sample)
+class Samples(object):
+    pass
+
+
+@proxy(list)
+class Point(object):
+    x = Field(type=float)
+    y = Field(type=float)
+    count = Field(type=int, optional=True)
+
+
+@proxy(list, itemProxy=Point)
+class Points(object):
+    pass
+
+
+SAMPLES = [
+    {'id': 1, 'value': 0.5, 'weight': 2.0, 'valid': True, 'label': 'a'},
+    {'id': 2, 'value': 1, 'valid': False},
+]
+
+
+@skipIf(numpy is None, 'numpy is not installed')
+class ToNumpyTest(TestCase):
+
+    def test_structured(self):
+        array = Samples(deepcopy(SAMPLES)).to_numpy()
+        self.assertEqual(('id', 'value', 'weight', 'valid', 'label'),
+                         array.dtype.names)
+        self.assertEqual(numpy.dtype('i8'), array.dtype['id'])
+        self.assertEqual(numpy.dtype('f8'), array.dtype['value'])
+        self.assertEqual(numpy.dtype('?'), array.dtype['valid'])
+        self.assertEqual(numpy.dtype('O'), array.dtype['label'])
+        self.assertEqual([1, 2], array['id'].tolist())
+        self.assertEqual([0.5, 1.0], array['value'].tolist())
+        self.assertEqual(2.0, array['weight'][0])
+        self.assertTrue(numpy.isnan(array['weight'][1]))
+        self.assertEqual(['a', None], array['label'].tolist())
+
+    def test_per_field(self):
+        arrays = Samples(deepcopy(SAMPLES)).to_numpy(
+            fields=['value', 'id'], structured=False,
+        )
+        self.assertEqual(['value', 'id'], list(arrays))
+        self.assertEqual([0.5, 1.0], arrays['value'].tolist())
+        self.assertEqual(numpy.dtype('i8'), arrays['id'].dtype)
+
+        arrays = Samples([]).to_numpy(fields=['id'], structured=False)
+        self.assertEqual(0, len(arrays['id']))
+
+        self.assertRaises(KeyError, Samples([]).to_numpy, fields=['x'])
+
+    def test_list_records(self):
+        points = Points([[0, 1.5, 3], [2, 3, None]])
+        array = points.to_numpy(fields=['x', 'y'])
+        self.assertEqual([(0.0, 1.5), (2.0, 3.0)], array.tolist())
+        self.assertRaises(TypeError, points.to_numpy)
+
+
+@skipIf(numpy is None, 'numpy is not installed')
+class FromNumpyTest(TestCase):
+
+    def test_roundtrip(self):
+        samples = Samples(deepcopy(SAMPLES))
+        records = Sample.from_numpy(samples.to_numpy())
+        self.assertEqual(list(samples), records)
+        self.assertEqual(
+            [{'id': 1, 'value': 0.5, 'weight': 2.0, 'valid': True,
+              'label': 'a'},
+             {'id': 2, 'value': 1.0, 'valid': False}],
+            [record.__jsonable__ for record in records],
+        )
+        self.assertTrue(type(records[0].id) is int)
+
+        points = Points([[0, 1.5, 3], [2, 3, None]])
+        records = Point.from_numpy(points.to_numpy(fields=['x', 'y']))
+        self.assertEqual([[0.0, 1.5, None], [2.0, 3.0, None]],
+                         [record.__jsonable__ for record in records])
+
+    def test_mapping(self):
+        records = Point.from_numpy({
+            'x': numpy.array([1.0, 2.0]),
+            'y': numpy.array([3.0, 4.0]),
+            'count': numpy.array([5, 6]),
+        })
+        self.assertEqual([[1.0, 3.0, 5], [2.0, 4.0, 6]],
+                         [record.__jsonable__ for record in records])
+
+    def test_validated(self):
+        self.assertRaises(KeyError, Sample.from_numpy,
+                          {'id': numpy.array([1])})
+
+
+@skipIf(numpy is None, 'numpy is not installed')
+class ItemBatchPredicateTest(TestCase):
+
+    def test_numpy_mask(self):
+        from jsonable_objects.proxy import proxy
+
+        def in_range(values):
+            values = numpy.asarray(values, dtype='f8')
+            return (values >= -40) & (values <= 85)
+
+        @proxy(list, itemBatchPredicate=in_range)
+        class Temperatures(object):
+            pass
+
+        Temperatures(list(numpy.linspace(-40, 85, 1000).tolist()))
+        with self.assertRaises(ValueError) as context:
+            Temperatures([20.0, 21.5, 90.0, 22.0])
+        self.assertEqual((90.0,), context.exception.args)
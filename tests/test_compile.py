@@ -0,0 +1,294 @@
+# -*- coding: utf-8 -*-
+#
+#   jsonable-objects: JSON-able objects
+#   Copyright (C) 2015-2017 mete0r <mete0r@sarangbang.or.kr>
+#
+#   This program is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU Affero General Public License as published by
+#   the Free Software Foundation, either version 3 of the License, or
+#   (at your option) any later version.
+#
+#   This program is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#   GNU Affero General Public License for more details.
+#
+#   You should have received a copy of the GNU Affero General Public License
+#   along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+from __future__ import absolute_import
+from __future__ import print_function
+from __future__ import unicode_literals
+from unittest import TestCase
+import io
+import os.path
+import shutil
+import sys
+import tempfile
+
+
+SCHEMAS = '''
+from jsonable_objects.proxy import Field
+from jsonable_objects.proxy import proxy
+
+
+class Upper(object):
+
+    def parse(self, value):
+        return value.upper()
+
+    def format(self, value):
+        if not isinstance(value, str):
+            raise TypeError()
+        return value.lower()
+
+
+class Named(object):
+
+    def parse(self, value):
+        return value['name']
+
+    def format(self, value):
+        return {'name': value.lower()}
+
+
+@proxy(dict)
+class Author(object):
+    name = Field(type=str, predicate=lambda name: len(name) > 0)
+    email = Field(optional=True, format=Upper())
+
+
+@proxy(list)
+class Point(object):
+    x = Field(type=float)
+    y = Field(type=float, optional=True)
+
+
+@proxy(dict)
+class Book(object):
+    title = Field('Title', type=str)
+    author = Field(proxy=Author, optional=True, format=Named())
+    point = Field(proxy=Point)
+    year = Field(type=int, optional=True, predicate=lambda year: year > 0)
+    tags = Field(type=list, optional=True)
+
+
+@proxy(list, itemProxy=Book)
+class Books(object):
+    pass
+
+
+@proxy(dict, tracked=True)
+class Tracked(object):
+    name = Field(type=str)
+'''
+
+
+class CompileTest(TestCase):
+
+    def setUp(self):
+        self.path = tempfile.mkdtemp()
+        sys.path.insert(0, self.path)
+        self.packages = []
+
+    def tearDown(self):
+        sys.path.remove(self.path)
+        shutil.rmtree(self.path)
+        for name in list(sys.modules):
+            if name.split('.')[0] in self.packages:
+                del sys.modules[name]
+
+    def makePackage(self, source=SCHEMAS):
+        # 컴파일된 모듈은 모듈 이름마다 한 번만 찾으므로, 매번 새 패키지
+        package = 'aot_{}_{}'.format(id(self), len(self.packages))
+        self.packages.append(package)
+        os.mkdir(os.path.join(self.path, package))
+        self.write(package, '__init__.py', '')
+        self.write(package, 'schemas.py', source)
+        return package
+
+    def write(self, package, filename, source):
+        path = os.path.join(self.path, package, filename)
+        with io.open(path, 'w', encoding='utf-8') as fp:
+            fp.write(source)
+
+    def compile(self, package):
+        from importlib import invalidate_caches
+        from jsonable_objects.compile import main
+
+        self.assertEqual(0, main([package + '.schemas']))
+        invalidate_caches()
+        # 컴파일할 때 불러들인 모듈은 버리고 새로 불러들인다.
+        for name in list(sys.modules):
+            if name.split('.')[0] == package:
+                del sys.modules[name]
+
+    def test_compiled(self):
+        from importlib import import_module
+
+        package = self.makePackage()
+        self.compile(package)
+        schemas = import_module(package + '.schemas')
+
+        compiled = package + '._compiled_schemas'
+        self.assertIn(compiled, sys.modules)
+        for cls in (schemas.Author, schemas.Point, schemas.Book,
+                    schemas.Books):
+            self.assertIsNotNone(cls.__jsonable_proxy__.field_factory)
+        self.assertIsNone(schemas.Tracked.__jsonable_proxy__.field_factory)
+        self.assertEqual(compiled, schemas.Book.__eq__.__module__)
+        # 컴파일된 모듈은 컴파일러(argparse 등)를 불러들이지 않는다.
+        with io.open(os.path.join(self.path, package, '_compiled_schemas.py'),
+                     encoding='utf-8') as fp:
+            self.assertNotIn('from jsonable_objects.compile', fp.read())
+
+        book = schemas.Book({
+            'Title': 'Title',
+            'author': {'name': 'name', 'email': 'a@example.com'},
+            'point': [1, None],
+        })
+        title = schemas.Book.__jsonable_proxy__.field_list[0]
+        self.assertEqual(compiled, title.dops.get.__module__)
+        self.assertEqual('A@EXAMPLE.COM', book.author.email)
+        self.assertEqual(1.0, book.point.x)
+        self.assertEqual(None, book.year)
+        book.year = 2017
+        self.assertEqual(2017, book.__jsonable__['year'])
+        del book.year
+        self.assertNotIn('year', book.__jsonable__)
+        self.assertRaises(ValueError, setattr, book, 'year', 0)
+        self.assertRaises(TypeError, setattr, book, 'title', None)
+        book.author = 'NAME'
+        self.assertEqual({'name': 'name'}, book.__jsonable__['author'])
+        self.assertRaises(TypeError, setattr, book, 'author', 1)
+        self.assertRaises(ValueError, schemas.Author, {'name': ''})
+        self.assertRaises(TypeError, schemas.Point, [None])
+        self.assertEqual(
+            "Point[x=1.0, y=None]", repr(schemas.Point([1, None])),
+        )
+        self.assertEqual(schemas.Point([1, 2]), schemas.Point([1.0, 2.0]))
+        self.assertNotEqual(schemas.Point([1, 2]), schemas.Point([1, 3]))
+
+    def test_package_init(self):
+        from importlib import import_module
+        from importlib import invalidate_caches
+        from jsonable_objects.compile import default_output
+        from jsonable_objects.compile import main
+
+        package = self.makePackage()
+        self.write(package, '__init__.py', SCHEMAS)
+        self.assertEqual(os.path.join(self.path, package, '_compiled.py'),
+                         default_output(package))
+        self.assertEqual(0, main([package]))
+        invalidate_caches()
+        del sys.modules[package]
+
+        schemas = import_module(package)
+        self.assertIn(package + '._compiled', sys.modules)
+        self.assertIsNotNone(schemas.Book.__jsonable_proxy__.field_factory)
+        self.assertEqual(package + '._compiled',
+                         schemas.Book.__eq__.__module__)
+
+    def test_equivalent(self):
+        from importlib import import_module
+        from jsonable_objects.proxy import with_descriptors
+
+        package = self.makePackage()
+        self.compile(package)
+        schemas = import_module(package + '.schemas')
+
+        values = [None, 0, -1, 1, 1.5, '', 'a', 'A', [], [1], {}, {'x': 1},
+                  {'name': 'a'}, [1, 2], True]
+
+        def outcome(f, *args):
+            try:
+                return 'returned', f(*args)
+            except Exception as e:
+                return 'raised', type(e), e.args
+
+        def check(field_a, field_b, jsonable):
+            for ops in ('dops', 'uops'):
+                a = getattr(field_a, ops)
+                b = getattr(field_b, ops)
+                for value in values:
+                    jsonable[field_a.key] = value
+                    self.assertEqual(outcome(a.get, jsonable),
+                                     outcome(b.get, jsonable))
+                    copy_a = dict(jsonable)
+                    copy_b = dict(jsonable)
+                    self.assertEqual(outcome(a.set, copy_a, value),
+                                     outcome(b.set, copy_b, value))
+                    self.assertEqual(copy_a, copy_b)
+                self.assertEqual(a.delete is None, b.delete is None)
+                if a.delete is not None:
+                    copy_a = dict(jsonable)
+                    copy_b = dict(jsonable)
+                    a.delete(copy_a)
+                    b.delete(copy_b)
+                    self.assertEqual(copy_a, copy_b)
+
+        for cls in (schemas.Author, schemas.Book):
+            metadata = cls.__jsonable_proxy__
+            for field in metadata.field_list:
+                runtime = with_descriptors(metadata, field)
+                check(runtime, field, {})
+
+        metadata = schemas.Point.__jsonable_proxy__
+        for field in metadata.field_list:
+            runtime = with_descriptors(metadata, field)
+            for value in values:
+                for ops in ('dops', 'uops'):
+                    a = getattr(runtime, ops)
+                    b = getattr(field, ops)
+                    jsonable = [1.0, 2.0]
+                    jsonable[field.local_index] = value
+                    self.assertEqual(outcome(a.get, jsonable),
+                                     outcome(b.get, jsonable))
+                    copy_a = list(jsonable)
+                    copy_b = list(jsonable)
+                    self.assertEqual(outcome(a.set, copy_a, value),
+                                     outcome(b.set, copy_b, value))
+                    self.assertEqual(copy_a, copy_b)
+
+    def test_stale(self):
+        from importlib import import_module
+
+        package = self.makePackage()
+        self.compile(package)
+        # 컴파일한 뒤 스키마를 고쳤다.
+        self.write(package, 'schemas.py', SCHEMAS.replace(
+            "year = Field(type=int, optional=True,",
+            "year = Field(type=int,",
+        ))
+        schemas = import_module(package + '.schemas')
+
+        self.assertIsNone(schemas.Book.__jsonable_proxy__.field_factory)
+        self.assertIsNotNone(schemas.Author.__jsonable_proxy__.field_factory)
+        self.assertRaises(KeyError, schemas.Book, {
+            'Title': 'Title',
+            'point': [1, None],
+        })
+
+    def test_other_version(self):
+        from importlib import import_module
+
+        package = self.makePackage()
+        self.compile(package)
+        path = os.path.join(self.path, package, '_compiled_schemas.py')
+        with io.open(path, encoding='utf-8') as fp:
+            source = fp.read()
+        self.write(package, '_compiled_schemas.py', source.replace(
+            'VERSION = ', 'VERSION = "0.0" or ',
+        ))
+        schemas = import_module(package + '.schemas')
+        self.assertIsNone(schemas.Book.__jsonable_proxy__.field_factory)
+
+    def test_generate(self):
+        from jsonable_objects.compile import generate
+
+        package = self.makePackage()
+        source = generate(package + '.schemas')
+        self.assertIn('def fields_Book(metadata):', source)
+        self.assertIn('def field_dict_required_coerced(spec):', source)
+        self.assertNotIn('Tracked', source)
+        compile(source, '_compiled_schemas.py', 'exec')
@@ -0,0 +1,138 @@
+# -*- coding: utf-8 -*-
+#
+#   jsonable-objects: JSON-able objects
+#   Copyright (C) 2015-2017 mete0r <mete0r@sarangbang.or.kr>
+#
+#   This program is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU Affero General Public License as published by
+#   the Free Software Foundation, either version 3 of the License, or
+#   (at your option) any later version.
+#
+#   This program is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#   GNU Affero General Public License for more details.
+#
+#   You should have received a copy of the GNU Affero General Public License
+#   along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+from __future__ import absolute_import
+from __future__ import print_function
+from __future__ import unicode_literals
+from unittest import TestCase
+import copy
+
+from jsonable_objects.proxy import Field
+from jsonable_objects.proxy import proxy
+
+
+@proxy(list)
+class Point(object):
+    x = Field(type=int)
+    y = Field(type=int)
+    label = Field(type=str, optional=True)
+
+
+@proxy(list, itemProxy=Point)
+class Points(object):
+    pass
+
+
+@proxy(dict)
+class Meta(object):
+    owner = Field(type=str)
+    tags = Field(type=list, optional=True)
+
+
+@proxy(dict, itemProxy=Meta)
+class MetaMap(object):
+    pass
+
+
+@proxy(dict)
+class Shape(object):
+    name = Field(key='Name', type=str)
+    points = Field(proxy=Points)
+    meta = Field(proxy=Meta, optional=True)
+    by_user = Field(proxy=MetaMap, optional=True)
+
+
+JSONABLE = {
+    'Name': 'shape',
+    'points': [[0, 0, None], [1, 2, 'b'], [3, 4, None]],
+    'meta': {'owner': 'me', 'tags': ['a']},
+    'by_user': {
+        'u1': {'owner': 'u1'},
+        'u2': {'owner': 'u2'},
+    },
+    'undeclared': 1,
+}
+
+
+class DiffTest(TestCase):
+
+    def test_identical(self):
+        a = copy.deepcopy(JSONABLE)
+        self.assertEqual([], Shape.diff(a, a))
+        self.assertEqual([], Shape.diff(Shape(a), Shape(copy.deepcopy(a))))
+
+    def test_fields(self):
+        a = copy.deepcopy(JSONABLE)
+        b = copy.deepcopy(a)
+        b['Name'] = 'other'
+        b['meta']['tags'].append('b')
+        del b['meta']['owner']
+        b['undeclared'] = 2
+        self.assertEqual(['/Name', '/meta/owner', '/meta/tags'],
+                         Shape.diff(a, b))
+
+        del b['meta']
+        self.assertEqual(['/Name', '/meta'], Shape.diff(Shape(a), b))
+        self.assertEqual(['/Name', '/meta'], Shape.diff(b, a))
+
+    def test_positional_records(self):
+        a = copy.deepcopy(JSONABLE)
+        b = copy.deepcopy(a)
+        b['points'][1][2] = 'c'
+        b['points'][2][0] = 5
+        b['points'].append([6, 7, None])
+        self.assertEqual(
+            ['/points/1/2', '/points/2/0', '/points/3'],
+            Shape.diff(a, b),
+        )
+
+        b = copy.deepcopy(a)
+        del b['points'][1][2]
+        self.assertEqual(['/points/1/2'], Shape.diff(a, b))
+
+    def test_container_keys(self):
+        a = copy.deepcopy(JSONABLE)
+        b = copy.deepcopy(a)
+        del b['by_user']['u1']
+        b['by_user']['u2']['owner'] = 'x'
+        b['by_user']['u~3'] = {'owner': 'u3'}
+        self.assertEqual(
+            ['/by_user/u1', '/by_user/u2/owner', '/by_user/u~03'],
+            Shape.diff(a, b),
+        )
+
+    def test_identity_skip(self):
+        class Exploding(list):
+            def __eq__(self, other):
+                raise AssertionError()
+            __ne__ = __eq__
+
+        a = copy.deepcopy(JSONABLE)
+        b = dict(a)
+        a['meta'] = {'owner': 'me', 'tags': Exploding()}
+        b['meta'] = a['meta']
+        b['Name'] = 'other'
+        self.assertEqual(['/Name'], Shape.diff(a, b))
+
+    def test_type_changed(self):
+        from jsonable_objects.diff import diff
+
+        a = copy.deepcopy(JSONABLE)
+        b = copy.deepcopy(a)
+        b['points'] = {}
+        self.assertEqual(['/points'], diff(Shape, a, b))
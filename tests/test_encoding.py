@@ -0,0 +1,197 @@
+# -*- coding: utf-8 -*-
+#
+#   jsonable-objects: JSON-able objects
+#   Copyright (C) 2015-2017 mete0r <mete0r@sarangbang.or.kr>
+#
+#   This program is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU Affero General Public License as published by
+#   the Free Software Foundation, either version 3 of the License, or
+#   (at your option) any later version.
+#
+#   This program is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#   GNU Affero General Public License for more details.
+#
+#   You should have received a copy of the GNU Affero General Public License
+#   along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+from __future__ import absolute_import
+from __future__ import print_function
+from __future__ import unicode_literals
+from copy import deepcopy
+from unittest import TestCase
+import json
+
+from jsonable_objects.proxy import Field
+from jsonable_objects.proxy import proxy
+
+
+@proxy(dict, tracked=True)
+class Note(object):
+    text = Field(type=str)
+
+
+@proxy(list, tracked=True)
+class Item(object):
+    name = Field(type=str)
+    note = Field(proxy=Note, optional=True)
+
+
+@proxy(list, itemProxy=Item, tracked=True)
+class Items(object):
+    pass
+
+
+@proxy(dict, tracked=True)
+class Document(object):
+    title = Field(type=str)
+    items = Field(proxy=Items)
+    header = Field(proxy=Item, optional=True)
+
+
+# 같은 구조에서 Note 만 추적되지 않는다.
+
+
+@proxy(dict)
+class PlainNote(object):
+    text = Field(type=str)
+
+
+@proxy(list, tracked=True)
+class PlainNoteItem(object):
+    name = Field(type=str)
+    note = Field(proxy=PlainNote, optional=True)
+
+
+@proxy(list, itemProxy=PlainNoteItem, tracked=True)
+class PlainNoteItems(object):
+    pass
+
+
+@proxy(dict, tracked=True)
+class PlainNoteDocument(object):
+    title = Field(type=str)
+    items = Field(proxy=PlainNoteItems)
+    header = Field(proxy=PlainNoteItem, optional=True)
+
+
+JSONABLE = {
+    'title': 'doc',
+    'items': [
+        ['a', {'text': 'x'}],
+        ['b', None],
+    ],
+    'header': ['h', {'text': 'ü'}],
+    'extra': {'k': [1, 2.5, None, True]},
+}
+
+
+def compact(jsonable):
+    return json.dumps(jsonable, separators=(',', ':'))
+
+
+class DumpsTest(TestCase):
+
+    def test_without_cache(self):
+        from jsonable_objects.encoding import dumps
+
+        jsonable = deepcopy(JSONABLE)
+        document = PlainNoteDocument(jsonable)
+        self.assertEqual(compact(jsonable), dumps(document))
+        self.assertEqual(compact(jsonable['items']), dumps(document.items))
+
+    def test_cache_requires_tracked(self):
+        from jsonable_objects.encoding import dumps
+
+        note = PlainNote({'text': 'x'})
+        self.assertRaises(TypeError, dumps, note, cache=True)
+
+    def test_cache(self):
+        from jsonable_objects.encoding import dumps
+        from jsonable_objects.tracking import document_of
+
+        jsonable = deepcopy(JSONABLE)
+        doc = Document(jsonable)
+
+        self.assertEqual(compact(jsonable), dumps(doc, cache=True))
+        texts = document_of(doc)[0].cache('encoding')
+        self.assertEqual(
+            set([(), ('items',), ('items', 0), ('items', 0, 1),
+                 ('items', 1), ('header',), ('header', 1)]),
+            set(texts),
+        )
+        self.assertEqual(compact(jsonable), dumps(doc, cache=True))
+
+        header_text = texts[('header',)][1]
+        doc.items[0].note.text = 'y'
+        self.assertEqual(
+            set([('items', 1), ('header',), ('header', 1)]),
+            set(texts),
+        )
+        self.assertEqual(compact(jsonable), dumps(doc, cache=True))
+        self.assertTrue(header_text is texts[('header',)][1])
+        self.assertTrue('"y"' in texts[()][1])
+
+        # 자식에서 부른 경우에는 문서 안에서의 경로로 캐시한다.
+        self.assertTrue(texts[('items',)][1] is dumps(doc.items, cache=True))
+
+    def test_cache_replaced_subtree(self):
+        from jsonable_objects.encoding import dumps
+
+        jsonable = deepcopy(JSONABLE)
+        doc = Document(jsonable)
+        dumps(doc, cache=True)
+
+        items = doc.items
+        items[0:2] = [items[1], items[0]]
+        self.assertEqual(compact(jsonable), dumps(doc, cache=True))
+        del items[0]
+        self.assertEqual(compact(jsonable), dumps(doc, cache=True))
+        doc.header = None
+        self.assertEqual(compact(jsonable), dumps(doc, cache=True))
+
+    def test_cache_moved_items(self):
+        from jsonable_objects.encoding import dumps
+
+        jsonable = deepcopy(JSONABLE)
+        doc = Document(jsonable)
+        items = doc.items
+        dumps(items, cache=True)
+
+        # 옮겨진 항목을 고친 뒤 제자리로 돌려놓는다.
+        items[0:0] = [Item(['c', None])]
+        items[1].name = 'd'
+        del items[0]
+        self.assertEqual(compact(jsonable), dumps(doc, cache=True))
+        self.assertEqual(compact(jsonable['items']),
+                         dumps(items, cache=True))
+
+    def test_cache_rollback(self):
+        from jsonable_objects.encoding import dumps
+
+        jsonable = deepcopy(JSONABLE)
+        doc = Document(jsonable)
+        encoded = dumps(doc, cache=True)
+        try:
+            with doc.transaction():
+                doc.header.name = 'i'
+                self.assertTrue('"i"' in dumps(doc, cache=True))
+                raise ValueError()
+        except ValueError:
+            pass
+        self.assertEqual(encoded, dumps(doc, cache=True))
+
+    def test_untracked_nested(self):
+        from jsonable_objects.encoding import dumps
+        from jsonable_objects.tracking import document_of
+
+        jsonable = deepcopy(JSONABLE)
+        doc = PlainNoteDocument(jsonable)
+        self.assertEqual(compact(jsonable), dumps(doc, cache=True))
+        texts = document_of(doc)[0].cache('encoding')
+        # Note 가 추적되지 않으므로 그것을 담을 수 있는 것들은 캐시되지 않는다.
+        self.assertEqual(set(), set(texts))
+
+        doc.items[0].note.text = 'y'
+        self.assertEqual(compact(jsonable), dumps(doc, cache=True))
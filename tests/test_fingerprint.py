@@ -0,0 +1,174 @@
+# -*- coding: utf-8 -*-
+#
+#   jsonable-objects: JSON-able objects
+#   Copyright (C) 2015-2017 mete0r <mete0r@sarangbang.or.kr>
+#
+#   This program is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU Affero General Public License as published by
+#   the Free Software Foundation, either version 3 of the License, or
+#   (at your option) any later version.
+#
+#   This program is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#   GNU Affero General Public License for more details.
+#
+#   You should have received a copy of the GNU Affero General Public License
+#   along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+from __future__ import absolute_import
+from __future__ import print_function
+from __future__ import unicode_literals
+from copy import deepcopy
+from unittest import TestCase
+import hashlib
+
+from jsonable_objects.proxy import Field
+from jsonable_objects.proxy import proxy
+
+
+@proxy(dict)
+class Note(object):
+    text = Field(type=str)
+
+
+@proxy(list)
+class Item(object):
+    name = Field(type=str)
+    note = Field(proxy=Note, optional=True)
+
+
+@proxy(list, itemProxy=Item)
+class Items(object):
+    pass
+
+
+@proxy(dict)
+class Document(object):
+    title = Field(type=str)
+    items = Field(proxy=Items)
+
+
+@proxy(dict, tracked=True)
+class TrackedNote(object):
+    text = Field(type=str)
+
+
+@proxy(list, tracked=True)
+class TrackedItem(object):
+    name = Field(type=str)
+    note = Field(proxy=TrackedNote, optional=True)
+
+
+@proxy(list, itemProxy=TrackedItem, tracked=True)
+class TrackedItems(object):
+    pass
+
+
+@proxy(dict, tracked=True)
+class TrackedDocument(object):
+    title = Field(type=str)
+    items = Field(proxy=TrackedItems)
+
+
+JSONABLE = {
+    'title': 'doc',
+    'items': [
+        ['a', {'text': 'x'}],
+        ['b', None],
+    ],
+    'extra': {'k': [1, 2.5, None, True], 'ü': 'ü'},
+}
+
+
+class CountingHashlib(object):
+
+    def __init__(self):
+        self.texts = []
+
+    def new(self, algorithm, text):
+        self.texts.append(text)
+        return hashlib.new(algorithm, text)
+
+
+class FingerprintTest(TestCase):
+
+    def setUp(self):
+        import jsonable_objects.fingerprint as module
+        self.module = module
+        self.hashlib = module.hashlib
+        module.hashlib = CountingHashlib()
+
+    def tearDown(self):
+        self.module.hashlib = self.hashlib
+
+    def test_stable(self):
+        a = deepcopy(JSONABLE)
+        b = deepcopy(JSONABLE)
+        b['extra'] = {'ü': 'ü', 'k': [1, 2.5, None, True]}
+        self.assertEqual(Document(a).fingerprint(),
+                         Document(b).fingerprint())
+
+        b['items'][1][0] = 'c'
+        self.assertNotEqual(Document(a).fingerprint(),
+                            Document(b).fingerprint())
+
+        note = Note({'text': 'x'})
+        self.assertEqual(
+            hashlib.new(self.module.DEFAULT_ALGORITHM,
+                        b'{"text":"x"}').hexdigest(),
+            note.fingerprint(),
+        )
+        self.assertEqual(hashlib.sha256(b'{"text":"x"}').hexdigest(),
+                         note.fingerprint('sha256'))
+
+        # 중첩된 proxy 는 그 다이제스트로 대신한다.
+        item = Item(['a', {'text': 'x'}])
+        digest = hashlib.new(self.module.DEFAULT_ALGORITHM,
+                             b'{"text":"x"}').digest()
+        self.assertEqual(
+            hashlib.new(self.module.DEFAULT_ALGORITHM,
+                        b'["a",\x00' + digest + b']').hexdigest(),
+            item.fingerprint(),
+        )
+
+    def test_tracked_is_same_as_untracked(self):
+        self.assertEqual(TrackedDocument(JSONABLE).fingerprint(),
+                         Document(JSONABLE).fingerprint())
+
+    def test_memoized(self):
+        doc = TrackedDocument(deepcopy(JSONABLE))
+        texts = self.module.hashlib.texts
+
+        fingerprint = doc.fingerprint()
+        # Document, Items, Item * 2, Note
+        self.assertEqual(5, len(texts))
+        self.assertEqual(fingerprint, doc.fingerprint())
+        self.assertEqual(5, len(texts))
+
+        doc.items[0].note.text = 'y'
+        del texts[:]
+        changed = doc.fingerprint()
+        self.assertNotEqual(fingerprint, changed)
+        # items[1] 은 다시 계산하지 않는다.
+        self.assertEqual(4, len(texts))
+
+        del texts[:]
+        self.assertEqual(doc.items[1].fingerprint(),
+                         TrackedItem(['b', None]).fingerprint())
+        self.assertEqual(0 + 1, len(texts))
+
+        doc.items[0].note.text = 'x'
+        self.assertEqual(fingerprint, doc.fingerprint())
+
+    def test_memoized_moved_items(self):
+        doc = TrackedDocument(deepcopy(JSONABLE))
+        items = doc.items
+        doc.fingerprint()
+
+        # 옮겨진 항목을 고친 뒤 제자리로 돌려놓는다.
+        items[0:0] = [TrackedItem(['c', None])]
+        items[1].name = 'd'
+        del items[0]
+        self.assertEqual(TrackedDocument(deepcopy(doc.__jsonable__))
+                         .fingerprint(), doc.fingerprint())
@@ -0,0 +1,186 @@
+# -*- coding: utf-8 -*-
+#
+#   jsonable-objects: JSON-able objects
+#   Copyright (C) 2015-2017 mete0r <mete0r@sarangbang.or.kr>
+#
+#   This program is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU Affero General Public License as published by
+#   the Free Software Foundation, either version 3 of the License, or
+#   (at your option) any later version.
+#
+#   This program is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#   GNU Affero General Public License for more details.
+#
+#   You should have received a copy of the GNU Affero General Public License
+#   along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+from __future__ import absolute_import
+from __future__ import print_function
+from __future__ import unicode_literals
+from unittest import TestCase
+
+from jsonable_objects.proxy import Field
+from jsonable_objects.proxy import proxy
+
+
+@proxy(dict, frozen=True)
+class Point(object):
+    x = Field(type=int)
+    y = Field(type=int, optional=True)
+
+
+@proxy(list, itemProxy=Point, frozen=True)
+class Path(object):
+    pass
+
+
+@proxy(dict, as_container=True, frozen=True)
+class Labels(object):
+    pass
+
+
+@proxy(dict, frozen=True)
+class Shape(object):
+    name = Field(type=str)
+    path = Field(proxy=Path)
+    labels = Field(proxy=Labels, optional=True)
+
+
+class FrozenTest(TestCase):
+
+    def test_read_only(self):
+        jsonable = {'x': 1, 'y': 2}
+        point = Point(jsonable)
+        self.assertEqual(1, point.x)
+        with self.assertRaises(TypeError):
+            point.x = 3
+        with self.assertRaises(TypeError):
+            del point.y
+        self.assertEqual({'x': 1, 'y': 2}, jsonable)
+
+        path = Path([{'x': 1}, {'x': 2}])
+        self.assertEqual(Point({'x': 2}), path[1])
+        self.assertRaises(TypeError, path.__setitem__, 0, Point({'x': 3}))
+        self.assertRaises(TypeError, path.__delitem__, 0)
+
+        labels = Labels({'a': 'b'})
+        self.assertRaises(TypeError, labels.__setitem__, 'a', 'c')
+        self.assertRaises(TypeError, labels.__delitem__, 'a')
+
+        shape = Shape({'name': 's', 'path': []})
+        self.assertRaises(TypeError, shape.merge_patch, {'name': 't'})
+
+    def test_hash(self):
+        a = Point({'x': 1, 'y': 2, 'undeclared': 3})
+        b = Point({'x': 1, 'y': 2})
+        c = Point({'x': 1})
+        d = Point({'x': 1, 'y': None})
+        self.assertEqual(a, b)
+        self.assertEqual(hash(a), hash(b))
+        self.assertEqual(c, d)
+        self.assertEqual(hash(c), hash(d))
+        self.assertNotEqual(a, c)
+        self.assertEqual(2, len(set([a, b, c, d])))
+
+        shapes = [
+            Shape({'name': 's', 'path': [{'x': 1}, {'x': 2}],
+                   'labels': {'a': 'b', 'c': 'd'}}),
+            Shape({'name': 's', 'path': [{'x': 1}, {'x': 2, 'z': 0}],
+                   'labels': {'c': 'd', 'a': 'b'}}),
+            Shape({'name': 's', 'path': [{'x': 2}, {'x': 1}]}),
+        ]
+        self.assertEqual(shapes[0], shapes[1])
+        self.assertNotEqual(shapes[0], shapes[2])
+        self.assertEqual({shapes[0]: 1, shapes[2]: 3},
+                         dict((shape, i) for i, shape in enumerate(shapes, 1)
+                              if i != 2))
+        self.assertTrue(shapes[1] in set(shapes[:1]))
+
+    def test_nested_read_only(self):
+        jsonable = {'name': 's', 'path': [{'x': 1}], 'labels': {'a': 'b'}}
+        shape = Shape(jsonable)
+        with self.assertRaises(TypeError):
+            shape.path[0].x = 2
+        self.assertRaises(TypeError, shape.path.__setitem__, 0,
+                          Point({'x': 2}))
+        self.assertRaises(TypeError, shape.labels.__delitem__, 'a')
+        self.assertEqual({'name': 's', 'path': [{'x': 1}],
+                          'labels': {'a': 'b'}}, jsonable)
+
+    def test_nested_not_frozen(self):
+        from jsonable_objects.proxy import proxy
+        from jsonable_objects.proxy import Field
+
+        @proxy(dict)
+        class Point(object):
+            x = Field(type=int)
+
+        with self.assertRaises(TypeError):
+            @proxy(dict, frozen=True)
+            class Shape(object):
+                origin = Field(proxy=Point)
+
+        with self.assertRaises(TypeError):
+            @proxy(list, itemProxy=Point, frozen=True)
+            class Points(object):
+                pass
+
+    def test_hash_follows_format(self):
+        from jsonable_objects.proxy import proxy
+        from jsonable_objects.proxy import Field
+
+        class LowerFormat(object):
+
+            def format(self, value):
+                return value
+
+            def parse(self, value):
+                return value.lower()
+
+        @proxy(dict, frozen=True)
+        class Tag(object):
+            name = Field(type=str, format=LowerFormat())
+
+        @proxy(list, itemFormat=LowerFormat(), frozen=True)
+        class Tags(object):
+            pass
+
+        @proxy(dict, itemFormat=LowerFormat(), frozen=True)
+        class Labels(object):
+            pass
+
+        pairs = [
+            (Tag({'name': 'A'}), Tag({'name': 'a'})),
+            (Tags(['A', 'b']), Tags(['a', 'B'])),
+            (Labels({'x': 'A'}), Labels({'x': 'a'})),
+        ]
+        for a, b in pairs:
+            self.assertEqual(a, b)
+            self.assertEqual(hash(a), hash(b))
+            self.assertEqual(1, len(set([a, b])))
+
+    def test_hash_is_cached(self):
+        jsonable = {'x': 1}
+        point = Point(jsonable)
+        value = hash(point)
+        jsonable['x'] = 2
+        self.assertEqual(value, hash(point))
+
+    def test_not_with_tracked(self):
+        from jsonable_objects.proxy import proxy
+
+        self.assertRaises(TypeError, proxy, dict, tracked=True, frozen=True)
+
+    def test_not_frozen_by_default(self):
+        from jsonable_objects.proxy import proxy
+        from jsonable_objects.proxy import Field
+
+        @proxy(dict)
+        class Point(object):
+            x = Field(type=int)
+
+        point = Point({'x': 1})
+        point.x = 2
+        self.assertEqual(2, point.x)
@@ -0,0 +1,113 @@
+# -*- coding: utf-8 -*-
+#
+#   jsonable-objects: JSON-able objects
+#   Copyright (C) 2015-2017 mete0r <mete0r@sarangbang.or.kr>
+#
+#   This program is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU Affero General Public License as published by
+#   the Free Software Foundation, either version 3 of the License, or
+#   (at your option) any later version.
+#
+#   This program is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#   GNU Affero General Public License for more details.
+#
+#   You should have received a copy of the GNU Affero General Public License
+#   along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+from __future__ import absolute_import
+from __future__ import print_function
+from __future__ import unicode_literals
+from unittest import TestCase
+
+from jsonable_objects.proxy import Field
+from jsonable_objects.proxy import proxy
+
+
+@proxy(dict)
+class Item(object):
+    name = Field(type=str)
+
+
+@proxy(list, itemProxy=Item)
+class Items(object):
+    pass
+
+
+@proxy(dict)
+class Document(object):
+    items = Field(proxy=Items)
+
+
+def createJsonable(n):
+    return {'items': [{'name': 'item{}'.format(i)} for i in range(n)]}
+
+
+class HooksTest(TestCase):
+
+    def tearDown(self):
+        from jsonable_objects import hooks
+        from jsonable_objects.proxy import ProxyClassMetadata
+
+        for hook in list(hooks.validate_hooks()):
+            hooks.remove_validate_hook(hook)
+        self.assertEqual('validate', ProxyClassMetadata.validate.__name__)
+
+    def test_on_validate(self):
+        from jsonable_objects import hooks
+
+        events = []
+        hooks.on_validate(events.append)
+
+        jsonable = createJsonable(3)
+        Document(jsonable)
+        self.assertEqual(1, len(events))
+        event = events[0]
+        self.assertTrue(event.proxy_class is Document)
+        self.assertTrue(event.jsonable is jsonable)
+        self.assertTrue(event.seconds >= 0)
+        self.assertEqual(None, event.error)
+        # {} + [] + 3 * ({} + 'item')
+        self.assertEqual(2 + 3 * 2, event.size)
+
+        self.assertRaises(KeyError, Items, [{}])
+        self.assertEqual(2, len(events))
+        self.assertTrue(events[1].proxy_class is Items)
+        self.assertTrue(isinstance(events[1].error, KeyError))
+
+        hooks.remove_validate_hook(events.append)
+        Document(jsonable)
+        self.assertEqual(2, len(events))
+
+    def test_sampling(self):
+        from jsonable_objects import hooks
+
+        never = []
+        always = []
+        hooks.on_validate(never.append, sample_rate=0)
+        hooks.on_validate(always.append)
+        for i in range(10):
+            Item({'name': 'x'})
+        self.assertEqual([], never)
+        self.assertEqual(10, len(always))
+
+    def test_capture_slowest(self):
+        from jsonable_objects import hooks
+
+        slowest = hooks.capture_slowest(2)
+        documents = [createJsonable(n) for n in (1, 1000, 10, 2000, 5)]
+        for jsonable in documents:
+            Document(jsonable)
+
+        events = slowest.events()
+        self.assertEqual(2, len(events))
+        self.assertEqual(set([id(documents[1]), id(documents[3])]),
+                         set(id(event.jsonable) for event in events))
+        self.assertTrue(events[0].seconds >= events[1].seconds)
+
+        slowest.clear()
+        self.assertEqual([], slowest.events())
+        slowest.close()
+        Document(createJsonable(1))
+        self.assertEqual([], slowest.events())
@@ -0,0 +1,156 @@
+# -*- coding: utf-8 -*-
+#
+#   jsonable-objects: JSON-able objects
+#   Copyright (C) 2015-2017 mete0r <mete0r@sarangbang.or.kr>
+#
+#   This program is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU Affero General Public License as published by
+#   the Free Software Foundation, either version 3 of the License, or
+#   (at your option) any later version.
+#
+#   This program is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#   GNU Affero General Public License for more details.
+#
+#   You should have received a copy of the GNU Affero General Public License
+#   along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+from __future__ import absolute_import
+from __future__ import print_function
+from __future__ import unicode_literals
+from copy import deepcopy
+from datetime import datetime
+from unittest import TestCase
+
+from zope.interface import implementer
+
+from jsonable_objects.interfaces import IFormat
+from jsonable_objects.proxy import Field
+from jsonable_objects.proxy import proxy
+
+
+@implementer(IFormat)
+class DateFormat(object):
+
+    def format(self, pyobj):
+        return pyobj.strftime('%Y-%m-%d')
+
+    def parse(self, jsonableval):
+        return datetime.strptime(jsonableval, '%Y-%m-%d')
+
+
+@proxy(dict)
+class Event(object):
+    name = Field(type=str)
+    date = Field(type=str, format=DateFormat())
+
+
+@proxy(list, itemProxy=Event)
+class Events(object):
+    pass
+
+
+@proxy(list, itemFormat=DateFormat())
+class Dates(object):
+    pass
+
+
+@proxy(dict)
+class Calendar(object):
+    events = Field(proxy=Events)
+
+
+JSONABLE = {
+    'events': [
+        {'name': 'a', 'date': '2018-11-11'},
+        {'name': 'b', 'date': '2018-11-12'},
+    ],
+}
+
+
+class InstrumentationTest(TestCase):
+
+    def tearDown(self):
+        from jsonable_objects import instrumentation
+        instrumentation.disable()
+        instrumentation.reset()
+
+    def test_counts(self):
+        from jsonable_objects import instrumentation
+
+        instrumentation.enable()
+        self.assertTrue(instrumentation.is_enabled())
+
+        calendar = Calendar(deepcopy(JSONABLE))
+        self.assertEqual({'init': 1, 'validate': 1},
+                         instrumentation.counters()[Calendar])
+        # 검사하면서 하위 proxy 를 만든다.
+        self.assertEqual({'init': 1, 'validate': 1},
+                         instrumentation.counters()[Events])
+        self.assertEqual({'validate': 2, 'parse': 2},
+                         instrumentation.counters()[Event])
+
+        instrumentation.reset()
+        for event in calendar.events:
+            event.name
+            event.date
+        event.date = datetime(2018, 11, 13)
+        self.assertEqual({'read:events': 1, 'child': 1},
+                         instrumentation.counters()[Calendar])
+        self.assertEqual({'init': 1, 'validate': 1, 'item_read': 2,
+                          'child': 2},
+                         instrumentation.counters()[Events])
+        # Events 를 만들 때와 각 Event 를 만들 때 모두 검사된다.
+        self.assertEqual({'init': 2, 'validate': 2 + 2, 'read:name': 2,
+                          'read:date': 2, 'write:date': 1,
+                          'parse': 2 + 2 + 2, 'format': 1},
+                         instrumentation.counters()[Event])
+        self.assertEqual((6, Event, 'parse'), instrumentation.hottest(1)[0])
+
+        instrumentation.reset()
+        dates = Dates(['2018-11-11'])
+        dates[0]
+        dates[0:1] = [datetime(2018, 11, 12)]
+        del dates[0]
+        self.assertEqual({'init': 1, 'validate': 1, 'item_read': 1,
+                          'item_write': 2, 'parse': 2, 'format': 1},
+                         instrumentation.counters()[Dates])
+
+    def test_new_classes_while_enabled(self):
+        from jsonable_objects import instrumentation
+
+        instrumentation.enable()
+        Event({'name': 'a', 'date': '2018-11-11'}).name
+        self.assertEqual({'init': 1, 'validate': 1, 'parse': 1,
+                          'read:name': 1},
+                         instrumentation.counters()[Event])
+
+    def test_disable_restores(self):
+        from jsonable_objects import instrumentation
+
+        originals = (
+            Event.__init__,
+            Event.__dict__['name'],
+            Event.__jsonable_proxy__.field_list,
+            type(Event.__jsonable_proxy__),
+            Events.__getitem__,
+            Dates.__jsonable_proxy__.itemFormat,
+        )
+        instrumentation.enable()
+        self.assertFalse(Event.__init__ is originals[0])
+        instrumentation.disable()
+        self.assertFalse(instrumentation.is_enabled())
+        self.assertEqual(originals, (
+            Event.__init__,
+            Event.__dict__['name'],
+            Event.__jsonable_proxy__.field_list,
+            type(Event.__jsonable_proxy__),
+            Events.__getitem__,
+            Dates.__jsonable_proxy__.itemFormat,
+        ))
+
+        instrumentation.reset()
+        calendar = Calendar(deepcopy(JSONABLE))
+        calendar.events[0].date
+        self.assertEqual({}, instrumentation.counters())
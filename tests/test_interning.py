@@ -0,0 +1,124 @@
+# -*- coding: utf-8 -*-
+#
+#   jsonable-objects: JSON-able objects
+#   Copyright (C) 2015-2017 mete0r <mete0r@sarangbang.or.kr>
+#
+#   This program is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU Affero General Public License as published by
+#   the Free Software Foundation, either version 3 of the License, or
+#   (at your option) any later version.
+#
+#   This program is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#   GNU Affero General Public License for more details.
+#
+#   You should have received a copy of the GNU Affero General Public License
+#   along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+from __future__ import absolute_import
+from __future__ import print_function
+from __future__ import unicode_literals
+from unittest import TestCase
+import json
+
+from jsonable_objects.proxy import Field
+from jsonable_objects.proxy import proxy
+
+
+@proxy(list)
+class Point(object):
+    x = Field(type=int)
+    unit = Field(type=str, intern=True)
+
+
+@proxy(dict)
+class Event(object):
+    status = Field(key='status-code', type=str, intern=True)
+    message = Field(type=str)
+    point = Field(proxy=Point, optional=True)
+    extra = Field(type=dict, optional=True)
+
+
+@proxy(dict, itemProxy=Event)
+class Events(object):
+    pass
+
+
+def texts():
+    # 따로 디코드한 문자열들은 같은 객체가 아니다.
+    return [
+        json.dumps({
+            'e{}'.format(i): {
+                'status-code': 'OK',
+                'message': 'm{}'.format(i),
+                'point': [i, 'meter'],
+                'extra': {'nested-key': [{'deep-key': 'value'}]},
+                'undeclared-key': 1,
+            },
+        })
+        for i in range(2)
+    ]
+
+
+def keys(d):
+    return dict((key, key) for key in d)
+
+
+class InterningTest(TestCase):
+
+    def test_without_interning(self):
+        a, b = [json.loads(text) for text in texts()]
+        a = a['e0']
+        b = b['e1']
+        self.assertFalse(keys(a)['status-code'] is keys(b)['status-code'])
+        self.assertFalse(a['status-code'] is b['status-code'])
+
+    def test_loads(self):
+        from jsonable_objects.interning import intern_string
+        from jsonable_objects.interning import loads
+
+        a, b = [loads(Events, text) for text in texts()]
+        events = a.__jsonable__
+        a = a.__jsonable__['e0']
+        b = b.__jsonable__['e1']
+
+        for key in ['status-code', 'message', 'point', 'extra',
+                    'undeclared-key']:
+            self.assertTrue(keys(a)[key] is keys(b)[key])
+        self.assertTrue(keys(a['extra'])['nested-key'] is
+                        keys(b['extra'])['nested-key'])
+        self.assertTrue(keys(a['extra']['nested-key'][0])['deep-key'] is
+                        keys(b['extra']['nested-key'][0])['deep-key'])
+
+        # Field(intern=True) 의 값들
+        self.assertTrue(a['status-code'] is b['status-code'])
+        self.assertTrue(a['point'][1] is b['point'][1])
+        self.assertFalse(a['extra']['nested-key'][0]['deep-key'] is
+                         b['extra']['nested-key'][0]['deep-key'])
+
+        # 컨테이너의 키는 데이터이므로 그대로 둔다.
+        self.assertFalse(keys(events)['e0'] is intern_string('e0'))
+
+    def test_order_and_validation(self):
+        from jsonable_objects.interning import load
+        from jsonable_objects.interning import wrap
+        import io
+
+        jsonable = json.loads(texts()[0])['e0']
+        order = list(jsonable)
+        event = wrap(Event, jsonable)
+        self.assertTrue(event.__jsonable__ is jsonable)
+        self.assertEqual(order, list(jsonable))
+        self.assertEqual('meter', event.point.unit)
+
+        events = load(Events, io.StringIO(texts()[1]))
+        self.assertEqual('m1', events['e1'].message)
+
+        self.assertRaises(KeyError, wrap, Event, {'message': 'x'})
+        self.assertRaises(TypeError, wrap, Event, [])
+
+    def test_intern_only_strings(self):
+        from jsonable_objects.proxy import Field
+
+        self.assertRaises(TypeError, Field, type=int, intern=True)
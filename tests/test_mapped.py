@@ -0,0 +1,183 @@
+# -*- coding: utf-8 -*-
+#
+#   jsonable-objects: JSON-able objects
+#   Copyright (C) 2015-2017 mete0r <mete0r@sarangbang.or.kr>
+#
+#   This program is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU Affero General Public License as published by
+#   the Free Software Foundation, either version 3 of the License, or
+#   (at your option) any later version.
+#
+#   This program is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#   GNU Affero General Public License for more details.
+#
+#   You should have received a copy of the GNU Affero General Public License
+#   along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+from __future__ import absolute_import
+from __future__ import print_function
+from __future__ import unicode_literals
+from unittest import TestCase
+import io
+import json
+import os.path
+
+from jsonable_objects.proxy import Field
+from jsonable_objects.proxy import proxy
+
+from .utils import isolated_directory
+
+
+@proxy(dict)
+class Foo(object):
+    id = Field(type=int)
+
+
+class CountingLoads(object):
+
+    def __init__(self):
+        self.count = 0
+
+    def __call__(self, s):
+        self.count += 1
+        return json.loads(s)
+
+
+class LRUCacheTest(TestCase):
+
+    def test_lru(self):
+        from jsonable_objects.mapped import LRUCache
+
+        cache = LRUCache(2)
+        cache.put('a', 1)
+        cache.put('b', 2)
+        self.assertEqual(1, cache.get('a'))
+        cache.put('c', 3)
+        self.assertEqual(2, len(cache))
+        self.assertEqual(None, cache.get('b'))
+        self.assertEqual(1, cache.get('a'))
+        self.assertEqual(3, cache.get('c'))
+
+        cache = LRUCache(0)
+        cache.put('a', 1)
+        self.assertEqual(None, cache.get('a'))
+
+
+class LoadMappedTest(TestCase):
+
+    def write(self, path, data):
+        with io.open(path, 'wb') as fp:
+            fp.write(data)
+
+    @isolated_directory
+    def test_ndjson(self, isolated_directory):
+        from jsonable_objects.mapped import MappedArray
+        from jsonable_objects.mapped import load_mapped
+
+        path = os.path.join(isolated_directory, 'a.ndjson')
+        self.write(path, b'{"id": 1}\n\n  {"id": 2}\r\n{"id": 3}')
+
+        loads = CountingLoads()
+        with load_mapped(path, cache_size=2, loads=loads) as items:
+            self.assertTrue(isinstance(items, MappedArray))
+            self.assertEqual(0, loads.count)
+            self.assertEqual(3, len(items))
+            self.assertEqual({'id': 2}, items[1])
+            self.assertEqual({'id': 3}, items[-1])
+            self.assertEqual(2, loads.count)
+            self.assertEqual({'id': 2}, items[1])
+            self.assertEqual(2, loads.count)
+            self.assertEqual([{'id': 1}, {'id': 2}], items[:2])
+            self.assertEqual(3, loads.count)
+            self.assertRaises(IndexError, items.__getitem__, 3)
+            self.assertRaises(TypeError, items.__setitem__, 0, {})
+            self.assertRaises(TypeError, items.__delitem__, 0)
+            self.assertEqual([1, 2, 3], [item['id'] for item in items])
+
+    @isolated_directory
+    def test_ndjson_empty(self, isolated_directory):
+        from jsonable_objects.mapped import load_mapped
+
+        path = os.path.join(isolated_directory, 'a.jsonl')
+        self.write(path, b'')
+        self.assertEqual([], list(load_mapped(path)))
+
+    @isolated_directory
+    def test_json_array_with_proxy(self, isolated_directory):
+        from jsonable_objects.proxy import proxy
+        from jsonable_objects.mapped import load_mapped
+
+        @proxy(list, itemProxy=Foo)
+        class Foos(object):
+            pass
+
+        path = os.path.join(isolated_directory, 'a.json')
+        self.write(path, b'[{"id": 1}, {"id": 2}, {"id": "x"}]')
+
+        foos = load_mapped(path, Foos)
+        self.assertTrue(isinstance(foos, Foos))
+        self.assertEqual(3, len(foos))
+        self.assertEqual(Foo({'id': 2}), foos[1])
+        self.assertEqual([1, 2], [foo.id for foo in foos[:2]])
+        self.assertRaises(ValueError, foos.__getitem__, 2)
+        foos.__jsonable__.close()
+
+    @isolated_directory
+    def test_json_object_with_proxy(self, isolated_directory):
+        from jsonable_objects.proxy import proxy
+        from jsonable_objects.mapped import MappedObject
+        from jsonable_objects.mapped import load_mapped
+
+        class IntFormat(object):
+
+            def format(self, value):
+                return str(value)
+
+            def parse(self, value):
+                return int(value)
+
+        @proxy(dict, keyFormat=IntFormat(), itemProxy=Foo)
+        class Foos(object):
+            pass
+
+        path = os.path.join(isolated_directory, 'a.json')
+        self.write(path, b' {"1": {"id": 1}, "2": {"id": 2, "x": [1, 2]}} ')
+
+        loads = CountingLoads()
+        foos = load_mapped(path, Foos, loads=loads)
+        self.assertTrue(isinstance(foos.__jsonable__, MappedObject))
+        self.assertEqual(2, len(foos))
+        self.assertEqual([1, 2], sorted(foos))
+        self.assertTrue(2 in foos)
+        self.assertFalse(3 in foos)
+        self.assertEqual(0, loads.count)
+        self.assertEqual(2, foos[2].id)
+        self.assertEqual(1, loads.count)
+        self.assertRaises(KeyError, foos.__getitem__, 3)
+
+        document = foos.__jsonable__
+        self.assertEqual(None, document.get('3'))
+        self.assertEqual({'id': 1}, document.get('1'))
+        self.assertEqual(['1', '2'], sorted(document.keys()))
+        self.assertEqual([('1', {'id': 1}), ('2', {'id': 2, 'x': [1, 2]})],
+                         sorted(document.items()))
+        document.close()
+
+    @isolated_directory
+    def test_proxy_mismatch(self, isolated_directory):
+        from jsonable_objects.proxy import proxy
+        from jsonable_objects.mapped import load_mapped
+
+        @proxy(dict, itemProxy=Foo)
+        class FooMap(object):
+            pass
+
+        path = os.path.join(isolated_directory, 'a.json')
+        self.write(path, b'[]')
+        self.assertRaises(TypeError, load_mapped, path, FooMap)
+        self.assertRaises(TypeError, load_mapped, path, Foo)
+
+        self.write(path, b'1')
+        self.assertRaises(TypeError, load_mapped, path)
@@ -0,0 +1,113 @@
+# -*- coding: utf-8 -*-
+#
+#   jsonable-objects: JSON-able objects
+#   Copyright (C) 2015-2017 mete0r <mete0r@sarangbang.or.kr>
+#
+#   This program is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU Affero General Public License as published by
+#   the Free Software Foundation, either version 3 of the License, or
+#   (at your option) any later version.
+#
+#   This program is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#   GNU Affero General Public License for more details.
+#
+#   You should have received a copy of the GNU Affero General Public License
+#   along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+from __future__ import absolute_import
+from __future__ import print_function
+from __future__ import unicode_literals
+from unittest import TestCase
+import json
+import sys
+
+from jsonable_objects.proxy import Field
+from jsonable_objects.proxy import proxy
+
+
+@proxy(dict)
+class Point(object):
+    lat = Field(type=float)
+    lon = Field(type=float)
+
+
+@proxy(list, itemProxy=Point)
+class Points(object):
+    pass
+
+
+@proxy(dict)
+class Shape(object):
+    name = Field(type=str)
+    points = Field(proxy=Points)
+
+
+def createJsonable():
+    # 따로 디코드하여 키 문자열들이 공유되지 않도록
+    points = [json.loads('{"lat": 1.5, "lon": 2.5}') for i in range(3)]
+    return {'name': 'shape', 'points': points, 'extra': [1, 2]}
+
+
+class MemoryReportTest(TestCase):
+
+    def test_report(self):
+        from jsonable_objects.memory import sizeof
+
+        jsonable = createJsonable()
+        shape = Shape(jsonable)
+        report = Shape.memory_report(shape)
+
+        getsizeof = sys.getsizeof
+        points = jsonable['points']
+        point_bytes = [
+            getsizeof(p) + sum(getsizeof(k) + getsizeof(v)
+                               for k, v in p.items())
+            for p in points
+        ]
+        points_bytes = getsizeof(points) + sum(point_bytes)
+        extra_bytes = (getsizeof(jsonable['extra']) + getsizeof(1) +
+                       getsizeof(2))
+
+        self.assertEqual(
+            getsizeof('name') + getsizeof('shape'),
+            report.by_field[(Shape, 'name')],
+        )
+        self.assertEqual(getsizeof('points') + points_bytes,
+                         report.by_field[(Shape, 'points')])
+        self.assertEqual(getsizeof('extra') + extra_bytes,
+                         report.by_field[(Shape, None)])
+        self.assertEqual(getsizeof(points), report.by_class[Points])
+        self.assertEqual(sum(point_bytes), report.by_class[Point])
+        self.assertEqual(
+            getsizeof(jsonable) + getsizeof('name') + getsizeof('shape') +
+            getsizeof('points') + getsizeof('extra') + extra_bytes,
+            report.by_class[Shape],
+        )
+        self.assertEqual(sum(report.by_class.values()), report.total)
+        self.assertEqual(report.total, sizeof(shape))
+
+        x = getsizeof('lat') + getsizeof('lon')
+        self.assertEqual(
+            getsizeof('name') + getsizeof('points') + getsizeof('extra') +
+            3 * x,
+            report.key_bytes,
+        )
+        self.assertEqual(2 * x, report.duplicate_key_bytes)
+        self.assertEqual(
+            3 * (getsizeof(1.5) + getsizeof(2.5)) + 2 * getsizeof(1),
+            report.number_bytes,
+        )
+
+    def test_shared_objects_counted_once(self):
+        from jsonable_objects.memory import sizeof
+
+        point = {'lat': 1.0, 'lon': 2.0}
+        shared_points = [point, point]
+        single_points = [point]
+        shared = Shape({'name': 's', 'points': shared_points})
+        single = Shape({'name': 's', 'points': single_points})
+        # 두 번째 point 는 목록의 칸만 차지한다.
+        self.assertEqual(sizeof(single) - sys.getsizeof(single_points),
+                         sizeof(shared) - sys.getsizeof(shared_points))
@@ -0,0 +1,226 @@
+# -*- coding: utf-8 -*-
+#
+#   jsonable-objects: JSON-able objects
+#   Copyright (C) 2015-2017 mete0r <mete0r@sarangbang.or.kr>
+#
+#   This program is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU Affero General Public License as published by
+#   the Free Software Foundation, either version 3 of the License, or
+#   (at your option) any later version.
+#
+#   This program is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#   GNU Affero General Public License for more details.
+#
+#   You should have received a copy of the GNU Affero General Public License
+#   along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+from __future__ import absolute_import
+from __future__ import print_function
+from __future__ import unicode_literals
+from unittest import TestCase
+import io
+import os.path
+
+from jsonable_objects.proxy import Field
+from jsonable_objects.proxy import proxy
+
+from .utils import isolated_directory
+
+
+@proxy(dict)
+class Foo(object):
+    id = Field(type=int)
+    name = Field(type=str, optional=True)
+
+
+class IterNDJSONTest(TestCase):
+
+    def test_iter_ndjson(self):
+        fp = io.BytesIO(b'{"id": 1}\n\n{"id": 2, "name": "two"}\n')
+        items = list(Foo.iter_ndjson(fp))
+        self.assertEqual([Foo({'id': 1}), Foo({'id': 2, 'name': 'two'})],
+                         items)
+
+    def test_iter_ndjson_text(self):
+        fp = io.StringIO('{"id": 1}\n{"id": 2}')
+        self.assertEqual([1, 2], [foo.id for foo in Foo.iter_ndjson(fp)])
+
+    def test_iter_ndjson_invalid(self):
+        fp = io.BytesIO(b'{"id": 1}\n{"id": "x"}\n')
+        items = Foo.iter_ndjson(fp)
+        self.assertEqual(1, next(items).id)
+        self.assertRaises(ValueError, next, items)
+
+
+# 작업 프로세스로 pickle 되려면 모듈 수준에서 찾을 수 있어야 한다.
+@proxy(dict)
+class ShardFoo(object):
+    id = Field(type=int)
+
+
+class ShardRangesTest(TestCase):
+
+    def write(self, path, lines):
+        with io.open(path, 'wb') as fp:
+            for line in lines:
+                fp.write(line + b'\n')
+
+    @isolated_directory
+    def test_shard_ranges(self, isolated_directory):
+        from jsonable_objects.ndjson import shard_ranges
+
+        path = os.path.join(isolated_directory, 'a.ndjson')
+        self.write(path, [b'{"id": 1}', b'{"id": 22}', b'{"id": 333}'])
+
+        ranges = shard_ranges(path, 4)
+        self.assertEqual([(0, 10), (10, 21), (21, 33)], ranges)
+
+        ranges = shard_ranges(path, 10)
+        self.assertEqual([(0, 10), (10, 21), (21, 33)], ranges)
+
+        ranges = shard_ranges(path, 11)
+        self.assertEqual([(0, 21), (21, 33)], ranges)
+
+        ranges = shard_ranges(path, 100)
+        self.assertEqual([(0, 33)], ranges)
+
+        self.assertRaises(ValueError, shard_ranges, path, 0)
+
+
+class InlineResult(object):
+
+    def __init__(self, value):
+        self.value = value
+
+    def ready(self):
+        return True
+
+    def get(self):
+        return self.value
+
+
+class CountingPool(object):
+    ''' 작업을 바로 실행하고, 아직 꺼내지 않은 결과의 수를 센다. '''
+
+    def __init__(self, processes):
+        self.pending = 0
+        self.max_pending = 0
+
+    def apply_async(self, func, args):
+        self.pending += 1
+        self.max_pending = max(self.max_pending, self.pending)
+        result = InlineResult(func(*args))
+        get = result.get
+
+        def counting_get():
+            self.pending -= 1
+            return get()
+        result.get = counting_get
+        return result
+
+    def terminate(self):
+        pass
+
+    def join(self):
+        pass
+
+
+class CountingMultiprocessing(object):
+
+    def __init__(self):
+        self.pools = []
+
+    def Pool(self, processes):
+        pool = CountingPool(processes)
+        self.pools.append(pool)
+        return pool
+
+
+class IngestNDJSONTest(TestCase):
+
+    def write(self, path, lines):
+        with io.open(path, 'wb') as fp:
+            for line in lines:
+                fp.write(line + b'\n')
+
+    @isolated_directory
+    def test_ordered(self, isolated_directory):
+        from jsonable_objects.ndjson import ingest_ndjson
+
+        path = os.path.join(isolated_directory, 'a.ndjson')
+        self.write(path, [
+            ('{"id": %d}' % i).encode('utf-8') for i in range(100)
+        ])
+        items = list(ingest_ndjson(ShardFoo, path, processes=2,
+                                   shard_size=50))
+        self.assertEqual(list(range(100)), [item.id for item in items])
+        self.assertTrue(all(isinstance(item, ShardFoo) for item in items))
+
+    @isolated_directory
+    def test_unordered(self, isolated_directory):
+        from jsonable_objects.ndjson import ingest_ndjson
+
+        path = os.path.join(isolated_directory, 'a.ndjson')
+        self.write(path, [
+            ('{"id": %d}' % i).encode('utf-8') for i in range(100)
+        ])
+        items = ingest_ndjson(ShardFoo, path, processes=2, shard_size=50,
+                              ordered=False)
+        self.assertEqual(list(range(100)),
+                         sorted(item.id for item in items))
+
+    @isolated_directory
+    def test_backpressure(self, isolated_directory):
+        import jsonable_objects.ndjson as module
+
+        path = os.path.join(isolated_directory, 'a.ndjson')
+        self.write(path, [
+            ('{"id": %d}' % i).encode('utf-8') for i in range(100)
+        ])
+        multiprocessing = module.multiprocessing
+        module.multiprocessing = CountingMultiprocessing()
+        try:
+            for ordered in (True, False):
+                items = module.ingest_ndjson(ShardFoo, path, processes=2,
+                                             shard_size=50, ordered=ordered)
+                self.assertEqual(list(range(100)),
+                                 sorted(item.id for item in items))
+            for pool in module.multiprocessing.pools:
+                self.assertEqual(4, pool.max_pending)
+        finally:
+            module.multiprocessing = multiprocessing
+
+    @isolated_directory
+    def test_errors_report(self, isolated_directory):
+        from jsonable_objects.ndjson import LineError
+        from jsonable_objects.ndjson import ingest_ndjson
+
+        path = os.path.join(isolated_directory, 'a.ndjson')
+        self.write(path, [b'{"id": 1}', b'{"id": "x"}', b'{', b'{"id": 4}'])
+        items = list(ingest_ndjson(ShardFoo, path, processes=2,
+                                   shard_size=10, errors='report'))
+        self.assertEqual(4, len(items))
+        self.assertEqual(1, items[0].id)
+        self.assertTrue(isinstance(items[1], LineError))
+        self.assertEqual(10, items[1].offset)
+        self.assertEqual(b'{"id": "x"}', items[1].line)
+        self.assertTrue(isinstance(items[1].error, ValueError))
+        self.assertTrue(isinstance(items[2], LineError))
+        self.assertEqual(22, items[2].offset)
+        self.assertEqual(4, items[3].id)
+
+    @isolated_directory
+    def test_errors_raise(self, isolated_directory):
+        from jsonable_objects.ndjson import ingest_ndjson
+
+        path = os.path.join(isolated_directory, 'a.ndjson')
+        self.write(path, [b'{"id": 1}', b'{"id": "x"}', b'{"id": 3}'])
+        items = ingest_ndjson(ShardFoo, path, processes=1, shard_size=1000)
+        self.assertEqual(1, next(items).id)
+        self.assertRaises(ValueError, next, items)
+
+        self.assertRaises(ValueError, list, ingest_ndjson(
+            ShardFoo, path, errors='ignore',
+        ))
@@ -0,0 +1,199 @@
+# -*- coding: utf-8 -*-
+#
+#   jsonable-objects: JSON-able objects
+#   Copyright (C) 2015-2017 mete0r <mete0r@sarangbang.or.kr>
+#
+#   This program is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU Affero General Public License as published by
+#   the Free Software Foundation, either version 3 of the License, or
+#   (at your option) any later version.
+#
+#   This program is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#   GNU Affero General Public License for more details.
+#
+#   You should have received a copy of the GNU Affero General Public License
+#   along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+from __future__ import absolute_import
+from __future__ import print_function
+from __future__ import unicode_literals
+from unittest import TestCase
+import copy
+import json
+
+from jsonable_objects.proxy import Field
+from jsonable_objects.proxy import proxy
+
+
+BASE = {
+    'name': 'tenant',
+    'limits': {'timeout': 5, 'retries': 3},
+    'hosts': [{'host': 'a'}, {'host': 'b'}],
+    'tags': ['x', 'y'],
+}
+
+
+@proxy(dict)
+class Limits(object):
+    timeout = Field(type=int)
+    retries = Field(type=int, optional=True)
+
+
+@proxy(dict)
+class Host(object):
+    host = Field(type=str)
+
+
+@proxy(list, itemProxy=Host)
+class Hosts(object):
+    pass
+
+
+@proxy(dict)
+class Config(object):
+    name = Field(type=str)
+    limits = Field(proxy=Limits)
+    hosts = Field(proxy=Hosts)
+
+
+class OverlayTest(TestCase):
+
+    def test_reads(self):
+        from jsonable_objects.overlay import OverlayDict
+        from jsonable_objects.overlay import OverlayList
+        from jsonable_objects.overlay import overlay
+
+        base = copy.deepcopy(BASE)
+        d = overlay(base)
+        self.assertTrue(isinstance(d, OverlayDict))
+        self.assertEqual(base, d)
+        self.assertEqual(base, json.loads(json.dumps(d)))
+        self.assertTrue(isinstance(d['limits'], OverlayDict))
+        self.assertTrue(d['limits'] is d['limits'])
+        self.assertTrue(isinstance(d.get('hosts'), OverlayList))
+        self.assertTrue(isinstance(d['hosts'][0], OverlayDict))
+        self.assertEqual(1, overlay(1))
+
+    def test_writes_do_not_touch_base(self):
+        from jsonable_objects.overlay import overlay
+
+        base = copy.deepcopy(BASE)
+        expected = copy.deepcopy(base)
+
+        d = overlay(base)
+        d['name'] = 'other'
+        d['limits']['timeout'] = 10
+        del d['limits']['retries']
+        d['hosts'][1]['host'] = 'c'
+        d['hosts'].append({'host': 'd'})
+        d['tags'][0] = 'z'
+        for host in d['hosts']:
+            host['port'] = 1
+        for value in d.values():
+            if isinstance(value, list):
+                value.reverse()
+        d.setdefault('new', {})['k'] = 'v'
+        d.pop('tags')
+        dict(d)['limits']['x'] = 1
+        d.copy()['hosts'][0]['y'] = 1
+
+        self.assertEqual(expected, base)
+        self.assertEqual({
+            'name': 'other',
+            'limits': {'timeout': 10, 'x': 1},
+            'hosts': [
+                {'host': 'd', 'port': 1, 'y': 1},
+                {'host': 'c', 'port': 1},
+                {'host': 'a', 'port': 1},
+            ],
+            'new': {'k': 'v'},
+        }, d)
+
+    def test_popped_items_are_not_shared(self):
+        from jsonable_objects.overlay import overlay
+
+        base = copy.deepcopy(BASE)
+        expected = copy.deepcopy(base)
+
+        d = overlay(base)
+        d.pop('limits')['timeout'] = 1
+        d['hosts'].pop()['host'] = 'z'
+        d.pop('tags')
+        key, value = d.popitem()
+        self.assertEqual('hosts', key)
+        value[0]['host'] = 'z'
+        self.assertEqual(expected, base)
+        self.assertRaises(KeyError, d.pop, 'limits')
+        self.assertEqual(None, d.pop('limits', None))
+
+    def test_proxy(self):
+        from jsonable_objects.overlay import overlay
+
+        base = copy.deepcopy(BASE)
+        expected = copy.deepcopy(base)
+
+        config = Config(overlay(base))
+        config.limits.timeout = 10
+        config.hosts[0] = Host({'host': 'z'})
+        config.hosts[1].host = 'y'
+        self.assertEqual(10, config.limits.timeout)
+        self.assertEqual(['z', 'y'], [host.host for host in config.hosts])
+        self.assertEqual(expected, base)
+
+        other = Config(overlay(base))
+        self.assertEqual(5, other.limits.timeout)
+        self.assertEqual(['a', 'b'], [host.host for host in other.hosts])
+
+    def test_reads_copy_nothing(self):
+        from jsonable_objects.overlay import overlay
+
+        base = copy.deepcopy(BASE)
+        base['hosts'] = [{'host': 'h{}'.format(i)} for i in range(100)]
+        expected = copy.deepcopy(base)
+
+        root = overlay(base)
+        config = Config(root)
+        self.assertFalse(root.materialized)
+        self.assertEqual(expected, json.loads(json.dumps(config.__jsonable__)))
+        self.assertEqual(
+            expected['limits'],
+            json.loads(json.dumps(config.limits.__jsonable__)),
+        )
+        self.assertEqual(expected, copy.deepcopy(root))
+
+        # 한 곳을 쓰면 그 경로의 컨테이너들만 복사된다.
+        config.hosts[50].host = 'z'
+        self.assertEqual(expected, base)
+        self.assertTrue(root.materialized)
+        self.assertTrue(dict.__getitem__(root, 'limits') is base['limits'])
+        self.assertTrue(dict.__getitem__(root, 'tags') is base['tags'])
+        hosts = dict.__getitem__(root, 'hosts')
+        self.assertFalse(hosts is base['hosts'])
+        for index, host in enumerate(list.__iter__(hosts)):
+            if index == 50:
+                self.assertEqual({'host': 'z'}, host)
+                self.assertFalse(host is base['hosts'][50])
+            else:
+                self.assertTrue(host is base['hosts'][index])
+        self.assertEqual(
+            'z', json.loads(json.dumps(root))['hosts'][50]['host'],
+        )
+
+    def test_list_views_follow_moves(self):
+        from jsonable_objects.overlay import overlay
+
+        base = copy.deepcopy(BASE)
+        expected = copy.deepcopy(base)
+
+        hosts = overlay(base)['hosts']
+        a, b = hosts[0], hosts[1]
+        hosts.insert(0, {'host': 'new'})
+        b['host'] = 'B'
+        hosts.reverse()
+        a['host'] = 'A'
+        removed = hosts.pop(0)
+        removed['host'] = 'removed'
+        self.assertEqual([{'host': 'A'}, {'host': 'new'}], hosts)
+        self.assertEqual(expected, base)
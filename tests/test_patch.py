@@ -0,0 +1,197 @@
+# -*- coding: utf-8 -*-
+#
+#   jsonable-objects: JSON-able objects
+#   Copyright (C) 2015-2017 mete0r <mete0r@sarangbang.or.kr>
+#
+#   This program is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU Affero General Public License as published by
+#   the Free Software Foundation, either version 3 of the License, or
+#   (at your option) any later version.
+#
+#   This program is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#   GNU Affero General Public License for more details.
+#
+#   You should have received a copy of the GNU Affero General Public License
+#   along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+from __future__ import absolute_import
+from __future__ import print_function
+from __future__ import unicode_literals
+from unittest import TestCase
+import copy
+
+from jsonable_objects.proxy import Field
+from jsonable_objects.proxy import proxy
+
+from .utils import CountingPredicate
+
+
+COUNTERS = {
+    'name': CountingPredicate(),
+    'port': CountingPredicate(lambda port: 0 < port < 65536),
+    'server': CountingPredicate(),
+}
+
+
+@proxy(dict)
+class Server(object):
+    name = Field(type=str, predicate=COUNTERS['name'])
+    port = Field(type=int, predicate=COUNTERS['port'])
+    tags = Field(type=list, optional=True)
+
+
+@proxy(dict, itemProxy=Server)
+class Servers(object):
+    pass
+
+
+@proxy(dict)
+class Config(object):
+    title = Field(type=str)
+    main = Field(proxy=Server, predicate=COUNTERS['server'])
+    others = Field(proxy=Servers, optional=True)
+    options = Field(type=dict, optional=True)
+
+
+@proxy(dict, tracked=True)
+class TrackedConfig(object):
+    title = Field(type=str)
+    main = Field(proxy=Server)
+    others = Field(proxy=Servers, optional=True)
+    options = Field(type=dict, optional=True)
+
+
+JSONABLE = {
+    'title': 'config',
+    'main': {'name': 'main', 'port': 80},
+    'others': {
+        'a': {'name': 'a', 'port': 81, 'tags': ['x']},
+        'b': {'name': 'b', 'port': 82},
+    },
+    'options': {'x': {'y': 1, 'z': 2}},
+    'undeclared': {'k': 1},
+}
+
+
+class MergedTest(TestCase):
+
+    def test_rfc7396_examples(self):
+        from jsonable_objects.patch import merged
+
+        target = {'a': 'b', 'c': {'d': 'e', 'f': 'g'}}
+        patch = {'a': 'z', 'c': {'f': None}}
+        self.assertEqual({'a': 'z', 'c': {'d': 'e'}}, merged(target, patch))
+        self.assertEqual({'a': 'b', 'c': {'d': 'e', 'f': 'g'}}, target)
+
+        self.assertEqual({'a': 'c'}, merged({'a': 'b'}, {'a': 'c'}))
+        self.assertEqual({'a': 'b', 'b': 'c'}, merged({'a': 'b'}, {'b': 'c'}))
+        self.assertEqual({}, merged({'a': 'b'}, {'a': None}))
+        self.assertEqual({'a': 'c'}, merged({'a': ['b']}, {'a': 'c'}))
+        self.assertEqual({'a': ['c']}, merged({'a': 'c'}, {'a': ['c']}))
+        self.assertEqual({'a': {'bb': {}}},
+                         merged({'a': {'b': 'c'}}, {'a': {'b': None,
+                                                          'bb': {'c': None}}}))
+        self.assertEqual(['c'], merged({'a': 'c'}, ['c']))
+        self.assertEqual({'a': 1}, merged(['a'], {'a': 1}))
+        self.assertEqual({'a': 1}, merged(None, {'a': 1, 'b': None}))
+
+
+class MergePatchTest(TestCase):
+
+    def test_scoped_validation(self):
+        jsonable = copy.deepcopy(JSONABLE)
+        config = Config(jsonable)
+        for counter in COUNTERS.values():
+            counter.count = 0
+
+        result = config.merge_patch({
+            'title': 'new',
+            'main': {'port': 8080},
+            'others': {'b': {'tags': ['y']}},
+            'options': {'x': {'z': None}},
+            'undeclared': None,
+        })
+        self.assertTrue(result is config)
+        self.assertEqual({
+            'title': 'new',
+            'main': {'name': 'main', 'port': 8080},
+            'others': {
+                'a': {'name': 'a', 'port': 81, 'tags': ['x']},
+                'b': {'name': 'b', 'port': 82, 'tags': ['y']},
+            },
+            'options': {'x': {'y': 1}},
+        }, jsonable)
+
+        # main.port 와 main 자체만 다시 검사된다.
+        self.assertEqual(1, COUNTERS['port'].count)
+        self.assertEqual(1, COUNTERS['server'].count)
+        self.assertEqual(0, COUNTERS['name'].count)
+
+    def test_new_subtree_is_fully_validated(self):
+        jsonable = copy.deepcopy(JSONABLE)
+        config = Config(jsonable)
+        config.merge_patch({'others': {'c': {'name': 'c', 'port': 83,
+                                             'tags': None}}})
+        self.assertEqual({'name': 'c', 'port': 83},
+                         jsonable['others']['c'])
+
+        del jsonable['others']
+        config.merge_patch({'others': {'d': {'name': 'd', 'port': 84}}})
+        self.assertEqual({'d': {'name': 'd', 'port': 84}},
+                         jsonable['others'])
+
+    def test_failure_is_undone(self):
+        jsonable = copy.deepcopy(JSONABLE)
+        expected = copy.deepcopy(jsonable)
+        config = Config(jsonable)
+
+        for patch, error in [
+            ({'title': 'ok', 'main': {'port': 0}}, ValueError),
+            ({'title': 'ok', 'main': {'name': None}}, KeyError),
+            ({'title': None}, KeyError),
+            ({'main': {'port': [1]}}, TypeError),
+            ({'others': {'a': {'port': 'x'}}}, ValueError),
+            ({'others': {'c': {'name': 'c'}}}, KeyError),
+            ({'main': [1]}, TypeError),
+            ({'others': {'z': 1}, 'options': {'new': 1}}, TypeError),
+            ([], TypeError),
+        ]:
+            self.assertRaises(error, config.merge_patch, patch)
+            self.assertEqual(expected, jsonable)
+
+    def test_list_proxy(self):
+        from jsonable_objects.proxy import proxy
+        from jsonable_objects.proxy import Field
+
+        @proxy(list)
+        class Pair(object):
+            first = Field(type=int)
+            second = Field(type=int)
+
+        jsonable = [1, 2]
+        pair = Pair(jsonable)
+        pair.merge_patch([3, 4])
+        self.assertEqual([3, 4], jsonable)
+        self.assertRaises(TypeError, pair.merge_patch, [3, None])
+        self.assertRaises(TypeError, pair.merge_patch, {'first': 1})
+        self.assertEqual([3, 4], jsonable)
+
+    def test_tracked(self):
+        config = TrackedConfig(copy.deepcopy(JSONABLE))
+        config.merge_patch({
+            'title': 'new',
+            'main': {'port': 8080},
+            'others': {'a': None},
+        })
+        self.assertEqual({'/title', '/main/port', '/others/a'},
+                         config.changed_paths())
+
+        try:
+            with config.transaction():
+                config.merge_patch({'main': {'name': 'x'}})
+                raise ValueError()
+        except ValueError:
+            pass
+        self.assertEqual('main', config.main.name)
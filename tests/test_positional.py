@@ -0,0 +1,155 @@
+# -*- coding: utf-8 -*-
+#
+#   jsonable-objects: JSON-able objects
+#   Copyright (C) 2015-2017 mete0r <mete0r@sarangbang.or.kr>
+#
+#   This program is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU Affero General Public License as published by
+#   the Free Software Foundation, either version 3 of the License, or
+#   (at your option) any later version.
+#
+#   This program is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#   GNU Affero General Public License for more details.
+#
+#   You should have received a copy of the GNU Affero General Public License
+#   along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+from __future__ import absolute_import
+from __future__ import print_function
+from __future__ import unicode_literals
+from unittest import TestCase
+
+
+class PositionalTest(TestCase):
+
+    def test_flat(self):
+        from jsonable_objects.proxy import proxy
+        from jsonable_objects.proxy import Field
+
+        @proxy(dict)
+        class Foo(object):
+            id = Field(type=int)
+            name = Field(key='Name', type=str)
+
+        @proxy(list)
+        class FooRow(object):
+            id = Field(type=int)
+            name = Field(type=str)
+
+        foo = Foo({'id': 1, 'Name': 'one', 'extra': True})
+        row = Foo.to_positional(foo)
+        self.assertEqual([1, 'one'], row)
+        self.assertEqual(FooRow([1, 'one']), FooRow(row))
+        self.assertEqual([1, 'one'], Foo.to_positional(foo.__jsonable__))
+
+        foo = Foo.from_positional(row)
+        self.assertTrue(isinstance(foo, Foo))
+        self.assertEqual({'id': 1, 'Name': 'one'}, foo.__jsonable__)
+
+        self.assertRaises(TypeError, Foo.from_positional, [1, None])
+        self.assertRaises(TypeError, Foo.from_positional, (1, 'one'))
+        self.assertRaises(ValueError, Foo.from_positional, ['x', 'one'])
+        self.assertRaises(ValueError, Foo.from_positional, [1])
+        self.assertRaises(ValueError, Foo.from_positional, [1, 'one', 2])
+
+    def test_single_and_empty(self):
+        from jsonable_objects.proxy import proxy
+        from jsonable_objects.proxy import Field
+
+        @proxy(dict)
+        class Foo(object):
+            id = Field()
+
+        @proxy(dict)
+        class Empty(object):
+            pass
+
+        self.assertEqual([1], Foo.to_positional({'id': 1}))
+        self.assertEqual({'id': 1}, Foo.from_positional([1]).__jsonable__)
+        self.assertEqual([], Empty.to_positional({'id': 1}))
+        self.assertEqual({}, Empty.from_positional([]).__jsonable__)
+
+    def test_optional(self):
+        from jsonable_objects.proxy import proxy
+        from jsonable_objects.proxy import Field
+
+        @proxy(dict)
+        class Foo(object):
+            id = Field(type=int)
+            name = Field(type=str, optional=True)
+
+        self.assertEqual([1, None], Foo.to_positional({'id': 1}))
+        self.assertEqual([1, 'a'], Foo.to_positional({'id': 1, 'name': 'a'}))
+        self.assertEqual({'id': 1},
+                         Foo.from_positional([1, None]).__jsonable__)
+
+    def test_nested(self):
+        from jsonable_objects.proxy import proxy
+        from jsonable_objects.proxy import Field
+
+        @proxy(dict)
+        class Point(object):
+            x = Field(type=int)
+            y = Field(type=int)
+
+        @proxy(dict, itemProxy=Point)
+        class Points(object):
+            pass
+
+        @proxy(dict)
+        class Shape(object):
+            origin = Field(proxy=Point)
+            end = Field(proxy=Point, optional=True)
+            named = Field(proxy=Points)
+
+        d = {
+            'origin': {'x': 1, 'y': 2},
+            'named': {'a': {'x': 3, 'y': 4}},
+        }
+        row = Shape.to_positional(d)
+        self.assertEqual([[1, 2], None, {'a': {'x': 3, 'y': 4}}], row)
+
+        shape = Shape.from_positional(row)
+        self.assertEqual(d, shape.__jsonable__)
+        self.assertEqual(2, shape.origin.y)
+
+        d['end'] = {'x': 5, 'y': 6}
+        row = Shape.to_positional(Shape(d))
+        self.assertEqual([5, 6], row[1])
+        self.assertEqual(d, Shape.from_positional(row).__jsonable__)
+
+        self.assertRaises(ValueError, Shape.from_positional,
+                          [[1], None, {}])
+        self.assertRaises(TypeError, Shape.from_positional,
+                          [{'x': 1, 'y': 2}, None, {}])
+
+    def test_not_for_list_and_container(self):
+        from jsonable_objects.proxy import proxy
+        from jsonable_objects.proxy import Field
+        from jsonable_objects.positional import to_positional
+
+        @proxy(list)
+        class Foo(object):
+            id = Field()
+
+        @proxy(dict, as_container=True)
+        class Bar(object):
+            pass
+
+        self.assertFalse(hasattr(Foo, 'to_positional'))
+        self.assertFalse(hasattr(Bar, 'from_positional'))
+        self.assertRaises(TypeError, to_positional, Foo, [1])
+        self.assertRaises(TypeError, to_positional, Bar, {})
+
+    def test_not_override_user_defined(self):
+        from jsonable_objects.proxy import proxy
+        from jsonable_objects.proxy import Field
+
+        @proxy(dict)
+        class Foo(object):
+            to_positional = Field()
+
+        foo = Foo({'to_positional': 1})
+        self.assertEqual(1, foo.to_positional)
@@ -190,6 +190,111 @@ class ProxyTest(TestCase):
         self.assertRaises(TypeError, proxy, tuple)
         self.assertRaises(TypeError, proxy, Foo)
 
+    def test_without_zope_interface(self):
+        import subprocess
+        import sys
+
+        # 별도의 프로세스에서, interfaces 를 불러들이기 전과 후
+        code = '\n'.join([
+            'import sys',
+            'from jsonable_objects.proxy import proxy',
+            '@proxy(dict)',
+            'class Foo(object):',
+            '    pass',
+            'assert "zope.interface" not in sys.modules',
+            'from jsonable_objects.interfaces import IJsonable',
+            'assert IJsonable.providedBy(Foo({}))',
+        ])
+        subprocess.check_call([sys.executable, '-c', code])
+
+    def test_duck_typing(self):
+        from jsonable_objects.proxy import JsonableProxy
+        from jsonable_objects.proxy import is_format
+        from jsonable_objects.proxy import is_jsonable
+        from jsonable_objects.proxy import proxy
+
+        @proxy(dict)
+        class Foo(object):
+            pass
+
+        self.assertTrue(is_jsonable(Foo({})))
+        self.assertTrue(is_jsonable(JsonableProxy({})))
+        self.assertFalse(is_jsonable({}))
+        self.assertFalse(is_jsonable(Foo.__new__(Foo)))
+        self.assertTrue(is_format(createUUIDFormat(self)))
+        self.assertFalse(is_format(object()))
+
+    def test_fields_compiled_lazily(self):
+        from jsonable_objects.proxy import proxy
+        from jsonable_objects.proxy import Field
+        from jsonable_objects.proxy import LazyFieldDescriptor
+
+        @proxy(dict)
+        class Foo(object):
+            foo = Field(type=int)
+            bar = Field(type=str, optional=True)
+
+        class Baz(Foo):
+            pass
+
+        self.assertTrue(isinstance(Foo.__dict__['foo'], LazyFieldDescriptor))
+        self.assertEqual(['foo', 'bar'], [
+            field.name for field in Foo.__jsonable_proxy__.field_specs
+        ])
+
+        # 처음 쓰일 때 모든 필드의 descriptor 가 제자리에 놓인다.
+        baz = Baz({'foo': 1})
+        self.assertEqual(1, baz.foo)
+        self.assertTrue(isinstance(Foo.__dict__['foo'], property))
+        self.assertTrue(isinstance(Foo.__dict__['bar'], property))
+        self.assertTrue(Foo.bar is Foo.__dict__['bar'])
+
+        @proxy(dict)
+        class Qux(object):
+            qux = Field(type=int)
+
+        qux = Qux.__new__(Qux)
+        qux.__jsonable__ = {}
+        qux.qux = 1
+        self.assertEqual({'qux': 1}, qux.__jsonable__)
+
+        @proxy(dict)
+        class Quux(Qux):
+            quux = Field(type=int, optional=True)
+
+        self.assertEqual([('qux', 0), ('quux', 1)], [
+            (field.name, field.local_index)
+            for field in Quux.__jsonable_proxy__.field_list
+        ])
+        del Quux({'qux': 1, 'quux': 2}).quux
+
+    def test_not_override_inherited_methods(self):
+        from jsonable_objects.proxy import proxy
+        from jsonable_objects.proxy import Field
+
+        class Mixin(object):
+
+            def fingerprint(self):
+                return 'mixin'
+
+            @classmethod
+            def diff(cls, old, new):
+                return 'mixin'
+
+        @proxy(dict)
+        class Point(Mixin):
+            x = Field(type=int)
+
+            def merge_patch(self, patch):
+                return 'own'
+
+        point = Point({'x': 1})
+        self.assertEqual('mixin', point.fingerprint())
+        self.assertEqual('mixin', Point.diff(point, point))
+        self.assertEqual('own', point.merge_patch({}))
+        self.assertTrue('revalidate' in Point.__dict__)
+        self.assertFalse('fingerprint' in Point.__dict__)
+
 
 class ProxyForDictTest(TestCase):
 
@@ -1186,6 +1291,23 @@ class ProxyForDictTest(TestCase):
             mapping, uuid4(), 'qux',
         )
 
+    def test_itemBatchPredicate(self):
+        from jsonable_objects.proxy import proxy
+
+        @proxy(dict, itemBatchPredicate=lambda values: [
+            isinstance(value, int) for value in values
+        ])
+        class Counts(object):
+            pass
+
+        d = {'a': 1}
+        mapping = Counts(d)
+        mapping['b'] = 2
+        self.assertEquals({'a': 1, 'b': 2}, d)
+        self.assertRaises(ValueError, operator.setitem, mapping, 'c', 'x')
+        self.assertEquals({'a': 1, 'b': 2}, d)
+        self.assertRaises(ValueError, Counts, {'a': 1, 'b': None})
+
 
 class ProxyForListTest(TestCase):
 
@@ -1870,3 +1992,52 @@ class ProxyForListTest(TestCase):
             TypeError,
             operator.setitem, seq, slice(0, 0), ['qux']
         )
+
+    def test_itemBatchPredicate(self):
+        from jsonable_objects.proxy import proxy
+
+        calls = []
+
+        def in_range(values):
+            calls.append(len(values))
+            return [0 <= value < 100 for value in values]
+
+        @proxy(list, itemBatchPredicate=in_range)
+        class Readings(object):
+            pass
+
+        lst = [1, 2, 3]
+        seq = Readings(lst)
+        self.assertEquals([3], calls)
+        self.assertEquals([1, 2, 3], list(seq))
+
+        seq[0] = 50
+        seq[1:2] = [60, 70]
+        self.assertEquals([50, 60, 70, 3], lst)
+        self.assertRaises(ValueError, operator.setitem, seq, 0, 100)
+        self.assertRaises(ValueError, operator.setitem, seq, slice(0, 1),
+                          [1, -1])
+        self.assertEquals([50, 60, 70, 3], lst)
+
+        self.assertRaises(ValueError, Readings, [1, 200, 3])
+
+    def test_itemBatchPredicate_with_itemFormat(self):
+        from jsonable_objects.proxy import proxy
+
+        @proxy(list, itemFormat=self.uuidFormat,
+               itemBatchPredicate=lambda values: [
+                   not value.startswith('0') for value in values
+               ])
+        class Seq(object):
+            pass
+
+        seq = Seq(['51bff41d-95e8-4fb8-9923-e72741725fd0'])
+        self.assertRaises(
+            ValueError,
+            Seq, ['058dd15b-39d4-4189-acf3-a376efeeeebd'],
+        )
+        self.assertRaises(
+            ValueError,
+            operator.setitem, seq, 0,
+            UUID('058dd15b-39d4-4189-acf3-a376efeeeebd'),
+        )
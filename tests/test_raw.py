@@ -0,0 +1,197 @@
+# -*- coding: utf-8 -*-
+#
+#   jsonable-objects: JSON-able objects
+#   Copyright (C) 2015-2017 mete0r <mete0r@sarangbang.or.kr>
+#
+#   This program is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU Affero General Public License as published by
+#   the Free Software Foundation, either version 3 of the License, or
+#   (at your option) any later version.
+#
+#   This program is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#   GNU Affero General Public License for more details.
+#
+#   You should have received a copy of the GNU Affero General Public License
+#   along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+from __future__ import absolute_import
+from __future__ import print_function
+from __future__ import unicode_literals
+from unittest import TestCase
+import copy
+import json
+
+from jsonable_objects.proxy import Field
+from jsonable_objects.proxy import proxy
+
+
+PAYLOAD = '''{
+  "route": {"to": "b", "via": ["x", "y"]},
+  "id": 7,
+  "body": {"big": [1, 2, {"deep": "\\u00e9"}], "s": "{not [json"},
+  "tags": [["a"], "b"]
+}'''
+
+
+@proxy(dict)
+class Route(object):
+    to = Field(type=str)
+
+
+@proxy(dict)
+class Message(object):
+    id = Field(type=int)
+    route = Field(proxy=Route)
+
+
+class RawLoadsTest(TestCase):
+
+    def test_decode_on_demand(self):
+        from jsonable_objects.raw import RawDict
+        from jsonable_objects.raw import Span
+        from jsonable_objects.raw import loads
+
+        d = loads(PAYLOAD)
+        self.assertTrue(isinstance(d, RawDict))
+        self.assertEqual(['route', 'id', 'body', 'tags'], list(d))
+        self.assertEqual(4, len(d))
+        self.assertTrue('body' in d)
+        self.assertTrue(isinstance(dict.__getitem__(d, 'body'), Span))
+
+        self.assertEqual(7, d['id'])
+        route = d['route']
+        self.assertTrue(isinstance(route, RawDict))
+        self.assertTrue(route is d['route'])
+        self.assertEqual(['x', 'y'], route['via'])
+        self.assertTrue(isinstance(dict.__getitem__(d, 'body'), Span))
+
+        self.assertEqual(json.loads(PAYLOAD), d)
+        self.assertEqual(d, json.loads(PAYLOAD))
+        self.assertEqual(json.loads(PAYLOAD), dict(d))
+        self.assertEqual(json.loads(PAYLOAD), copy.deepcopy(d))
+        self.assertEqual(json.loads(PAYLOAD), json.loads(json.dumps(d)))
+        self.assertEqual(json.loads(PAYLOAD)['body'], d.get('body'))
+        self.assertEqual(None, d.get('nothing'))
+
+    def test_bytes(self):
+        from jsonable_objects.raw import loads
+
+        d = loads(PAYLOAD.encode('utf-8'))
+        self.assertEqual('é', d['body']['big'][2]['deep'])
+        self.assertEqual(json.loads(PAYLOAD), d)
+
+    def test_scalar_and_list(self):
+        from jsonable_objects.raw import RawDict
+        from jsonable_objects.raw import RawList
+        from jsonable_objects.raw import loads
+
+        self.assertEqual(1, loads(' 1 '))
+        self.assertEqual('a', loads('"a"'))
+        self.assertRaises(ValueError, loads, '1 2')
+
+        items = loads('[1, [2], {"a": 3}]')
+        self.assertTrue(isinstance(items, RawList))
+        self.assertTrue(isinstance(items[1], RawList))
+        self.assertTrue(isinstance(items[2], RawDict))
+        self.assertEqual([1, [2], {'a': 3}], items)
+
+    def test_proxy(self):
+        from jsonable_objects.raw import RawList
+        from jsonable_objects.raw import Span
+        from jsonable_objects.raw import loads
+
+        message = Message(loads(PAYLOAD))
+        self.assertEqual(7, message.id)
+        self.assertEqual('b', message.route.to)
+        raw = message.__jsonable__
+        # route, id 뒤의 멤버들은 찾지도 않았다.
+        self.assertFalse(dict.__contains__(raw, 'body'))
+        self.assertFalse(dict.__contains__(raw, 'tags'))
+        self.assertTrue(isinstance(raw['tags'], RawList))
+        self.assertTrue(isinstance(dict.__getitem__(raw, 'body'), Span))
+
+
+class RawDumpsTest(TestCase):
+
+    def test_unmodified(self):
+        from jsonable_objects.raw import dumps
+        from jsonable_objects.raw import loads
+
+        message = Message(loads(PAYLOAD))
+        message.route.to
+        self.assertTrue(dumps(message) is message.__jsonable__.raw)
+
+        raw = PAYLOAD.encode('utf-8')
+        message = Message(loads(raw))
+        self.assertEqual(raw, dumps(message))
+        self.assertEqual(b'[1, 2]', dumps(loads(b' [1, 2] ')))
+
+    def test_modified(self):
+        from jsonable_objects.raw import Span
+        from jsonable_objects.raw import dumps
+        from jsonable_objects.raw import loads
+
+        message = Message(loads(PAYLOAD.encode('utf-8')))
+        message.route.to = 'c'
+        raw = message.__jsonable__
+        self.assertTrue(raw.modified)
+
+        encoded = dumps(message)
+        self.assertTrue(isinstance(encoded, bytes))
+        self.assertTrue(b'"big": [1, 2, {"deep": "\\u00e9"}]' in encoded)
+        expected = json.loads(PAYLOAD)
+        expected['route']['to'] = 'c'
+        self.assertEqual(expected, json.loads(encoded.decode('utf-8')))
+        self.assertTrue(isinstance(dict.__getitem__(raw, 'body'), Span))
+
+    def test_modified_in_list(self):
+        from jsonable_objects.raw import dumps
+        from jsonable_objects.raw import loads
+
+        d = loads(PAYLOAD)
+        d['tags'][0].append('z')
+        expected = json.loads(PAYLOAD)
+        expected['tags'][0].append('z')
+        self.assertEqual(expected, json.loads(dumps(d)))
+
+        d = loads(PAYLOAD)
+        d['body']['big'][2]['deep'] = 1
+        self.assertTrue(d.modified)
+        self.assertEqual(1, json.loads(dumps(d))['body']['big'][2]['deep'])
+
+    def test_mutators(self):
+        from jsonable_objects.raw import dumps
+        from jsonable_objects.raw import loads
+
+        d = loads(PAYLOAD)
+        expected = json.loads(PAYLOAD)
+        self.assertEqual(expected.pop('id'), d.pop('id'))
+        self.assertEqual(expected.setdefault('x', 1), d.setdefault('x', 1))
+        self.assertEqual(None, d.pop('nothing', None))
+        self.assertRaises(KeyError, d.pop, 'nothing')
+        del d['tags']
+        del expected['tags']
+        d.update(y=2)
+        expected.update(y=2)
+        self.assertEqual(expected, json.loads(dumps(d)))
+        self.assertEqual(expected, d.copy())
+        self.assertEqual(('y', 2), d.popitem())
+
+        items = loads('[3, 1, 2]')
+        items.sort()
+        self.assertEqual('[1, 2, 3]', dumps(items))
+        items.clear()
+        self.assertEqual('[]', dumps(items))
+
+    def test_materialize(self):
+        from jsonable_objects.raw import RawDict
+        from jsonable_objects.raw import loads
+        from jsonable_objects.raw import materialize
+
+        d = materialize(loads(PAYLOAD))
+        self.assertEqual(dict, type(d))
+        self.assertEqual(dict, type(d['body']['big'][2]))
+        self.assertFalse(isinstance(d['route'], RawDict))
+        self.assertEqual(json.loads(PAYLOAD), d)
@@ -0,0 +1,162 @@
+# -*- coding: utf-8 -*-
+#
+#   jsonable-objects: JSON-able objects
+#   Copyright (C) 2015-2017 mete0r <mete0r@sarangbang.or.kr>
+#
+#   This program is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU Affero General Public License as published by
+#   the Free Software Foundation, either version 3 of the License, or
+#   (at your option) any later version.
+#
+#   This program is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#   GNU Affero General Public License for more details.
+#
+#   You should have received a copy of the GNU Affero General Public License
+#   along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+from __future__ import absolute_import
+from __future__ import print_function
+from __future__ import unicode_literals
+from copy import deepcopy
+from unittest import TestCase
+
+from jsonable_objects.proxy import Field
+from jsonable_objects.proxy import proxy
+
+from .utils import CountingPredicate
+
+
+COUNTERS = {
+    'name': CountingPredicate(),
+    'port': CountingPredicate(lambda port: 0 < port < 65536),
+    'server': CountingPredicate(),
+}
+
+
+@proxy(dict)
+class Server(object):
+    name = Field(type=str, predicate=COUNTERS['name'])
+    port = Field(type=int, predicate=COUNTERS['port'])
+    tags = Field(type=list, optional=True)
+
+
+@proxy(dict, itemProxy=Server)
+class Servers(object):
+    pass
+
+
+@proxy(list)
+class Pair(object):
+    first = Field(type=int)
+    second = Field(proxy=Server)
+
+
+@proxy(list, itemProxy=Pair)
+class Pairs(object):
+    pass
+
+
+@proxy(dict)
+class Config(object):
+    title = Field(type=str)
+    main = Field(proxy=Server, predicate=COUNTERS['server'])
+    others = Field(proxy=Servers, optional=True)
+    pairs = Field(proxy=Pairs, optional=True)
+
+
+JSONABLE = {
+    'title': 'config',
+    'main': {'name': 'main', 'port': 80},
+    'others': {
+        'a': {'name': 'a', 'port': 81, 'tags': ['x']},
+        'b': {'name': 'b', 'port': 82},
+    },
+    'pairs': [
+        [1, {'name': 'p', 'port': 83}],
+    ],
+}
+
+
+class RevalidateTest(TestCase):
+
+    def setUp(self):
+        self.jsonable = deepcopy(JSONABLE)
+        self.config = Config(self.jsonable)
+        for counter in COUNTERS.values():
+            counter.count = 0
+
+    def test_only_given_paths(self):
+        self.jsonable['main']['port'] = 8080
+        self.jsonable['others']['b']['name'] = 'bb'
+
+        result = self.config.revalidate(['/main/port', ('others', 'b')])
+        self.assertTrue(result is self.config)
+        self.assertEqual(1 + 1, COUNTERS['port'].count)
+        self.assertEqual(1, COUNTERS['name'].count)
+        self.assertEqual(1, COUNTERS['server'].count)
+
+    def test_failures(self):
+        jsonable = self.jsonable
+
+        jsonable['main']['port'] = 0
+        self.assertRaises(ValueError, self.config.revalidate, ['/main/port'])
+        self.config.revalidate(['/title'])
+        jsonable['main']['port'] = 80
+
+        del jsonable['main']['name']
+        self.assertRaises(KeyError, self.config.revalidate, ['/main/name'])
+        self.assertRaises(KeyError, self.config.revalidate, ['/main'])
+        jsonable['main']['name'] = 'main'
+
+        jsonable['others']['c'] = {'name': 'c'}
+        self.assertRaises(KeyError, self.config.revalidate, ['/others/c'])
+        self.assertRaises(KeyError, self.config.revalidate, ['/others'])
+        del jsonable['others']['c']
+        self.config.revalidate(['/others/c'])
+
+        jsonable['pairs'][0][1]['port'] = 'x'
+        self.assertRaises(ValueError, self.config.revalidate,
+                          ['/pairs/0/1/port'])
+        self.assertRaises(ValueError, self.config.revalidate,
+                          [('pairs', 0)])
+        jsonable['pairs'][0][1] = 1
+        self.assertRaises(TypeError, self.config.revalidate,
+                          ['/pairs/0/1/port'])
+        self.config.revalidate(['/pairs/1'])
+
+        self.assertRaises(ValueError, self.config.revalidate, ['main'])
+
+    def test_outermost_paths(self):
+        self.config.revalidate(['/main/port', '/main/name', '/main'])
+        self.assertEqual(1, COUNTERS['port'].count)
+        self.assertEqual(1, COUNTERS['name'].count)
+
+    def test_everything(self):
+        self.config.revalidate()
+        self.assertEqual(4, COUNTERS['port'].count)
+
+        self.config.revalidate([])
+        self.assertEqual(4, COUNTERS['port'].count)
+
+        self.config.revalidate([''])
+        self.assertEqual(8, COUNTERS['port'].count)
+
+    def test_journal(self):
+        from jsonable_objects.revalidation import Journal
+
+        journal = Journal()
+        self.jsonable['main']['port'] = 8080
+        journal.record('/main/port')
+        self.jsonable['others']['a']['port'] = 0
+        journal.record(['others', 'a', 'port'])
+        self.assertEqual(2, len(journal))
+
+        self.assertRaises(ValueError, self.config.revalidate,
+                          journal=journal)
+        self.assertEqual(2, len(journal))
+
+        self.jsonable['others']['a']['port'] = 81
+        self.config.revalidate(journal=journal)
+        self.assertEqual(0, len(journal))
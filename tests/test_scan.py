@@ -0,0 +1,94 @@
+# -*- coding: utf-8 -*-
+#
+#   jsonable-objects: JSON-able objects
+#   Copyright (C) 2015-2017 mete0r <mete0r@sarangbang.or.kr>
+#
+#   This program is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU Affero General Public License as published by
+#   the Free Software Foundation, either version 3 of the License, or
+#   (at your option) any later version.
+#
+#   This program is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#   GNU Affero General Public License for more details.
+#
+#   You should have received a copy of the GNU Affero General Public License
+#   along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+from __future__ import absolute_import
+from __future__ import print_function
+from __future__ import unicode_literals
+from unittest import TestCase
+import json
+
+
+class ScanTest(TestCase):
+
+    def test_value_end(self):
+        from jsonable_objects.scan import value_end
+
+        text = '[1, "a\\"]b", {"c": [true, null]}, -1.5e3 ]'
+        self.assertEqual(len(text), value_end(text, 0))
+        self.assertEqual('1', text[1:value_end(text, 1)])
+        self.assertEqual('"a\\"]b"', text[4:value_end(text, 4)])
+        self.assertEqual('{"c": [true, null]}', text[13:value_end(text, 13)])
+        self.assertEqual('-1.5e3', text[34:value_end(text, 34)])
+
+        self.assertRaises(ValueError, value_end, '[1, 2', 0)
+        self.assertRaises(ValueError, value_end, '"abc', 0)
+        self.assertRaises(ValueError, value_end, ']', 0)
+
+    def test_value_end_deep(self):
+        from jsonable_objects.scan import SKIP_DEPTH
+        from jsonable_objects.scan import value_end
+
+        # 한 번에 건너뛰지 못하는 깊이
+        depth = SKIP_DEPTH * 2 + 1
+        for text in (
+            '[' * depth + '"]}"' + ']' * depth + ' ',
+            ('{"a": [' * depth + '1' + ']}' * depth + ' ').encode('ascii'),
+        ):
+            self.assertEqual(len(text) - 1, value_end(text, 0))
+            json.loads(text)
+        self.assertRaises(ValueError, value_end, '[' * depth, 0)
+
+    def test_iter_array(self):
+        from jsonable_objects.scan import iter_array
+
+        for text, pos in (('[1, "a,]", {"b": [2, 3]}, [], null]', 0),
+                          (b' [1 ,"a,]",{"b": [2, 3]} ,[],null ] ', 1)):
+            values = [json.loads(text[start:end])
+                      for start, end in iter_array(text, pos)]
+            self.assertEqual([1, 'a,]', {'b': [2, 3]}, [], None], values)
+
+        self.assertEqual([], list(iter_array(' [ ] ', 1)))
+        self.assertRaises(ValueError, list, iter_array('{}', 0))
+        self.assertRaises(ValueError, list, iter_array('[1 2]', 0))
+
+    def test_iter_object(self):
+        from jsonable_objects.scan import iter_object
+
+        text = b'{"a": 1, "b\\"}": {"c": "}"}, "d" : [1, {}]}'
+        members = [
+            (json.loads(text[ks:ke]), json.loads(text[vs:ve]))
+            for ks, ke, vs, ve in iter_object(text, 0)
+        ]
+        self.assertEqual([
+            ('a', 1),
+            ('b"}', {'c': '}'}),
+            ('d', [1, {}]),
+        ], members)
+
+        self.assertEqual([], list(iter_object('{ }', 0)))
+        self.assertRaises(ValueError, list, iter_object('[]', 0))
+        self.assertRaises(ValueError, list, iter_object('{"a" 1}', 0))
+        self.assertRaises(ValueError, list, iter_object('{"a": 1 "b"}', 0))
+
+    def test_value_kind(self):
+        from jsonable_objects.scan import skip_ws
+        from jsonable_objects.scan import value_kind
+
+        self.assertEqual(dict, value_kind(' {}', skip_ws(' {}', 0)))
+        self.assertEqual(list, value_kind(b'\n[]', skip_ws(b'\n[]', 0)))
+        self.assertEqual(None, value_kind('1', 0))
@@ -0,0 +1,170 @@
+# -*- coding: utf-8 -*-
+#
+#   jsonable-objects: JSON-able objects
+#   Copyright (C) 2015-2017 mete0r <mete0r@sarangbang.or.kr>
+#
+#   This program is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU Affero General Public License as published by
+#   the Free Software Foundation, either version 3 of the License, or
+#   (at your option) any later version.
+#
+#   This program is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#   GNU Affero General Public License for more details.
+#
+#   You should have received a copy of the GNU Affero General Public License
+#   along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+from __future__ import absolute_import
+from __future__ import print_function
+from __future__ import unicode_literals
+from copy import deepcopy
+from unittest import TestCase
+
+from jsonable_objects.proxy import Field
+from jsonable_objects.proxy import proxy
+
+
+@proxy(dict)
+class Location(object):
+    city = Field(type=str)
+
+
+@proxy(dict)
+class Record(object):
+    id = Field(type=int)
+    score = Field(type=float, optional=True)
+    status = Field(type=str, intern=True)
+    name = Field(type=str)
+    location = Field(proxy=Location, optional=True)
+
+
+RECORDS = [
+    {'id': 1, 'score': 0.5, 'status': 'ok', 'name': 'a',
+     'location': {'city': 'Seoul'}, 'undeclared': True},
+    {'id': 2, 'status': 'ok', 'name': 'b'},
+    {'id': 3, 'score': 1, 'status': 'failed', 'name': 'c'},
+]
+
+
+class RecordTableTest(TestCase):
+
+    def test_columns(self):
+        from array import array
+        from jsonable_objects.table import INTEGER_TYPECODE
+        from jsonable_objects.table import RecordTable
+
+        table = RecordTable(Record, deepcopy(RECORDS))
+        self.assertEqual(3, len(table))
+
+        ids = table.column('id')
+        self.assertEqual(array(INTEGER_TYPECODE, [1, 2, 3]), ids.data)
+        self.assertEqual(None, ids.nulls)
+
+        scores = table.column('score')
+        self.assertEqual(array('d', [0.5, 0.0, 1.0]), scores.data)
+        self.assertEqual(bytearray([0, 1, 0]), scores.nulls)
+        self.assertEqual([0.5, None, 1.0], list(scores))
+
+        statuses = table.column('status')
+        self.assertEqual(['ok', 'failed'], statuses.dictionary)
+        self.assertEqual(array('l', [0, 0, 1]), statuses.data)
+        self.assertEqual(['ok', 'ok', 'failed'], list(statuses))
+
+        self.assertEqual(['a', 'b', 'c'], list(table.column('name')))
+        self.assertRaises(KeyError, table.column, 'undeclared')
+
+        self.assertEqual({'id': 3, 'score': 1.0, 'status': 'failed',
+                          'name': 'c'}, table.record(-1))
+
+    def test_rows(self):
+        from jsonable_objects.table import RecordTable
+
+        table = RecordTable(Record)
+        table.extend(deepcopy(RECORDS))
+        table.append(Record({'id': 4, 'status': 'ok', 'name': 'd'}))
+
+        row = table[0]
+        self.assertTrue(isinstance(row, Record))
+        self.assertEqual(1, row.id)
+        self.assertEqual(0.5, row.score)
+        self.assertEqual(Location({'city': 'Seoul'}), row.location)
+        self.assertEqual(None, table[1].score)
+        self.assertEqual(None, table[1].location)
+        self.assertEqual(Record({'id': 2, 'status': 'ok', 'name': 'b'}),
+                         table[1])
+        self.assertEqual([1, 2, 3, 4], [record.id for record in table])
+        self.assertRaises(IndexError, table.__getitem__, 4)
+
+        row.score = 2.5
+        row.status = 'failed'
+        del row.location
+        self.assertEqual({'id': 1, 'score': 2.5, 'status': 'failed',
+                          'name': 'a'}, table.record(0))
+        with self.assertRaises(TypeError):
+            row.name = None
+        with self.assertRaises(TypeError):
+            row.id = 'x'
+
+    def test_demoted_column(self):
+        from jsonable_objects.table import RecordTable
+
+        table = RecordTable(Record, deepcopy(RECORDS))
+        table.append({'id': 1 << 70, 'status': 'ok', 'name': 'big'})
+        self.assertEqual([1, 2, 3, 1 << 70], list(table.column('id')))
+        self.assertEqual(1 << 70, table[-1].id)
+        table[0].id = 5
+        self.assertEqual(5, table[0].id)
+
+    def test_bool_demotes_column(self):
+        from jsonable_objects.table import RecordTable
+
+        table = RecordTable(Record, deepcopy(RECORDS))
+        table[0].id = True
+        self.assertTrue(table.record(0)['id'] is True)
+        self.assertEqual([True, 2, 3], list(table.column('id')))
+
+    def test_row_views_are_not_documents(self):
+        from jsonable_objects.table import RecordTable
+
+        table = RecordTable(Record, deepcopy(RECORDS))
+        self.assertRaises(TypeError, table[0].fingerprint)
+        self.assertRaises(TypeError, Record.memory_report, table[0])
+
+    def test_validation(self):
+        from jsonable_objects.proxy import proxy
+        from jsonable_objects.table import RecordTable
+
+        table = RecordTable(Record)
+        self.assertRaises(KeyError, table.append, {'id': 1})
+        self.assertEqual(0, len(table))
+
+        @proxy(list, as_container=True)
+        class Values(object):
+            pass
+
+        @proxy(dict, tracked=True)
+        class Tracked(object):
+            pass
+
+        self.assertRaises(TypeError, RecordTable, Values)
+        self.assertRaises(TypeError, RecordTable, Tracked)
+
+    def test_list_records(self):
+        from jsonable_objects.proxy import proxy
+        from jsonable_objects.proxy import Field
+        from jsonable_objects.table import RecordTable
+
+        @proxy(list)
+        class Point(object):
+            x = Field(type=float)
+            y = Field(type=float)
+            label = Field(type=str, optional=True)
+
+        table = RecordTable(Point, [[0, 1, None], [2, 3, 'p']])
+        self.assertEqual([[0.0, 1.0, None], [2.0, 3.0, 'p']],
+                         [table.record(0), table.record(1)])
+        table[0].label = 'o'
+        self.assertEqual('o', table[0].label)
+        self.assertEqual(2.0, table[1].x)
@@ -0,0 +1,376 @@
+# -*- coding: utf-8 -*-
+#
+#   jsonable-objects: JSON-able objects
+#   Copyright (C) 2015-2017 mete0r <mete0r@sarangbang.or.kr>
+#
+#   This program is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU Affero General Public License as published by
+#   the Free Software Foundation, either version 3 of the License, or
+#   (at your option) any later version.
+#
+#   This program is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#   GNU Affero General Public License for more details.
+#
+#   You should have received a copy of the GNU Affero General Public License
+#   along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+from __future__ import absolute_import
+from __future__ import print_function
+from __future__ import unicode_literals
+from copy import deepcopy
+from unittest import TestCase
+
+from jsonable_objects.proxy import Field
+from jsonable_objects.proxy import proxy
+
+
+@proxy(dict, tracked=True)
+class Item(object):
+    name = Field(type=str)
+    note = Field(type=str, optional=True)
+
+
+@proxy(list, itemProxy=Item, tracked=True)
+class Items(object):
+    pass
+
+
+@proxy(dict, itemProxy=Item, tracked=True)
+class ItemMap(object):
+    pass
+
+
+@proxy(dict, tracked=True)
+class Document(object):
+    title = Field(key='ti/tle', type=str)
+    items = Field(proxy=Items)
+    by_name = Field(proxy=ItemMap, optional=True)
+    owner = Field(proxy=Item, optional=True)
+
+
+JSONABLE = {
+    'ti/tle': 'doc',
+    'items': [
+        {'name': 'a'},
+        {'name': 'b'},
+        {'name': 'c'},
+    ],
+    'by_name': {
+        'x': {'name': 'x'},
+    },
+}
+
+
+class TrackedFieldTest(TestCase):
+
+    def test_no_changes(self):
+        doc = Document(deepcopy(JSONABLE))
+        self.assertEqual(set(), doc.changed_paths())
+        self.assertEqual([], doc.json_patch())
+
+    def test_set_and_delete_fields(self):
+        jsonable = deepcopy(JSONABLE)
+        doc = Document(jsonable)
+        doc.title = 'new'
+        doc.owner = Item({'name': 'o'})
+        del doc.by_name
+        self.assertEqual({'/ti~1tle', '/owner', '/by_name'},
+                         doc.changed_paths())
+        self.assertEqual([
+            {'op': 'replace', 'path': '/ti~1tle', 'value': 'new'},
+            {'op': 'add', 'path': '/owner', 'value': {'name': 'o'}},
+            {'op': 'remove', 'path': '/by_name'},
+        ], doc.json_patch())
+
+        doc.mark_clean()
+        self.assertEqual([], doc.json_patch())
+
+    def test_failed_set_is_not_recorded(self):
+        doc = Document(deepcopy(JSONABLE))
+        self.assertRaises(TypeError, setattr, doc, 'title', 1)
+        self.assertEqual([], doc.json_patch())
+
+    def test_added_then_removed(self):
+        doc = Document(deepcopy(JSONABLE))
+        doc.owner = Item({'name': 'o'})
+        del doc.owner
+        self.assertEqual([], doc.json_patch())
+        self.assertEqual({'/owner'}, doc.changed_paths())
+
+    def test_no_op_changes(self):
+        doc = Document(deepcopy(JSONABLE))
+        doc.title = 'doc'
+        doc.items[0] = Item({'name': 'a'})
+        doc.by_name['x'] = Item({'name': 'x'})
+        del doc.owner
+        del doc.items[0].note
+        self.assertEqual(set(), doc.changed_paths())
+        self.assertEqual([], doc.json_patch())
+
+        doc.items[0].name = 'b'
+        doc.by_name['x'] = Item({'name': 'y'})
+        self.assertEqual({'/items/0/name', '/by_name/x'},
+                         doc.changed_paths())
+
+    def test_nested(self):
+        doc = Document(deepcopy(JSONABLE))
+        doc.items[1].note = 'n'
+        doc.by_name['x'].name = 'y'
+        for item in doc.items:
+            if item.name == 'c':
+                item.name = 'C'
+        self.assertEqual([
+            {'op': 'add', 'path': '/items/1/note', 'value': 'n'},
+            {'op': 'replace', 'path': '/by_name/x/name', 'value': 'y'},
+            {'op': 'replace', 'path': '/items/2/name', 'value': 'C'},
+        ], doc.json_patch())
+
+        # 자식에서도 같은 문서의 변경을 본다.
+        self.assertEqual(3, len(doc.items[0].json_patch()))
+
+    def test_parent_replaced_subsumes(self):
+        doc = Document(deepcopy(JSONABLE))
+        doc.by_name['x'].name = 'y'
+        doc.by_name = ItemMap({})
+        self.assertEqual([
+            {'op': 'replace', 'path': '/by_name', 'value': {}},
+        ], doc.json_patch())
+
+    def test_detached_child(self):
+        doc = Document(deepcopy(JSONABLE))
+        owner = Item({'name': 'o'})
+        doc.owner = owner
+        child = doc.owner
+        doc.owner = Item({'name': 'p'})
+        doc.mark_clean()
+        child.name = 'q'
+        self.assertEqual([], doc.json_patch())
+        self.assertEqual([
+            {'op': 'replace', 'path': '/name', 'value': 'q'},
+        ], child.json_patch())
+
+    def test_list_fields(self):
+        from jsonable_objects.proxy import proxy
+        from jsonable_objects.proxy import Field
+
+        @proxy(list, tracked=True)
+        class Pair(object):
+            first = Field()
+            second = Field(optional=True)
+
+        pair = Pair([1, 2])
+        pair.first = 3
+        del pair.second
+        self.assertEqual([
+            {'op': 'replace', 'path': '/0', 'value': 3},
+            {'op': 'replace', 'path': '/1', 'value': None},
+        ], pair.json_patch())
+
+
+class TrackedContainerTest(TestCase):
+
+    def test_dict_container(self):
+        items = ItemMap({'x': {'name': 'x'}})
+        items['y'] = Item({'name': 'y'})
+        items['x'] = Item({'name': 'x2'})
+        self.assertRaises(KeyError, items.__delitem__, 'z')
+        self.assertRaises(TypeError, items.__setitem__, 'z', {})
+        self.assertEqual({'/y', '/x'}, items.changed_paths())
+        del items['y']
+        self.assertEqual([
+            {'op': 'replace', 'path': '/x', 'value': {'name': 'x2'}},
+        ], items.json_patch())
+
+    def test_dict_container_keyFormat(self):
+        from jsonable_objects.proxy import proxy
+
+        class IntFormat(object):
+
+            def format(self, value):
+                return str(value)
+
+            def parse(self, value):
+                return int(value)
+
+        @proxy(dict, keyFormat=IntFormat(), tracked=True)
+        class Counts(object):
+            pass
+
+        counts = Counts({'1': 10})
+        counts[2] = 20
+        del counts[1]
+        self.assertEqual([
+            {'op': 'add', 'path': '/2', 'value': 20},
+            {'op': 'remove', 'path': '/1'},
+        ], counts.json_patch())
+
+    def test_list_container(self):
+        doc = Document(deepcopy(JSONABLE))
+        doc.items[-1] = Item({'name': 'z'})
+        self.assertEqual([
+            {'op': 'replace', 'path': '/items/2', 'value': {'name': 'z'}},
+        ], doc.json_patch())
+
+        doc.mark_clean()
+        doc.items[0].name = 'A'
+        del doc.items[0]
+        self.assertEqual([
+            {'op': 'replace', 'path': '/items', 'value': [
+                {'name': 'b'}, {'name': 'z'},
+            ]},
+        ], doc.json_patch())
+
+    def test_list_slices(self):
+        doc = Document(deepcopy(JSONABLE))
+        items = doc.items
+        for item in items[1:]:
+            item.note = 'n'
+        self.assertEqual({'/items/1/note', '/items/2/note'},
+                         doc.changed_paths())
+        items[1:] = [Item({'name': 'd'})]
+        self.assertEqual({'/items'}, doc.changed_paths())
+        self.assertEqual(2, len(doc.items))
+
+    def test_tracker_changes(self):
+        from jsonable_objects.tracking import MISSING
+        from jsonable_objects.tracking import SetChange
+        from jsonable_objects.tracking import SpliceChange
+        from jsonable_objects.tracking import document_of
+
+        items = Items([{'name': 'a'}, {'name': 'b'}, {'name': 'c'}])
+        items[0:2] = [Item({'name': 'd'})]
+        del items[::2]
+        items[0].note = 'x'
+        tracker, path = document_of(items)
+        self.assertEqual((), path)
+        # 이전 값은 복사하지 않고 참조로 기록된다.
+        self.assertEqual([
+            SpliceChange((), 0, [{'name': 'a'}, {'name': 'b'}], 1),
+            SpliceChange((), 0, [{'name': 'd'},
+                                 {'name': 'c', 'note': 'x'}], 1),
+            SetChange((0, 'note'), MISSING),
+        ], tracker.changes)
+
+    def test_untracked_child(self):
+        from jsonable_objects.proxy import proxy
+        from jsonable_objects.proxy import Field
+
+        @proxy(dict)
+        class Child(object):
+            name = Field()
+
+        @proxy(dict, tracked=True)
+        class Parent(object):
+            child = Field(proxy=Child)
+
+        parent = Parent({'child': {'name': 'a'}})
+        parent.child.name = 'b'
+        self.assertEqual([], parent.json_patch())
+        self.assertRaises(AttributeError, getattr, parent.child,
+                          'json_patch')
+
+    def test_json_pointer(self):
+        from jsonable_objects.tracking import json_pointer
+
+        self.assertEqual('', json_pointer(()))
+        self.assertEqual('/a~0b/c~1d/0', json_pointer(('a~b', 'c/d', 0)))
+
+
+class TransactionTest(TestCase):
+
+    def test_commit(self):
+        doc = Document(deepcopy(JSONABLE))
+        with doc.transaction() as txn:
+            self.assertTrue(txn is doc)
+            doc.title = 'new'
+        self.assertEqual('new', doc.title)
+        self.assertEqual({'/ti~1tle'}, doc.changed_paths())
+
+    def test_rollback(self):
+        jsonable = deepcopy(JSONABLE)
+        expected = deepcopy(JSONABLE)
+        doc = Document(jsonable)
+
+        def edit():
+            with doc.transaction():
+                doc.title = 'new'
+                doc.owner = Item({'name': 'o'})
+                doc.items[0].note = 'n'
+                doc.items[1:] = [Item({'name': 'd'})]
+                doc.items.__delitem__(0)
+                doc.items[0] = Item({'name': 'e'})
+                doc.items[0].name = 'f'
+                doc.by_name['y'] = Item({'name': 'y'})
+                del doc.by_name['x']
+                del doc.by_name
+                raise ValueError()
+
+        self.assertRaises(ValueError, edit)
+        self.assertEqual(expected, jsonable)
+        self.assertEqual([], doc.json_patch())
+
+    def test_rollback_absent_deleted(self):
+        from jsonable_objects.tracking import document_of
+
+        jsonable = deepcopy(JSONABLE)
+        expected = deepcopy(JSONABLE)
+        doc = Document(jsonable)
+
+        def edit():
+            with doc.transaction():
+                doc.title = 'new'
+                del doc.owner
+                raise ValueError()
+
+        self.assertRaises(ValueError, edit)
+        self.assertEqual(expected, jsonable)
+        self.assertEqual([], document_of(doc)[0].changes)
+
+    def test_nested(self):
+        jsonable = deepcopy(JSONABLE)
+        doc = Document(jsonable)
+        with doc.transaction():
+            doc.title = 'outer'
+            try:
+                with doc.items[0].transaction():
+                    doc.items[0].name = 'inner'
+                    raise KeyError()
+            except KeyError:
+                pass
+            doc.items[1].name = 'B'
+        self.assertEqual('outer', jsonable['ti/tle'])
+        self.assertEqual(['a', 'B', 'c'],
+                         [item['name'] for item in jsonable['items']])
+        self.assertEqual({'/ti~1tle', '/items/1/name'}, doc.changed_paths())
+
+    def test_mark_clean_within(self):
+        jsonable = deepcopy(JSONABLE)
+        doc = Document(jsonable)
+        doc.title = 'before'
+        try:
+            with doc.transaction():
+                doc.items[0].name = 'x'
+                doc.mark_clean()
+                self.assertEqual([], doc.json_patch())
+                doc.items[1].name = 'y'
+                raise ValueError()
+        except ValueError:
+            pass
+        self.assertEqual('before', jsonable['ti/tle'])
+        self.assertEqual('a', jsonable['items'][0]['name'])
+        self.assertEqual('b', jsonable['items'][1]['name'])
+        self.assertEqual({'/ti~1tle'}, doc.changed_paths())
+
+        with doc.transaction():
+            doc.mark_clean()
+        self.assertEqual([], doc.json_patch())
+
+    def test_tracker_savepoints(self):
+        from jsonable_objects.tracking import Tracker
+
+        tracker = Tracker({})
+        outer = tracker.begin()
+        tracker.begin()
+        self.assertRaises(ValueError, tracker.commit, outer)
@@ -38,3 +38,17 @@ def isolated_directory(test_fn):
         os.makedirs(path)
         return test_fn(self, isolated_directory=path)
     return wrapper
+
+
+class CountingPredicate(object):
+    ''' Field predicate which counts its calls. '''
+
+    def __init__(self, predicate=None):
+        self.count = 0
+        self.predicate = predicate
+
+    def __call__(self, value):
+        self.count += 1
+        if self.predicate is not None:
+            return self.predicate(value)
+        return True